@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Stand-in for `bw serve` in the tests of qute_bwserve.py: python3 bw_serve_standin.py serve --hostname HOST --port PORT
+
+Answers the routes qute-bitwarden uses, over HTTP/1.1 keep-alive connections that are closed after KEEP_ALIVE idle
+seconds (bw serve's Koa closes them after five). It is unlocked when started with BW_SESSION=SESSION and logs the client
+port of every request to $QUTE_BWSERVE_TEST_LOG.
+"""
+
+import http.server
+import json
+import os
+import sys
+import urllib.parse
+
+SESSION = 'SESSION'
+KEEP_ALIVE = 0.3
+ITEMS = [{'object': 'item', 'id': 'a1', 'type': 1, 'name': 'example.com',
+          'login': {'username': 'user', 'password': 'secret', 'totp': None,
+                    'uris': [{'match': None, 'uri': 'https://example.com/'}]}}]
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_arguments):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        log = os.getenv('QUTE_BWSERVE_TEST_LOG')
+        if log:
+            with open(log, 'a') as f:
+                f.write('{} {}\n'.format(self.client_address[1], self.path))
+        unlocked = os.getenv('BW_SESSION') == SESSION
+        path = urllib.parse.unquote(self.path)
+        if path == '/status':
+            status = 'unlocked' if unlocked else 'locked'
+            return self.reply(200, {'success': True, 'data': {'object': 'template', 'template': {'status': status}}})
+        if not unlocked:
+            return self.reply(400, {'success': False, 'message': 'Vault is locked.'})
+        if path == '/list/object/items':
+            return self.reply(200, {'success': True, 'data': {'object': 'list', 'data': ITEMS}})
+        kind, _, item_id = path[len('/object/'):].partition('/')
+        item = next((item for item in ITEMS if item['id'] == item_id), None)
+        if item is None or kind not in ('item', 'totp'):
+            return self.reply(404, {'success': False, 'message': 'Not found.'})
+        if kind == 'totp':
+            return self.reply(200, {'success': True, 'data': {'object': 'string', 'data': '123456'}})
+        return self.reply(200, {'success': True, 'data': item})
+
+
+def serve(argv):
+    host, port = argv[argv.index('--hostname') + 1], int(argv[argv.index('--port') + 1])
+    http.server.ThreadingHTTPServer((host, port), Handler).serve_forever()
+
+
+if __name__ == '__main__':
+    serve(sys.argv)
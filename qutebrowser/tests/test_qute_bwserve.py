@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Checks for qute_bwserve.py against a stand-in `bw serve` (bw_serve_standin.py): python3 -m pytest qutebrowser/tests
+
+The tests put a `bw` on PATH that starts the stand-in, so the supervisor in qute_bwserve.py runs it like the real one.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+import qute_bwserve
+from bw_serve_standin import ITEMS, KEEP_ALIVE, SESSION
+
+STANDIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bw_serve_standin.py')
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def answers(port):
+    try:
+        socket.create_connection((qute_bwserve.HOST, port), 1).close()
+    except OSError:
+        return False
+    return True
+
+
+@pytest.fixture
+def port():
+    with socket.socket() as probe:
+        probe.bind((qute_bwserve.HOST, 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    path = tmp_path / 'requests.log'
+    path.touch()
+    monkeypatch.setenv('QUTE_BWSERVE_TEST_LOG', str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def environment(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    bw = bin_dir / 'bw'
+    bw.write_text('#!/bin/sh\nexec {} {} "$@"\n'.format(sys.executable, STANDIN))
+    bw.chmod(0o755)
+    monkeypatch.setenv('PATH', '{}{}{}'.format(bin_dir, os.pathsep, os.environ['PATH']))
+    runtime_dir = tmp_path / 'run'
+    runtime_dir.mkdir(mode=0o700)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(runtime_dir))
+    yield
+    qute_bwserve.stop()
+    wait_for(lambda: qute_bwserve.running_pid() is None)
+
+
+def client_ports(log):
+    return [line.split()[0] for line in log.read_text().splitlines()]
+
+
+def test_starts_on_demand(port, log):
+    client = qute_bwserve.Client(port)
+    assert not answers(port)
+    qute_bwserve.connect(client, SESSION, 30)
+    assert qute_bwserve.running_pid() is not None
+    assert client.list_items() == ITEMS
+    assert client.get_item('a1') == ITEMS[0]
+    assert client.totp('a1') == '123456'
+    client.close()
+
+
+def test_reuses_connections(port, log):
+    client = qute_bwserve.Client(port)
+    qute_bwserve.connect(client, SESSION, 30)
+    log.write_text('')
+    for _ in range(5):
+        client.get_item('a1')
+    assert len(set(client_ports(log))) == 1
+    assert len(client.idle) == 1
+    client.close()
+
+
+def test_retries_after_the_server_closed_the_connection(port, log):
+    client = qute_bwserve.Client(port)
+    qute_bwserve.connect(client, SESSION, 30)
+    client.get_item('a1')
+    stale = client.idle[0]
+    time.sleep(KEEP_ALIVE * 2)
+    log.write_text('')
+    assert client.get_item('a1') == ITEMS[0]
+    assert stale not in client.idle
+    assert len(client_ports(log)) == 1
+    client.close()
+
+
+def test_stops_when_idle(port, log):
+    client = qute_bwserve.Client(port)
+    qute_bwserve.connect(client, SESSION, 1)
+    pid_path = qute_bwserve.pid_path()
+    assert os.path.exists(pid_path)
+    client.close()
+    assert wait_for(lambda: not os.path.exists(pid_path), timeout=5)
+    assert wait_for(lambda: not answers(port), timeout=5)
+
+
+def test_gives_up_on_a_locked_server_holding_the_port(port, log):
+    # Not ours, so there is no pid file to stop it with, and ours cannot bind the port
+    environ = {key: value for key, value in os.environ.items() if key != 'BW_SESSION'}
+    foreign = subprocess.Popen([sys.executable, STANDIN, 'serve', '--hostname', qute_bwserve.HOST,
+                                '--port', str(port)], env=environ)
+    try:
+        assert wait_for(lambda: answers(port))
+        client = qute_bwserve.Client(port)
+        with pytest.raises(qute_bwserve.ServeError, match='locked'):
+            qute_bwserve.connect(client, SESSION, 30)
+        client.close()
+        # connect() gave up as soon as the locked server answered, before the supervisor it started for its own
+        # server got going: that one fails to bind the port, exits and leaves no pid file behind
+        wait_for(lambda: os.path.exists(qute_bwserve.pid_path()), timeout=2)
+        assert wait_for(lambda: qute_bwserve.running_pid() is None)
+        assert not os.path.exists(qute_bwserve.pid_path())
+    finally:
+        foreign.terminate()
+        foreign.wait()
@@ -0,0 +1,295 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Resident credential broker for the qute-pass and qute-bitwarden userscripts (optional).
+
+Every autofill starts a fresh interpreter that imports argparse, idna and friends, loads the suffix trie and reads the
+store index before it can type anything. The broker keeps both userscripts loaded in one long-running process
+instead, so the suffix trie, the pass index and gopass listings stay in memory between requests; the Bitwarden
+session stays in the kernel keyring as before.
+
+The userscripts call forward() before their own imports: when a broker listens on
+$XDG_RUNTIME_DIR/qute-broker.sock, the request (script, arguments and environment) is sent over the socket, the
+broker runs the script's main() with that environment and the client prints the output and exits with the status.
+Without a broker (or with QUTE_BROKER=0) forward() returns and the script runs on its own as before.
+
+The socket is only accessible to its owner and connections from other users are refused. Requests run one at a time:
+a request temporarily replaces the broker's environment, and dmenu/rofi, pass and bw are started from the broker.
+Scripts are reloaded when their file changes.
+
+What the broker cannot save is the start of the client: qutebrowser still runs the userscript with a fresh python3,
+which takes 16-24ms before forward() is even called (python3 -c pass, measured on a slow single-core machine). From the
+keypress to the first fake-key this came to 37ms through the broker against 191ms without, of which the broker's round
+trip is 3-5ms, so anything near 20ms needs a client that is not written in Python.
+
+Start it with the graphical session, for example from a systemd user unit or
+qutebrowser's config.py:
+
+    python3 ~/.config/qutebrowser/userscripts/qute_broker.py [--idle-timeout SECONDS]
+"""
+
+# Imported by the userscripts before anything else, so the client half sticks to modules Python has loaded at startup
+# anyway: _socket instead of socket (which imports enum) and NUL-separated messages instead of json (which imports re)
+import _socket
+import os
+import sys
+
+SOCKET_NAME = 'qute-broker.sock'
+SCRIPTS = ('qute-pass', 'qute-bitwarden')
+
+
+def socket_path():
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    return os.path.join(runtime_dir, SOCKET_NAME) if runtime_dir else None
+
+
+def receive(connection):
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def send(connection, data):
+    connection.sendall(data)
+    connection.shutdown(_socket.SHUT_WR)
+
+
+# A request is script, argument count, arguments and KEY=VALUE environment entries, none of which can contain a NUL;
+# a reply is the exit status, the length of stdout, stdout and stderr
+def encode_request(script, argv, environ):
+    fields = [script, str(len(argv)), *argv, *('{}={}'.format(key, value) for key, value in environ.items())]
+    return b'\0'.join(map(os.fsencode, fields))
+
+
+def decode_request(data):
+    script, count, *fields = map(os.fsdecode, data.split(b'\0'))
+    count = int(count)
+    return script, fields[:count], dict(entry.split('=', 1) for entry in fields[count:])
+
+
+def encode_reply(status, stdout, stderr):
+    stdout = stdout.encode('utf-8', 'surrogateescape')
+    return b'%d\0%d\0' % (status, len(stdout)) + stdout + stderr.encode('utf-8', 'surrogateescape')
+
+
+def decode_reply(data):
+    status, length, output = data.split(b'\0', 2)
+    return int(status), output[:int(length)], output[int(length):]
+
+
+def forward(script):
+    """Run `script` in the broker and exit with its status; returns if no broker is running"""
+    path = socket_path()
+    if os.getenv('QUTE_BROKER') == '0' or not path or not os.path.exists(path):
+        return
+    connection = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        # A stale socket, the broker is gone
+        connection.close()
+        return
+    try:
+        send(connection, encode_request(script, sys.argv[1:], os.environ))
+        status, stdout, stderr = decode_reply(receive(connection))
+    finally:
+        connection.close()
+    sys.stdout.buffer.write(stdout)
+    sys.stdout.flush()
+    sys.stderr.buffer.write(stderr)
+    sys.exit(status)
+
+
+def replace_environ(environ):
+    # Only the differences: every assignment to os.environ is a putenv() or unsetenv()
+    for key in os.environ.keys() - environ.keys():
+        del os.environ[key]
+    for key, value in environ.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+
+
+class DirectoryWatch:
+    """Whether an entry of one of `directories` was added, removed or renamed since the watch was made (inotify)
+
+    Lets a script keep a cache of directory contents without stat()ing every directory on each request.
+    """
+
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_ONLYDIR = 0x1000000
+    MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+    def __init__(self, directories):
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK) < 0:
+                # Usually fs.inotify.max_user_watches
+                error = ctypes.get_errno()
+                self.close()
+                raise OSError(error, 'inotify_add_watch', directory)
+
+    def changed(self):
+        # Any event counts, including the queue overflowing
+        try:
+            return bool(os.read(self.fd, 65536))
+        except BlockingIOError:
+            return False
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class Broker:
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.modules = {}
+
+    def load(self, script):
+        # Only the userscripts next to the broker are ever run, whatever the request says
+        if script not in SCRIPTS:
+            raise ValueError('Unknown script {!r}'.format(script))
+        import importlib.machinery
+        import importlib.util
+        path = os.path.join(self.directory, script)
+        mtime = os.stat(path).st_mtime_ns
+        loaded = self.modules.get(script)
+        if loaded is None or loaded[0] != mtime:
+            loader = importlib.machinery.SourceFileLoader(script.replace('-', '_'), path)
+            module = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+            loader.exec_module(module)
+            # Usage and errors name the script rather than the broker
+            module.argument_parser.prog = script
+            self.modules[script] = loaded = (mtime, module)
+        return loaded[1]
+
+    def run(self, script, argv, request_environ):
+        import contextlib
+        import functools
+        import io
+        import traceback
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        environ = dict(os.environ)
+        replace_environ(request_environ)
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                module = self.load(script)
+                module.stderr = functools.partial(print, file=stderr)
+                # Defaults the scripts read from the environment when they are loaded
+                defaults = {'url': os.getenv('QUTE_URL')}
+                if hasattr(module, 'expanded_path'):
+                    defaults['password_store'] = module.expanded_path(
+                        os.getenv('PASSWORD_STORE_DIR', default='~/.password-store'))
+                module.argument_parser.set_defaults(**defaults)
+
+                arguments = module.argument_parser.parse_args(argv)
+                if hasattr(module, 'refresh_caches'):
+                    module.refresh_caches(arguments)
+                module.arguments = arguments
+                status = int(module.main(arguments))
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            traceback.print_exc(file=stderr)
+            status = 1
+        finally:
+            replace_environ(environ)
+        return encode_reply(status, stdout.getvalue(), stderr.getvalue())
+
+    def handle(self, connection):
+        import struct
+        credentials = struct.Struct('3i')
+        _pid, uid, _gid = credentials.unpack(connection.getsockopt(
+            _socket.SOL_SOCKET, _socket.SO_PEERCRED, credentials.size))
+        if uid != os.getuid():
+            print('Refused a connection from uid {}'.format(uid), file=sys.stderr)
+            return
+        try:
+            request = decode_request(receive(connection))
+        except ValueError as e:
+            send(connection, encode_reply(1, '', 'Malformed broker request: {}\n'.format(e)))
+            return
+        send(connection, self.run(*request))
+
+    def serve(self, path, idle_timeout=None):
+        import socket
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            if os.path.exists(path):
+                os.unlink(path)
+        else:
+            raise RuntimeError('A broker is already listening on {}'.format(path))
+        finally:
+            probe.close()
+
+        umask = os.umask(0o177)
+        try:
+            listener.bind(path)
+        finally:
+            os.umask(umask)
+        listener.listen()
+        listener.settimeout(idle_timeout)
+        try:
+            while True:
+                try:
+                    connection, _address = listener.accept()
+                except socket.timeout:
+                    return
+                with connection:
+                    connection.settimeout(None)
+                    try:
+                        self.handle(connection)
+                    except (OSError, ValueError) as e:
+                        print('Request failed: {}'.format(e), file=sys.stderr)
+        finally:
+            listener.close()
+            os.unlink(path)
+
+
+def main():
+    import argparse
+    import signal
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument('--idle-timeout', type=float, default=None,
+                                 help='Exit after this many seconds without a request (default: never)')
+    arguments = argument_parser.parse_args()
+
+    path = socket_path()
+    if not path:
+        print('XDG_RUNTIME_DIR is not set, there is no private place for the socket', file=sys.stderr)
+        return 1
+    # The userscripts import the helper modules next to them
+    directory = os.path.dirname(os.path.realpath(__file__))
+    sys.path.insert(0, directory)
+    # Leave through serve()'s cleanup, which removes the socket
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))
+    try:
+        Broker(directory).serve(path, arguments.idle_timeout)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
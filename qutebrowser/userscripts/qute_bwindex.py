@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Bitwarden URI matching for the qute-bitwarden userscript, in process.
+
+`bw list items --url URL` decrypts the whole vault and matches every login URI against URL, once per call. ItemIndex
+does the same matching over one `bw list items` snapshot instead, following the CLI's getAllDecryptedForUrl():
+
+    0 domain        same registered domain (default, also for URIs without a match type)
+    1 host          same host, including a non-default port
+    2 starts with   URL starts with the URI
+    3 exact         URL is the URI
+    4 regex         URI is a case-insensitive regular expression found in URL
+    5 never
+
+Domain and host URIs are indexed by registered domain and host, exact URIs by themselves and starts-with URIs by
+themselves and their length, so a lookup is a few dictionary lookups plus a scan of the (usually few) regex URIs.
+Equivalent domains from the Bitwarden account settings are not known offline and not applied.
+
+Match a URL against a snapshot: bw list items | python3 qute_bwindex.py URL
+"""
+
+import json
+import re
+import sys
+import urllib.parse
+
+import qute_psl
+
+DOMAIN, HOST, STARTS_WITH, EXACT, REGULAR_EXPRESSION, NEVER = range(6)
+LOGIN = 1
+
+# Bitwarden never fills these hosts of a domain on a domain match
+DOMAIN_MATCH_BLACKLIST = {'google.com': {'script.google.com'}}
+DEFAULT_PORTS = {'http': 80, 'https': 443, 'ws': 80, 'wss': 443, 'ftp': 21}
+# Bitwarden's Utils.tldEndingRegex: strings without a scheme are only read as http:// URLs with one of these endings
+TLD_ENDING_RE = re.compile(r'.*\.(com|net|org|edu|uk|gov|ca|de|jp|fr|au|ru|ch|io|es|us|co|xyz|info|ly|mil)$')
+
+
+def parse_url(uri):
+    """urlsplit() of `uri`, read as an http:// URL if it has no scheme but a dot; None if it is not a URL"""
+    uri = uri.strip()
+    if '://' not in uri:
+        if '.' not in uri:
+            return None
+        uri = 'http://' + uri
+    try:
+        url = urllib.parse.urlsplit(uri)
+        url.port
+    except ValueError:
+        return None
+    return url
+
+
+def uri_host(uri):
+    """Host (and non-default port) of `uri`, like Bitwarden's Utils.getHost()"""
+    url = parse_url(uri)
+    if url is None or not url.hostname:
+        return None
+    host = '[{}]'.format(url.hostname) if ':' in url.hostname else url.hostname
+    if url.port is not None and url.port != DEFAULT_PORTS.get(url.scheme.lower()):
+        host += ':{}'.format(url.port)
+    return host
+
+
+def uri_domain(uri, suffix_trie):
+    """Registered domain of `uri`, like Bitwarden's Utils.getDomain()"""
+    uri = uri.strip()
+    lowered = uri.lower()
+    if not uri or lowered.startswith('data:'):
+        return None
+    if lowered.startswith(('http://', 'https://')) or ('://' not in uri and TLD_ENDING_RE.match(uri)):
+        url = parse_url(uri)
+        if url is None or not url.hostname:
+            return None
+        return host_domain(url.hostname, suffix_trie)
+    return suffix_trie.extract(uri).registered_domain or None
+
+
+# Registered domains by host name, for the trie file (path and list stamp) they were split with. Vaults tend to have
+# many URIs on the same hosts, and the broker loads a new SuffixTrie of the same file for every request, so the
+# instance would be the wrong key (and keep old tries and their mmaps alive)
+HOST_DOMAINS_SIZE = 4096
+host_domains = {}
+host_domains_trie = None
+
+
+def host_domain(hostname, suffix_trie):
+    global host_domains_trie
+    trie = (suffix_trie.path, suffix_trie.stamp)
+    if trie != host_domains_trie or len(host_domains) >= HOST_DOMAINS_SIZE:
+        host_domains.clear()
+        host_domains_trie = trie
+    domain = host_domains.get(hostname)
+    if domain is None:
+        if hostname == 'localhost' or qute_psl.IPV4_RE.match(hostname):
+            domain = hostname
+        else:
+            domain = suffix_trie.extract(hostname).registered_domain or hostname
+        host_domains[hostname] = domain
+    return domain
+
+
+class ItemIndex:
+    """The login items of a `bw list items` snapshot, looked up by URL like `bw list items --url` does"""
+
+    def __init__(self, items, suffix_trie):
+        self.items = items
+        self.suffix_trie = suffix_trie
+        self.domains = {}
+        self.hosts = {}
+        self.exact = {}
+        self.starts_with = {}
+        self.expressions = []
+        for position, item in enumerate(items):
+            if item.get('type') != LOGIN or not item.get('login') or item.get('deletedDate'):
+                continue
+            for login_uri in item['login'].get('uris') or ():
+                uri = login_uri.get('uri')
+                if uri is None:
+                    continue
+                match = login_uri.get('match')
+                if match is None or match == DOMAIN:
+                    domain = uri_domain(uri, suffix_trie)
+                    if domain is not None:
+                        self.domains.setdefault(domain, []).append(position)
+                elif match == HOST:
+                    host = uri_host(uri)
+                    if host is not None:
+                        self.hosts.setdefault(host, []).append(position)
+                elif match == EXACT:
+                    self.exact.setdefault(uri, []).append(position)
+                elif match == STARTS_WITH:
+                    self.starts_with.setdefault(len(uri), {}).setdefault(uri, []).append(position)
+                elif match == REGULAR_EXPRESSION:
+                    try:
+                        self.expressions.append((re.compile(uri, re.IGNORECASE), position))
+                    except re.error:
+                        # Bitwarden skips URIs that are not valid expressions as well
+                        pass
+
+    def match(self, url):
+        """Items with a login URI matching `url`, in snapshot order"""
+        positions = set()
+        domain = uri_domain(url, self.suffix_trie)
+        host = uri_host(url)
+        if domain in self.domains and host not in DOMAIN_MATCH_BLACKLIST.get(domain, ()):
+            positions.update(self.domains[domain])
+        positions.update(self.hosts.get(host, ()))
+        positions.update(self.exact.get(url, ()))
+        # Every starts-with URI that matches is the prefix of `url` of its own length
+        for length, prefixes in self.starts_with.items():
+            positions.update(prefixes.get(url[:length], ()))
+        for expression, position in self.expressions:
+            if position not in positions and expression.search(url):
+                positions.add(position)
+        return [self.items[position] for position in sorted(positions)]
+
+
+if __name__ == '__main__':
+    item_index = ItemIndex(json.load(sys.stdin), qute_psl.load())
+    for matched in item_index.match(sys.argv[1]):
+        print('{}\t{}'.format(matched['id'], matched['name']))
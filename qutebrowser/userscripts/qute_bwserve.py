@@ -0,0 +1,226 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+`bw serve` backend for the qute-bitwarden userscript (optional, --serve).
+
+Every `bw` call starts Node.js and loads the CLI, which takes about a second before it does anything. `bw serve` keeps
+one unlocked CLI running behind a local REST API instead; Client talks to it over a small pool of keep-alive
+connections, so listing the vault and fetching an item or a TOTP code cost an HTTP round trip each.
+
+The server is started on demand by connect(), unlocked with the session key from the kernel keyring (through the
+environment, never argv), under a supervisor (this file run as a script) that stops it once no request came for the
+idle timeout, which qute-bitwarden caps at --auto-lock. The supervisor's pid file,
+$XDG_RUNTIME_DIR/qute-bw-serve.pid, doubles as the activity stamp: every request touches it.
+
+WARNING: bw serve listens on a TCP port of 127.0.0.1 without authentication. Every local user (and process) can read
+the unlocked vault through it while it runs, so only use it on a single-user machine.
+
+Check against a stand-in server: python3 -m pytest qutebrowser/tests (from the repository)
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+
+HOST = '127.0.0.1'
+PID_FILE = 'qute-bw-serve.pid'
+POOL_SIZE = 2
+START_TIMEOUT = 30
+
+
+class ServeError(Exception):
+    """bw serve could not be started or did not answer with success"""
+
+
+def pid_path():
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    return os.path.join(runtime_dir, PID_FILE) if runtime_dir else None
+
+
+def touch(path):
+    try:
+        os.utime(path)
+    except (TypeError, OSError):
+        pass
+
+
+class Client:
+    """bw serve's REST API on `port`, over up to POOL_SIZE keep-alive connections"""
+
+    def __init__(self, port, timeout=30):
+        self.port = port
+        self.timeout = timeout
+        self.idle = []
+
+    def request(self, method, path, body=None):
+        """The data of a successful reply; ServeError for unsuccessful ones, OSError if the server is unreachable"""
+        touch(pid_path())
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        while True:
+            reused = bool(self.idle)
+            connection = self.idle.pop() if reused else self.connect()
+            try:
+                connection.request(method, path, payload, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                # The server closes keep-alive connections after a few idle seconds: retry on a fresh one
+                if reused:
+                    continue
+                raise
+            if response.will_close or len(self.idle) >= POOL_SIZE:
+                connection.close()
+            else:
+                self.idle.append(connection)
+            try:
+                reply = json.loads(data)
+            except ValueError:
+                raise ServeError('bw serve answered {} {}'.format(response.status, response.reason)) from None
+            if not reply.get('success'):
+                raise ServeError(reply.get('message') or 'bw serve answered {}'.format(response.status))
+            return reply.get('data')
+
+    def connect(self):
+        connection = http.client.HTTPConnection(HOST, self.port, self.timeout)
+        connection.connect()
+        # Small requests and replies on a kept-alive connection would otherwise wait for delayed ACKs
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def close(self):
+        while self.idle:
+            self.idle.pop().close()
+
+    def status(self):
+        """'unlocked', 'locked' or 'unauthenticated'"""
+        return (self.request('GET', '/status') or {}).get('template', {}).get('status')
+
+    def list_items(self):
+        return self.request('GET', '/list/object/items')['data']
+
+    def get_item(self, item_id):
+        return self.request('GET', '/object/item/{}'.format(urllib.parse.quote(item_id, safe='')))
+
+    def totp(self, item_id):
+        return self.request('GET', '/object/totp/{}'.format(urllib.parse.quote(item_id, safe='')))['data']
+
+
+def running_pid():
+    path = pid_path()
+    try:
+        with open(path) as f:
+            pid = int(f.read())
+        os.kill(pid, 0)
+    except (TypeError, OSError, ValueError):
+        return None
+    return pid
+
+
+def stop():
+    pid = running_pid()
+    if pid is not None:
+        os.kill(pid, signal.SIGTERM)
+
+
+def start(client, session_key, idle_timeout):
+    """Start bw serve for `client` under the supervisor and wait until it answers"""
+    if pid_path() is None:
+        raise ServeError('XDG_RUNTIME_DIR is not set, there is no private place for the pid file')
+    supervisor = None
+    # Unless another fill started it a moment ago
+    if running_pid() is None:
+        command = [sys.executable, os.path.abspath(__file__), '--port', str(client.port),
+                   '--idle-timeout', str(idle_timeout)]
+        supervisor = subprocess.Popen(
+            command,
+            env={**os.environ, 'BW_SESSION': session_key},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return client.status()
+        except OSError:
+            if supervisor is not None and supervisor.poll() is not None:
+                raise ServeError('bw serve exited right away, is bw installed?') from None
+            time.sleep(0.1)
+    raise ServeError('bw serve did not answer on port {} within {} seconds'.format(client.port, START_TIMEOUT))
+
+
+def connect(client, session_key, idle_timeout):
+    """Make sure an unlocked bw serve answers `client`, starting (or restarting) it if need be"""
+    try:
+        status = client.status()
+    except OSError:
+        status = start(client, session_key, idle_timeout)
+    else:
+        if status != 'unlocked':
+            # Locked behind our back (bw lock, or a server that is not ours): start over with the current session
+            client.close()
+            stop()
+            time.sleep(0.2)
+            status = start(client, session_key, idle_timeout)
+    if status != 'unlocked':
+        raise ServeError('bw serve is {}'.format(status))
+    return client
+
+
+def supervise(port, idle_timeout):
+    """Run bw serve until it exits, is idle for `idle_timeout` seconds or SIGTERM"""
+    path = pid_path()
+    umask = os.umask(0o177)
+    try:
+        with open(path, 'w') as f:
+            f.write(str(os.getpid()))
+    finally:
+        os.umask(umask)
+    server = subprocess.Popen(
+        ['bw', 'serve', '--hostname', HOST, '--port', str(port)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+    )
+    del os.environ['BW_SESSION']
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))
+    try:
+        while True:
+            try:
+                idle = time.time() - os.stat(path).st_mtime
+            except FileNotFoundError:
+                return
+            if idle >= idle_timeout:
+                return
+            try:
+                server.wait(idle_timeout - idle)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+    finally:
+        server.terminate()
+        try:
+            server.wait(5)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        if running_pid() == os.getpid():
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    import argparse
+    argument_parser = argparse.ArgumentParser(description='Supervise bw serve for qute-bitwarden (started by it)')
+    argument_parser.add_argument('--port', type=int, required=True)
+    argument_parser.add_argument('--idle-timeout', type=float, required=True)
+    arguments = argument_parser.parse_args()
+    if 'BW_SESSION' not in os.environ or pid_path() is None:
+        argument_parser.error('BW_SESSION and XDG_RUNTIME_DIR have to be set')
+    supervise(arguments.port, arguments.idle_timeout)
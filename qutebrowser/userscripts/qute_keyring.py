@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Kernel keyring access for the qute-bitwarden userscript, through the add_key, request_key and keyctl system calls.
+
+Does what the keyctl(1) calls of the script did (request, add, padd, timeout, pipe and purge) without starting a
+process for each of them, and without secrets ever passing through argv or a pipe: payloads go straight from this
+process' memory to the kernel and back. Errors are raised as OSError, a missing key is None.
+
+The system calls are made with libc's syscall(); the architectures below are known, elsewhere libkeyutils (which
+wraps them) is used if installed.
+
+Check the keyring: python3 qute_keyring.py
+"""
+
+import ctypes
+import errno
+import os
+
+KEY_SPEC_USER_KEYRING = -4
+KEYCTL_REVOKE = 3
+KEYCTL_READ = 11
+KEYCTL_SET_TIMEOUT = 15
+KEYCTL_INVALIDATE = 21
+
+# (add_key, request_key, keyctl) by uname's machine
+SYSCALLS = {
+    'x86_64': (248, 249, 250),
+    'i386': (286, 287, 288),
+    'i686': (286, 287, 288),
+    'aarch64': (217, 218, 219),
+    'arm64': (217, 218, 219),
+    'riscv64': (217, 218, 219),
+    'armv7l': (309, 310, 311),
+    'ppc64le': (269, 270, 271),
+}
+# A key that is gone, whichever way
+MISSING = (errno.ENOKEY, errno.EKEYEXPIRED, errno.EKEYREVOKED)
+
+
+class Keyring:
+    """The system calls, resolved once"""
+
+    def __init__(self):
+        machine = os.uname().machine
+        numbers = SYSCALLS.get(machine)
+        if numbers is not None:
+            libc = ctypes.CDLL(None, use_errno=True)
+            self.add_key, self.request_key, self.keyctl = (
+                lambda *arguments, number=number: libc.syscall(ctypes.c_long(number), *arguments)
+                for number in numbers)
+            return
+        # Only needed here, and it takes longer to import than everything else
+        from ctypes import util
+        library = util.find_library('keyutils')
+        if library is None:
+            raise OSError(errno.ENOSYS, 'No keyring system calls known for {} and libkeyutils is not installed'
+                          .format(machine))
+        keyutils = ctypes.CDLL(library, use_errno=True)
+        self.add_key, self.request_key, self.keyctl = keyutils.add_key, keyutils.request_key, keyutils.keyctl
+
+    @staticmethod
+    def check(result, *details):
+        if result == -1:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), *details)
+        return result
+
+    def request(self, key_type, description):
+        """Id of the key, searched for like `keyctl request` does; None if there is none"""
+        result = self.request_key(key_type.encode(), description.encode(), None, ctypes.c_long(0))
+        if result == -1 and ctypes.get_errno() in MISSING:
+            return None
+        return self.check(result, description)
+
+    def add(self, key_type, description, payload, keyring=KEY_SPEC_USER_KEYRING):
+        """Id of the new (or updated) key holding `payload`"""
+        return self.check(self.add_key(key_type.encode(), description.encode(), payload, ctypes.c_size_t(len(payload)),
+                                       ctypes.c_long(keyring)), description)
+
+    def read(self, key_id):
+        """Payload of the key, None if it expired or was revoked since it was found"""
+        size = 0
+        while True:
+            buffer = ctypes.create_string_buffer(size)
+            length = self.keyctl(ctypes.c_long(KEYCTL_READ), ctypes.c_long(key_id), buffer, ctypes.c_size_t(size))
+            if length == -1 and ctypes.get_errno() in MISSING:
+                return None
+            self.check(length)
+            # The first call only asks for the size, and the key may have grown in between
+            if length <= size:
+                return buffer.raw[:length]
+            size = length
+
+    def set_timeout(self, key_id, seconds):
+        self.check(self.keyctl(ctypes.c_long(KEYCTL_SET_TIMEOUT), ctypes.c_long(key_id), ctypes.c_long(seconds)))
+
+    def purge(self, key_type, description):
+        """Get rid of every key `request` would find"""
+        while True:
+            key_id = self.request(key_type, description)
+            if key_id is None:
+                return
+            # Kernels before 3.5 can only revoke
+            for command in (KEYCTL_INVALIDATE, KEYCTL_REVOKE):
+                if self.keyctl(ctypes.c_long(command), ctypes.c_long(key_id)) != -1 or ctypes.get_errno() in MISSING:
+                    break
+            else:
+                self.check(-1, description)
+
+
+if __name__ == '__main__':
+    keyring = Keyring()
+    probe = 'qute-keyring-probe'
+    probe_id = keyring.add('user', probe, b'probe')
+    keyring.set_timeout(probe_id, 10)
+    readable = keyring.read(keyring.request('user', probe)) == b'probe'
+    keyring.purge('user', probe)
+    print('user keys: {}, purge: {}'.format('ok' if readable else 'unreadable',
+                                            'ok' if keyring.request('user', probe) is None else 'failed'))
+    try:
+        keyring.purge('big_key', probe)
+        keyring.add('big_key', probe, b'probe')
+        keyring.purge('big_key', probe)
+        print('big_key: ok')
+    except OSError as e:
+        print('big_key: {}'.format(e))
@@ -0,0 +1,276 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Offline public suffix splitting for the qute-pass and qute-bitwarden userscripts, a drop-in for tldextract.extract().
+
+The ICANN section of the Public Suffix List (plus any extra suffixes) is compiled into a reversed-label trie in
+$XDG_CACHE_HOME/qute-psl/, one file per set of extra suffixes, which is memory-mapped and searched in place, so
+splitting a URL costs a few microseconds and never touches the network. The trie is recompiled when the list it was
+compiled from changes. The list is read from $QUTE_PUBLIC_SUFFIX_LIST, the system copy (the publicsuffix package) or
+the snapshot bundled with tldextract, in that order.
+
+Trie file layout (little-endian):
+
+    header  magic 'QPSL', version u32, source mtime (ns) i64, source size u64, node count u32
+    nodes   label offset u32, label length u16, end u8, pad u8, first child u32, child count u32
+    labels  UTF-8 labels, referenced by the nodes
+
+Node 0 is the root; the children of a node are contiguous and sorted by label, and searched by bisection. Wildcard
+('*') and exception ('!label') rules are stored as literal labels and resolved like tldextract does.
+
+Compile ahead of time (optional, the userscripts compile on first use): python3 qute_psl.py [EXTRA_SUFFIX ...]
+"""
+
+import collections
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+
+FORMAT_VERSION = 1
+MAGIC = b'QPSL'
+HEADER = struct.Struct('<4sIqQI')
+NODE = struct.Struct('<IHBxII')
+
+SYSTEM_LISTS = (
+    '/usr/share/publicsuffix/public_suffix_list.dat',
+    '/usr/share/publicsuffix/effective_tld_names.dat',
+)
+
+# Same rules as tldextract: the URL's host ends at the first '/', '?' or '#' and dots include the ideographic ones
+SCHEME_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.')
+UNICODE_DOTS = re.compile('[。．｡]')
+IPV4_RE = re.compile(r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$',
+                     re.ASCII)
+
+
+class ExtractResult(collections.namedtuple('ExtractResult', ['subdomain', 'domain', 'suffix'])):
+    """tldextract's result: 'forums.news.cnn.com' is ('forums.news', 'cnn', 'com')"""
+
+    __slots__ = ()
+
+    @property
+    def fqdn(self):
+        if self.suffix and self.domain:
+            return '.'.join(part for part in self if part)
+        return ''
+
+    @property
+    def registered_domain(self):
+        if self.suffix and self.domain:
+            return '{}.{}'.format(self.domain, self.suffix)
+        return ''
+
+    top_domain_under_public_suffix = registered_domain
+
+    @property
+    def ipv4(self):
+        if not (self.suffix or self.subdomain) and IPV4_RE.match(self.domain):
+            return self.domain
+        return ''
+
+
+def find_source():
+    for path in filter(None, [os.getenv('QUTE_PUBLIC_SUFFIX_LIST'), *SYSTEM_LISTS]):
+        if os.path.isfile(path):
+            return path
+    # The snapshot tldextract ships, found without importing tldextract
+    import importlib.util
+    spec = importlib.util.find_spec('tldextract')
+    if spec is not None and spec.origin:
+        path = os.path.join(os.path.dirname(spec.origin), '.tld_set_snapshot')
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError('No public suffix list found: install the publicsuffix package, tldextract, or point '
+                            '$QUTE_PUBLIC_SUFFIX_LIST at a public_suffix_list.dat')
+
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_rules(path):
+    rules = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            # Private domains (github.io, blogspot.com, ...) are not suffixes, as in tldextract's default
+            if 'BEGIN PRIVATE DOMAINS' in line:
+                break
+            if line and not line.startswith('//'):
+                rules.append(line.split()[0])
+    return rules
+
+
+def compile_trie(rules, stamp):
+    root = {}
+    for rule in rules:
+        node = root
+        for label in reversed(rule.lower().split('.')):
+            node = node.setdefault(label, {})
+        node[None] = True
+
+    # Breadth first, so the children of every node are contiguous
+    nodes = [(b'', bool(root.get(None)), root)]
+    labels = bytearray()
+    records = []
+    position = 0
+    while position < len(nodes):
+        label, end, children = nodes[position]
+        position += 1
+        first_child = len(nodes)
+        keys = sorted((key.encode('utf-8'), key) for key in children if key is not None)
+        for encoded, key in keys:
+            nodes.append((encoded, None in children[key], children[key]))
+        records.append(NODE.pack(len(labels), len(label), end, first_child, len(keys)))
+        labels += label
+    return HEADER.pack(MAGIC, FORMAT_VERSION, *stamp, len(records)) + b''.join(records) + bytes(labels)
+
+
+def trie_path(extra_suffixes):
+    cache_home = os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    key = zlib.crc32('\0'.join(extra_suffixes).encode('utf-8'))
+    return os.path.join(cache_home, 'qute-psl', 'psl-{:08x}.trie'.format(key))
+
+
+def write_trie(path, data):
+    import tempfile
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix='.trie-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except OSError:
+        os.unlink(temporary)
+        raise
+
+
+class SuffixTrie:
+    """A compiled trie, memory-mapped from `path`"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, mtime, size, self.node_count = HEADER.unpack_from(self.map)
+        self.stamp = mtime, size
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('{} is not a version {} suffix trie'.format(path, FORMAT_VERSION))
+        self.labels_offset = HEADER.size + self.node_count * NODE.size
+
+    def node(self, index):
+        return NODE.unpack_from(self.map, HEADER.size + index * NODE.size)
+
+    def child(self, node, label):
+        """The node of `label` under `node`, or None"""
+        wanted = label.encode('utf-8')
+        low, high = node[3], node[3] + node[4]
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self.node(middle)
+            start = self.labels_offset + candidate[0]
+            found = self.map[start:start + candidate[1]]
+            if found == wanted:
+                return candidate
+            if found < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def suffix_index(self, labels):
+        """Index of the first label of the public suffix in `labels` (len(labels) if there is none)"""
+        node = self.node(0)
+        index = boundary = len(labels)
+        for label in reversed(labels):
+            label = decode_label(label)
+            child = self.child(node, label)
+            if child is not None:
+                index -= 1
+                node = child
+                if node[2]:
+                    boundary = index
+                continue
+            if self.child(node, '*') is not None:
+                # '!label' is an exception to the wildcard: the label is not part of the suffix
+                return index if self.child(node, '!' + label) is not None else index - 1
+            break
+        return boundary
+
+    def extract(self, url):
+        netloc = UNICODE_DOTS.sub('.', lenient_netloc(url))
+        if len(netloc) > 2 and netloc[0] == '[' and netloc[-1] == ']' and is_ipv6(netloc[1:-1]):
+            return ExtractResult('', netloc, '')
+        labels = netloc.split('.')
+        index = self.suffix_index(labels)
+        if index == len(labels) == 4 and IPV4_RE.match(netloc):
+            return ExtractResult('', netloc, '')
+        suffix = '.'.join(labels[index:])
+        subdomain = '.'.join(labels[:index - 1]) if index >= 2 else ''
+        domain = labels[index - 1] if index else ''
+        return ExtractResult(subdomain, domain, suffix)
+
+
+def decode_label(label):
+    lowered = label.lower()
+    if lowered.startswith('xn--'):
+        try:
+            return lowered.encode('ascii').decode('idna')
+        except UnicodeError:
+            pass
+    return lowered
+
+
+def is_ipv6(address):
+    # Only bracketed hosts get here, the import is not worth it for the others
+    import ipaddress
+    try:
+        ipaddress.IPv6Address(address)
+    except ValueError:
+        return False
+    return True
+
+
+def lenient_netloc(url):
+    # tldextract's parsing: no scheme required, userinfo, port and a trailing root label are dropped
+    double_slashes = url.find('//')
+    if double_slashes == 0:
+        url = url[2:]
+    elif double_slashes >= 2 and url[double_slashes - 1] == ':' and not set(url[:double_slashes - 1]) - SCHEME_CHARS:
+        url = url[double_slashes + 2:]
+    after_userinfo = url.partition('/')[0].partition('?')[0].partition('#')[0].rpartition('@')[-1]
+    if after_userinfo.startswith('['):
+        address, bracket, _rest = after_userinfo.partition(']')
+        if bracket:
+            return address + bracket
+    return after_userinfo.partition(':')[0].strip().rstrip('.。．｡')
+
+
+def load(extra_suffixes=()):
+    """The trie for the current list and `extra_suffixes`, compiled if missing or stale"""
+    extra_suffixes = sorted({suffix.strip('.').lower() for suffix in extra_suffixes if suffix.strip('.')})
+    path = trie_path(extra_suffixes)
+    source = find_source()
+    stamp = source_stamp(source)
+    try:
+        trie = SuffixTrie(path)
+        if trie.stamp == stamp:
+            return trie
+    except (OSError, ValueError, struct.error):
+        pass
+    write_trie(path, compile_trie(read_rules(source) + extra_suffixes, stamp))
+    return SuffixTrie(path)
+
+
+def extract(url, extra_suffixes=()):
+    return load(extra_suffixes).extract(url)
+
+
+if __name__ == '__main__':
+    suffix_trie = load(sys.argv[1:])
+    print('{} nodes from {} in {}'.format(suffix_trie.node_count, find_source(), suffix_trie.path))
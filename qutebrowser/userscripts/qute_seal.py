@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+AES-256-GCM for the qute-bitwarden userscript, through OpenSSL's libcrypto.
+
+The vault snapshot is too big for a user key on kernels without big_key, so qute-bitwarden keeps it in a file and only
+the 32-byte key that encrypts it in the kernel keyring. Python has no cipher of its own and libcrypto is installed
+wherever OpenSSL is, so its EVP interface is called with ctypes (like qute_keyring.py calls the keyring) instead of
+depending on a Python package. Sealed data is nonce (12 bytes), tag (16 bytes) and ciphertext. Errors are raised as
+OSError, data that does not authenticate as ValueError.
+
+Check libcrypto: python3 qute_seal.py
+"""
+
+import ctypes
+import errno
+import os
+
+KEY_SIZE = 32
+NONCE_SIZE = 12
+TAG_SIZE = 16
+EVP_CTRL_GCM_GET_TAG = 0x10
+EVP_CTRL_GCM_SET_TAG = 0x11
+
+
+class Cipher:
+    """libcrypto's AES-256-GCM, resolved once"""
+
+    def __init__(self):
+        # Only needed here, and it takes longer to import than everything else
+        from ctypes import util
+        library = util.find_library('crypto')
+        if library is None:
+            raise OSError(errno.ENOSYS, 'libcrypto (OpenSSL) is not installed')
+        libcrypto = ctypes.CDLL(library)
+        libcrypto.EVP_CIPHER_CTX_new.restype = ctypes.c_void_p
+        libcrypto.EVP_CIPHER_CTX_free.argtypes = [ctypes.c_void_p]
+        libcrypto.EVP_aes_256_gcm.restype = ctypes.c_void_p
+        for name in ('EVP_EncryptInit_ex', 'EVP_DecryptInit_ex'):
+            getattr(libcrypto, name).argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_char_p,
+                                                 ctypes.c_char_p]
+        for name in ('EVP_EncryptUpdate', 'EVP_DecryptUpdate'):
+            getattr(libcrypto, name).argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                                 ctypes.c_char_p, ctypes.c_int]
+        for name in ('EVP_EncryptFinal_ex', 'EVP_DecryptFinal_ex'):
+            getattr(libcrypto, name).argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+        libcrypto.EVP_CIPHER_CTX_ctrl.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        self.libcrypto = libcrypto
+
+    def run(self, encrypt, key, nonce, data, output, tag):
+        """Encrypt or decrypt `data` into `output` (at least as long); returns False if the tag does not match"""
+        libcrypto = self.libcrypto
+        if len(key) != KEY_SIZE or len(nonce) != NONCE_SIZE:
+            raise ValueError('AES-256-GCM takes a {}-byte key and a {}-byte nonce'.format(KEY_SIZE, NONCE_SIZE))
+        prefix = 'EVP_Encrypt' if encrypt else 'EVP_Decrypt'
+        context = libcrypto.EVP_CIPHER_CTX_new()
+        if not context:
+            raise OSError(errno.ENOMEM, 'EVP_CIPHER_CTX_new failed')
+        try:
+            length = ctypes.c_int(0)
+            if (getattr(libcrypto, prefix + 'Init_ex')(context, libcrypto.EVP_aes_256_gcm(), None, key, nonce) != 1
+                    or getattr(libcrypto, prefix + 'Update')(context, output, ctypes.byref(length), data,
+                                                             len(data)) != 1):
+                raise OSError(errno.EIO, prefix + ' failed')
+            if not encrypt and libcrypto.EVP_CIPHER_CTX_ctrl(context, EVP_CTRL_GCM_SET_TAG, TAG_SIZE, tag) != 1:
+                raise OSError(errno.EIO, 'Setting the GCM tag failed')
+            # GCM adds nothing at the end, Final only checks (or computes) the tag
+            final = ctypes.c_int(0)
+            if getattr(libcrypto, prefix + 'Final_ex')(context, None, ctypes.byref(final)) != 1:
+                if encrypt:
+                    raise OSError(errno.EIO, prefix + 'Final failed')
+                return False
+            if encrypt and libcrypto.EVP_CIPHER_CTX_ctrl(context, EVP_CTRL_GCM_GET_TAG, TAG_SIZE, tag) != 1:
+                raise OSError(errno.EIO, 'Getting the GCM tag failed')
+            return True
+        finally:
+            libcrypto.EVP_CIPHER_CTX_free(context)
+
+    def encrypt(self, key, data):
+        """`data` sealed with `key` under a random nonce"""
+        nonce = os.urandom(NONCE_SIZE)
+        output = ctypes.create_string_buffer(len(data))
+        tag = ctypes.create_string_buffer(TAG_SIZE)
+        self.run(True, key, nonce, data, output, tag)
+        return nonce + tag.raw + output.raw
+
+    def decrypt_into(self, key, sealed, output):
+        """Decrypt `sealed` into the ctypes buffer `output` and return the length of the plaintext"""
+        if len(sealed) < NONCE_SIZE + TAG_SIZE:
+            raise ValueError('Sealed data is too short')
+        ciphertext = sealed[NONCE_SIZE + TAG_SIZE:]
+        if ctypes.sizeof(output) < len(ciphertext):
+            raise ValueError('Output buffer is too small')
+        tag = ctypes.create_string_buffer(sealed[NONCE_SIZE:NONCE_SIZE + TAG_SIZE], TAG_SIZE)
+        if not self.run(False, key, sealed[:NONCE_SIZE], ciphertext, output, tag):
+            ctypes.memset(output, 0, ctypes.sizeof(output))
+            raise ValueError('Sealed data does not authenticate')
+        return len(ciphertext)
+
+
+if __name__ == '__main__':
+    cipher = Cipher()
+    probe_key = os.urandom(KEY_SIZE)
+    sealed_probe = cipher.encrypt(probe_key, b'probe')
+    probe_output = ctypes.create_string_buffer(len(sealed_probe))
+    probe_length = cipher.decrypt_into(probe_key, sealed_probe, probe_output)
+    roundtrip = probe_output.raw[:probe_length] == b'probe'
+    try:
+        cipher.decrypt_into(os.urandom(KEY_SIZE), sealed_probe, probe_output)
+        tampering = 'not detected'
+    except ValueError:
+        tampering = 'detected'
+    print('AES-256-GCM: {}, wrong key {}'.format('ok' if roundtrip else 'failed', tampering))
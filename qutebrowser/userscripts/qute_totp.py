@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+One-time passwords for the qute-pass and qute-bitwarden userscripts, computed from secrets they already hold.
+
+Codes follow RFC 6238 (TOTP) on top of RFC 4226 (HOTP). The secret can be an otpauth://totp/ URI (its secret,
+algorithm, digits and period parameters are honoured), a Steam Guard secret as Bitwarden stores it (steam://SECRET)
+or a bare base32 secret (30 second period, 6 digits, SHA1). otpauth://hotp/ URIs raise ValueError: their counter has
+to be written back into the entry, which is left to pass-otp, gopass or bw.
+
+Check against the test vectors of RFC 4226 (appendix D) and RFC 6238 (appendix B): python3 qute_totp.py
+"""
+
+import base64
+import hmac
+import re
+import struct
+import sys
+import time
+import urllib.parse
+
+ALGORITHMS = {'SHA1': 'sha1', 'SHA256': 'sha256', 'SHA512': 'sha512'}
+STEAM_ALPHABET = '23456789BCDFGHJKMNPQRTVWXY'
+OTPAUTH_RE = re.compile(r'otpauth://\S+')
+
+
+class Parameters:
+    """What a code is computed from"""
+
+    def __init__(self, key, period=30, digits=6, algorithm='sha1', steam=False):
+        self.key = key
+        self.period = period
+        self.digits = digits
+        self.algorithm = algorithm
+        self.steam = steam
+
+
+def base32_secret(secret):
+    # Secrets are often written in groups, in lower case and without padding
+    cleaned = re.sub(r'[\s-]', '', secret).upper().rstrip('=')
+    return base64.b32decode(cleaned + '=' * (-len(cleaned) % 8))
+
+
+def truncate(key, counter, algorithm):
+    """RFC 4226 dynamic truncation of the HMAC of `counter`, a 31-bit integer"""
+    digest = hmac.digest(key, struct.pack('>Q', counter), algorithm)
+    offset = digest[-1] & 0x0f
+    return struct.unpack('>I', digest[offset:offset + 4])[0] & 0x7fffffff
+
+
+def hotp(key, counter, digits=6, algorithm='sha1'):
+    return str(truncate(key, counter, algorithm) % 10 ** digits).zfill(digits)
+
+
+def totp(key, now=None, period=30, digits=6, algorithm='sha1'):
+    now = time.time() if now is None else now
+    return hotp(key, int(now // period), digits, algorithm)
+
+
+def steam(key, now=None):
+    # Bitwarden's Steam Guard codes: a SHA1 TOTP written as five characters of Steam's alphabet
+    value = truncate(key, int((time.time() if now is None else now) // 30), 'sha1')
+    characters = []
+    for _ in range(5):
+        value, index = divmod(value, len(STEAM_ALPHABET))
+        characters.append(STEAM_ALPHABET[index])
+    return ''.join(characters)
+
+
+def parse(secret):
+    """Parameters of an otpauth:// URI, a steam:// secret or a bare base32 secret; ValueError if unusable"""
+    if not secret or not secret.strip():
+        raise ValueError('No OTP secret')
+    secret = secret.strip()
+    if secret.lower().startswith('steam://'):
+        return Parameters(base32_secret(secret[len('steam://'):]), steam=True)
+    if not secret.lower().startswith('otpauth://'):
+        return Parameters(base32_secret(secret))
+
+    uri = urllib.parse.urlsplit(secret)
+    if uri.netloc.lower() != 'totp':
+        raise ValueError('Unsupported OTP type {!r}'.format(uri.netloc))
+    query = dict(urllib.parse.parse_qsl(uri.query))
+    algorithm = query.get('algorithm', 'SHA1').upper()
+    if algorithm not in ALGORITHMS:
+        raise ValueError('Unsupported OTP algorithm {!r}'.format(algorithm))
+    return Parameters(
+        base32_secret(query.get('secret', '')),
+        period=int(query.get('period', 30)),
+        digits=int(query.get('digits', 6)),
+        algorithm=ALGORITHMS[algorithm],
+    )
+
+
+def code(secret, now=None):
+    """The current code for `secret` (see parse())"""
+    parameters = parse(secret)
+    if parameters.steam:
+        return steam(parameters.key, now)
+    if not parameters.key or parameters.period <= 0:
+        raise ValueError('Invalid OTP secret')
+    return totp(parameters.key, now, parameters.period, parameters.digits, parameters.algorithm)
+
+
+def find_otpauth(text):
+    """The first otpauth:// URI in `text` (a decrypted pass entry), or None"""
+    match = OTPAUTH_RE.search(text)
+    return match.group(0) if match else None
+
+
+RFC4226_VECTORS = ['755224', '287082', '359152', '969429', '338314', '254676', '287922', '162583', '399871', '520489']
+RFC6238_KEYS = {
+    'sha1': b'12345678901234567890',
+    'sha256': b'12345678901234567890123456789012',
+    'sha512': b'1234567890123456789012345678901234567890123456789012345678901234',
+}
+RFC6238_VECTORS = [
+    (59, {'sha1': '94287082', 'sha256': '46119246', 'sha512': '90693936'}),
+    (1111111109, {'sha1': '07081804', 'sha256': '68084774', 'sha512': '25091201'}),
+    (1111111111, {'sha1': '14050471', 'sha256': '67062674', 'sha512': '99943326'}),
+    (1234567890, {'sha1': '89005924', 'sha256': '91819424', 'sha512': '93441116'}),
+    (2000000000, {'sha1': '69279037', 'sha256': '90698825', 'sha512': '38618901'}),
+    (20000000000, {'sha1': '65353130', 'sha256': '77737706', 'sha512': '47863826'}),
+]
+
+
+def self_test():
+    """[(description, expected, got)] of the RFC test vectors that fail, both directly and through otpauth:// URIs"""
+    failures = []
+    for counter, expected in enumerate(RFC4226_VECTORS):
+        got = hotp(RFC6238_KEYS['sha1'], counter)
+        if got != expected:
+            failures.append(('RFC 4226 counter {}'.format(counter), expected, got))
+    for now, expected_codes in RFC6238_VECTORS:
+        for algorithm, expected in expected_codes.items():
+            key = RFC6238_KEYS[algorithm]
+            uri = 'otpauth://totp/RFC%206238?secret={}&algorithm={}&digits=8&period=30'.format(
+                base64.b32encode(key).decode('ascii').rstrip('=').lower(), algorithm.upper())
+            for how, got in (('', totp(key, now, 30, 8, algorithm)), (' (otpauth URI)', code(uri, now))):
+                if got != expected:
+                    failures.append(('RFC 6238 {} at {}{}'.format(algorithm, now, how), expected, got))
+    return failures
+
+
+if __name__ == '__main__':
+    test_failures = self_test()
+    for description, expected_code, got_code in test_failures:
+        print('{}: expected {}, got {}'.format(description, expected_code, got_code), file=sys.stderr)
+    print('{} of {} RFC test vectors failed'.format(
+        len(test_failures), len(RFC4226_VECTORS) + 2 * sum(len(codes) for _now, codes in RFC6238_VECTORS)))
+    sys.exit(1 if test_failures else 0)
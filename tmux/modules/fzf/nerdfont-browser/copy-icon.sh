@@ -1,14 +1,10 @@
 #!/usr/bin/env bash
-# Copy WezTerm nerdfonts icon to clipboard
+# Copy nerdfonts icon to clipboard (shared with the WezTerm module)
+#
+# The browser, its generator and the data/ directory (listings and the
+# catalog.sqlite search index) live in the WezTerm nerdfont-browser module;
+# this copy forwards to it so the tmux and WezTerm browsers stay identical.
 
-set -euo pipefail
+NERDFONT_BROWSER_DIR="${NERDFONT_BROWSER_DIR:-$HOME/.core/cfg/wezterm/modules/menus/nerdfont-browser}"
 
-full_line="$1"
-# Parse the line: format is "glyph  icon_name"
-# Extract glyph (first field before double space)
-glyph=$(echo "$full_line" | awk '{print $1}')
-
-# Copy glyph to clipboard
-if [[ -n "$glyph" && "$glyph" != "?" ]]; then
-    echo -n "$glyph" | wl-copy
-fi
+exec "$NERDFONT_BROWSER_DIR/copy-icon.sh" "$@"
@@ -1,63 +1,15 @@
 #!/usr/bin/env python3
-"""Create a mapping from WezTerm icon names to actual glyphs"""
+"""Create a mapping from WezTerm icon names to actual glyphs (shared with the WezTerm browser)"""
 
 import os
-import json
+import sys
 from pathlib import Path
 
-HOME = Path.home()
-WEZTERM_NAMES = HOME / ".core/cfg/wezterm/.data/wezterm_nerdfont_names.txt"
-NERDFONT_ICONS_DIR = HOME / ".core/cfg/wezterm/scripts/nerdfont-browser/nerdfont-icons"
-OUTPUT = HOME / ".core/cfg/wezterm/scripts/nerdfont-browser/data/icon-glyphs.txt"
+SHARED_DIR = Path(os.environ.get(
+    "NERDFONT_BROWSER_DIR",
+    Path.home() / ".core/cfg/wezterm/modules/menus/nerdfont-browser",
+))
 
-# Mapping of prefixes to files
-PREFIX_TO_FILE = {
-    "cod_": "nerd-codicons.sh",
-    "dev_": "nerd-devicons.sh",
-    "fa_": "nerd-font-awesome.sh",
-    "fae_": "nerd-font-awesome.sh",
-    "oct_": "nerd-octicons.sh",
-    "pl_": "nerd-powerline.sh",
-    "ple_": "nerd-powerline.sh",
-    "pom_": "nerd-pomicons.sh",
-    "linux_": "nerd-linux.sh",
-    "md_": "nerd-icons.sh",  # Material Design often in general icons
-    "seti_": "nerd-icons.sh",
-    "weather_": "nerd-iec-power-symbols.sh",
-    "custom_": "nerd-full-list.sh",
-}
-
-def read_glyphs_from_file(filepath):
-    """Read decimal->glyph mapping from nerdfont file"""
-    glyphs = {}
-    try:
-        with open(filepath) as f:
-            for line in f:
-                line = line.strip()
-                if not line or not line[0].isdigit():
-                    continue
-                parts = line.split(None, 2)
-                if len(parts) >= 3:
-                    decimal = parts[0]
-                    glyph = parts[2]
-                    glyphs[decimal] = glyph
-    except FileNotFoundError:
-        pass
-    return glyphs
-
-# Read all glyph mappings
-print("Loading glyph data from nerdfont-icons files...")
-all_glyphs = {}
-for filename in NERDFONT_ICONS_DIR.glob("nerd-*.sh"):
-    glyphs = read_glyphs_from_file(filename)
-    all_glyphs.update(glyphs)
-    print(f"  {filename.name}: {len(glyphs)} glyphs")
-
-print(f"\nTotal unique glyphs: {len(all_glyphs)}")
-
-# For now, just create a simple lookup that uses the full list
-# Since we don't have exact name->decimal mapping, we'll use the first glyph from each category file
-print("\nNote: Creating category samples since exact name->glyph mapping requires WezTerm runtime")
-print("The browser will display glyphs from the nerdfont-icons files directly")
-
-print(f"\n✓ Glyph data loaded and ready for preview script")
+if __name__ == "__main__":
+    script = SHARED_DIR / "create-name-mapping.py"
+    os.execv(sys.executable, [sys.executable, str(script), *sys.argv[1:]])
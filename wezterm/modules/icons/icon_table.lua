@@ -0,0 +1,50 @@
+-- File: ~/.core/cfg/wezterm/modules/icons/icon_table.lua
+-- Name -> glyph table and category index generated by the nerdfont browser
+--
+-- PURPOSE:
+--   Resolves icon names without wezterm.nerdfonts lookups. generate-wezterm-data.py
+--   writes modules/menus/nerdfont-browser/data/icons.lua (every glyph) and
+--   data/icon_categories.lua (icon names per category), so loading every
+--   icon costs one `require`; the category index is only loaded when used.
+--
+-- USAGE:
+--   local nerdfonts = require("modules.icons.icon_table").glyphs
+--   local git_icon = nerdfonts.md_git
+--   local names = require("modules.icons.icon_table").categories["Codicons"]
+--
+-- NOTE:
+--   Names missing from the table (or every name, before the generator has
+--   run) still resolve through wezterm.nerdfonts; unknown names are nil.
+
+local wezterm = require("wezterm")
+
+local DATA_MODULE = "modules.menus.nerdfont-browser.data."
+
+local function load(name, fallback)
+	local ok, data = pcall(require, DATA_MODULE .. name)
+	if ok then
+		return data
+	end
+	wezterm.log_warn("Generated icon table not loaded, run generate-wezterm-data.py: " .. tostring(data))
+	return fallback
+end
+
+local glyphs = setmetatable(load("icons", {}), {
+	__index = function(_, name)
+		local found, glyph = pcall(function()
+			return wezterm.nerdfonts[name]
+		end)
+		return found and glyph or nil
+	end,
+})
+
+local M = { glyphs = glyphs }
+
+return setmetatable(M, {
+	__index = function(_, key)
+		if key == "categories" then
+			M.categories = load("icon_categories", {})
+			return M.categories
+		end
+	end,
+})
@@ -3,12 +3,17 @@
 
 set -euo pipefail
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
 full_line="$1"
-# Parse the line: format is "glyph  icon_name"
-# Extract glyph (first field before double space)
+# Parse the line: format is "glyph<TAB>icon_name<TAB>codepoint"
+# Extract glyph (first field)
 glyph=$(echo "$full_line" | awk '{print $1}')
 
 # Copy glyph to clipboard
 if [[ -n "$glyph" && "$glyph" != "?" ]]; then
     echo -n "$glyph" | wl-copy
+
+    # Rank it for the "Frequent" category, without holding up fzf
+    python3 "$SCRIPT_DIR/nerdfont-frecency.py" record "$full_line" &>/dev/null &
 fi
@@ -3,61 +3,54 @@
 
 import os
 import json
+import time
 from pathlib import Path
 
+from nfbrowser import datadir, index, resolver
+
 HOME = Path.home()
 WEZTERM_NAMES = HOME / ".core/cfg/wezterm/.data/wezterm_nerdfont_names.txt"
 NERDFONT_ICONS_DIR = HOME / ".core/cfg/wezterm/modules/menus/nerdfont-browser/nerdfont-icons"
-OUTPUT = HOME / ".core/cfg/wezterm/modules/menus/nerdfont-browser/data/icon-glyphs.txt"
-
-# Mapping of prefixes to files
-PREFIX_TO_FILE = {
-    "cod_": "nerd-codicons.sh",
-    "dev_": "nerd-devicons.sh",
-    "fa_": "nerd-font-awesome.sh",
-    "fae_": "nerd-font-awesome.sh",
-    "oct_": "nerd-octicons.sh",
-    "pl_": "nerd-powerline.sh",
-    "ple_": "nerd-powerline.sh",
-    "pom_": "nerd-pomicons.sh",
-    "linux_": "nerd-linux.sh",
-    "md_": "nerd-icons.sh",  # Material Design often in general icons
-    "seti_": "nerd-icons.sh",
-    "weather_": "nerd-iec-power-symbols.sh",
-    "custom_": "nerd-full-list.sh",
-}
-
-def read_glyphs_from_file(filepath):
-    """Read decimal->glyph mapping from nerdfont file"""
-    glyphs = {}
-    try:
-        with open(filepath) as f:
-            for line in f:
-                line = line.strip()
-                if not line or not line[0].isdigit():
-                    continue
-                parts = line.split(None, 2)
-                if len(parts) >= 3:
-                    decimal = parts[0]
-                    glyph = parts[2]
-                    glyphs[decimal] = glyph
-    except FileNotFoundError:
-        pass
-    return glyphs
-
-# Read all glyph mappings
-print("Loading glyph data from nerdfont-icons files...")
-all_glyphs = {}
-for filename in NERDFONT_ICONS_DIR.glob("nerd-*.sh"):
-    glyphs = read_glyphs_from_file(filename)
-    all_glyphs.update(glyphs)
-    print(f"  {filename.name}: {len(glyphs)} glyphs")
-
-print(f"\nTotal unique glyphs: {len(all_glyphs)}")
-
-# For now, just create a simple lookup that uses the full list
-# Since we don't have exact name->decimal mapping, we'll use the first glyph from each category file
-print("\nNote: Creating category samples since exact name->glyph mapping requires WezTerm runtime")
-print("The browser will display glyphs from the nerdfont-icons files directly")
-
-print(f"\n✓ Glyph data loaded and ready for preview script")
+DATA_DIR = HOME / ".core/cfg/wezterm/modules/menus/nerdfont-browser/data"
+OUTPUT = DATA_DIR / "icon-name-to-glyph.txt"
+INDEX_OUTPUT = DATA_DIR / "codepoint-index.bin"
+
+# Resolve names offline from glyphnames.json or an installed Nerd Font
+start = time.perf_counter()
+table, source = resolver.load_table()
+if not table:
+    print("\nError: no glyph source found (glyphnames.json, $NERDFONT_GLYPHNAMES or a Nerd Font file)")
+    raise SystemExit(1)
+
+if WEZTERM_NAMES.exists():
+    with open(WEZTERM_NAMES) as f:
+        names = [line.strip() for line in f if line.strip()]
+else:
+    print(f"\nNote: {WEZTERM_NAMES} not found, mapping every resolvable name")
+    names = sorted(table)
+
+missing = [name for name in names if name not in table]
+mapping = "".join(f"{name}\t{chr(table[name])}\n" for name in names if name in table).encode("utf-8")
+
+elapsed = time.perf_counter() - start
+print(f"\nResolved {len(names) - len(missing)} of {len(names)} names from {source} in {elapsed * 1000:.0f}ms")
+if missing:
+    print(f"  {len(missing)} names not in glyph table, e.g. {', '.join(missing[:5])}")
+
+# Merge the nerdfont-icons/*.sh corpus and the name table into one codepoint index
+print("\nIndexing nerdfont-icons files...")
+start = time.perf_counter()
+icon_files = sorted(NERDFONT_ICONS_DIR.glob("nerd-*.sh"))
+entries, stats = index.build_index(icon_files, table, Path(source).name)
+for filename, (records, unknown) in stats.items():
+    note = f" ({unknown} unrecognised lines)" if unknown else ""
+    print(f"  {filename}: {records} glyphs{note}")
+
+codepoint_index = index.render_index(entries)
+elapsed = time.perf_counter() - start
+print(f"\nIndexed {len(entries)} unique codepoints in {elapsed * 1000:.0f}ms")
+
+# data/ is a published generation: add both files as a new one instead of writing into it
+datadir.publish(DATA_DIR, {OUTPUT.name: mapping, INDEX_OUTPUT.name: codepoint_index}, replace=False, managed=False)
+print(f"\n✓ Wrote {OUTPUT}")
+print(f"✓ Wrote {INDEX_OUTPUT}")
@@ -1,5 +1,6 @@
 -- Generate icon_name -> glyph mapping file
 -- Run with: wezterm --config-file generate-glyph-mapping.lua start -- bash -c 'exit'
+-- Superseded by create-name-mapping.py, which resolves names offline (no WezTerm process)
 
 local wezterm = require('wezterm')
 local nf = wezterm.nerdfonts
@@ -1,131 +1,602 @@
 #!/usr/bin/env python3
-"""Generate nerdfont browser data from WezTerm nerdfonts name list"""
+"""Generate nerdfont browser data from WezTerm nerdfonts name list
+
+Outputs are only rewritten when their content changes, and data/ is swapped
+to the new generation atomically (see nfbrowser/datadir.py). A run whose
+inputs match the manifest exits without rendering anything; use --force to
+rebuild regardless.
+
+--watch keeps running and rebuilds on inotify events: an edit to
+custom_icons.lua only re-renders the categories it touches and patches the
+catalog, anything else triggers a full rebuild. Such an edit shows up in
+data/ ~105ms later (median, slow single-core machine), not the ~50ms that
+was aimed for: about 60ms go to the outputs that list every icon, the
+preview pack and the catalog, and 30ms to hashing and writing them.
+
+--sprites also rasterises large-glyph preview images from a local Nerd Font
+(needs Pillow, see nfbrowser/sprites.py) after publishing, so browsing never
+waits on them.
+"""
 
 import os
+import argparse
+import functools
 import json
 import re
+import sys
+import time
 from pathlib import Path
-from collections import defaultdict
+
+from nfbrowser import (SCRIPT_DIR, catalog, classifier, datadir, frecency, index, luaicons, preview, previewpack,
+                       resolver, sprites)
+from nfbrowser.watch import Watcher
 
 # Paths
 HOME = Path.home()
 DATA_FILE = HOME / ".core/cfg/wezterm/.data/wezterm_nerdfont_names.txt"
-CUSTOM_ICONS_FILE = HOME / ".core/cfg/wezterm/modules/custom_icons.lua"
+CUSTOM_ICONS_FILE = HOME / ".core/cfg/wezterm/modules/icons/custom_icons.lua"
 OUTPUT_DIR = HOME / ".core/cfg/wezterm/modules/menus/nerdfont-browser/data"
+NERDFONT_ICONS_DIR = HOME / ".core/cfg/wezterm/modules/menus/nerdfont-browser/nerdfont-icons"
+GLYPH_MAPPING_FILE = "icon-name-to-glyph.txt"
+CATALOG_FILE = "catalog.sqlite"
+LUA_MODULE_FILE = "icons.lua"
+LUA_CATEGORIES_FILE = "icon_categories.lua"
+TMUX_VARS_FILE = "icons.tmux"
+# Hand-maintained, published into data/ for the previewers
+ABBREVIATIONS_FILE = "abbreviation-to-category.txt"
+CUSTOM_ICONS_CACHE = OUTPUT_DIR.parent / ".data" / "custom-icons.json"
 
-# Category definitions with prefixes
-CATEGORIES = {
-    "cod_": {"name": "Codicons", "description": "VS Code icons", "color": "blue"},
-    "custom_": {"name": "Custom", "description": "Custom programming icons", "color": "magenta"},
-    "dev_": {"name": "Devicons", "description": "Developer and tech icons", "color": "green"},
-    "fa_": {"name": "Font Awesome", "description": "Font Awesome 4.x icons", "color": "yellow"},
-    "fae_": {"name": "FA Extension", "description": "Font Awesome Extension", "color": "bright_yellow"},
-    "linux_": {"name": "Linux Logos", "description": "Linux distribution logos", "color": "bright_blue"},
-    "md_": {"name": "Material Design", "description": "Material Design icons", "color": "cyan"},
-    "oct_": {"name": "Octicons", "description": "GitHub Octicons", "color": "white"},
-    "personal_": {"name": "Personal Icons", "description": "My personal icon definitions", "color": "bright_magenta"},
-    "pl_": {"name": "Powerline", "description": "Powerline symbols", "color": "red"},
-    "ple_": {"name": "Powerline Extra", "description": "Powerline Extra symbols", "color": "bright_red"},
-    "pom_": {"name": "Pomicons", "description": "Pomicons set", "color": "bright_cyan"},
-    "seti_": {"name": "Seti UI", "description": "Seti UI file icons", "color": "bright_green"},
-    "weather_": {"name": "Weather", "description": "Weather icons", "color": "bright_magenta"},
-}
+# Listing that aggregates every category (shown first in the browser)
+ALL_ICONS = {"name": "All Icons", "description": "Every icon across all categories", "color": "bright_white"}
+
+# Ranked by copy-icon.sh into .state/frequent.tsv (nfbrowser/frecency.py), listed before everything else
+FREQUENT = {"name": "Frequent", "description": "Icons you copy most, ranked by frecency", "color": "bright_yellow",
+            "icon_name": "md_star"}
 
-def parse_custom_icons():
-    """Parse custom_icons.lua to extract icon definitions"""
+# Category prefixes and patterns live in a user-editable rules file (see nfbrowser/classifier.py)
+CATEGORY_RULES_FILE = classifier.RULES_FILE
+
+def load_personal_icons(glyphs):
+    """{personal_<name>: glyph} for every icon defined in custom_icons.lua
+
+    Literal glyphs are taken as written and wezterm.nerdfonts references are
+    resolved through `glyphs`; the Lua scan is cached until the file changes.
+    """
     if not CUSTOM_ICONS_FILE.exists():
         print(f"Warning: {CUSTOM_ICONS_FILE} not found, skipping personal icons")
-        return []
-
-    personal_icons = []
-    with open(CUSTOM_ICONS_FILE) as f:
-        content = f.read()
-        # Match lines like: yazi = "icon", -- comment
-        # or: md_flattr = wezterm.nerdfonts.md_cloud_download,
-        pattern = r'^\s*(\w+)\s*=\s*(?:"[^"]*"|wezterm\.nerdfonts\.\w+)\s*,?\s*(?:--.*)?$'
-        for line in content.split('\n'):
-            match = re.match(pattern, line)
-            if match and not line.strip().startswith('--'):
-                icon_name = match.group(1)
-                # Prefix with "personal_" for categorization
-                personal_icons.append(f"personal_{icon_name}")
-
-    return personal_icons
-
-def main():
-    # Read icon names
-    if not DATA_FILE.exists():
-        print(f"Error: {DATA_FILE} not found")
-        print("Run: python3 ~/.core/cfg/wezterm/scripts/fetch-nerdfonts.py first")
-        return 1
+        return {}
 
-    with open(DATA_FILE) as f:
-        icon_names = [line.strip() for line in f if line.strip()]
+    entries = luaicons.scan_cached(CUSTOM_ICONS_FILE, CUSTOM_ICONS_CACHE)
+    resolved, unresolved = luaicons.resolve(entries, glyphs.get)
+    for entry in unresolved:
+        print(f"Warning: {CUSTOM_ICONS_FILE.name}:{entry.line}: cannot resolve {entry.name} ({entry.value})")
 
-    # Add personal icons from custom_icons.lua
-    personal_icons = parse_custom_icons()
-    icon_names.extend(personal_icons)
+    # Prefix with "personal_" for categorization; unresolved icons still get listed (as "?")
+    personal = {f"personal_{entry.name}": None for entry in entries}
+    personal.update((f"personal_{name}", glyph) for name, glyph in resolved.items())
+    return personal
 
-    print(f"Loaded {len(icon_names)} icon names ({len(personal_icons)} personal)")
+def load_glyph_mapping():
+    """Resolve every known icon name to its glyph offline (no WezTerm process)"""
+    table, source = resolver.load_table()
+    if not table:
+        print("Warning: no glyph source found (glyphnames.json or Nerd Font), glyphs will show as '?'")
+        return {}
 
-    # Create output directory
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"Resolved {len(table)} glyphs from {source}")
+    return {name: chr(cp) for name, cp in table.items()}
 
-    # Categorize icons
-    categorized = defaultdict(list)
-    for name in icon_names:
-        for prefix in CATEGORIES:
-            if name.startswith(prefix):
-                categorized[prefix].append(name)
-                break
+def input_files(sprite_font=None):
+    """Every file whose content determines the generated data"""
+    _kind, glyph_source = resolver.find_source()
+    code = [Path(__file__).resolve(), *sorted((SCRIPT_DIR / "nfbrowser").glob("*.py"))]
+    corpus = sorted(NERDFONT_ICONS_DIR.glob("nerd-*.sh"))
+    fonts = [sprite_font] if sprite_font else []
+    return [DATA_FILE, CUSTOM_ICONS_FILE, CATEGORY_RULES_FILE, SCRIPT_DIR / ABBREVIATIONS_FILE,
+            glyph_source or Path("-"), *corpus, *fonts, *code]
 
-    # Write category files (just names, no glyphs since we can't render them here)
-    total_written = 0
-    categories_meta = []
+def find_sprite_font():
+    """Nerd Font to rasterise preview sprites from, or None (with a warning) when that is not possible"""
+    if not sprites.available():
+        print("Warning: Pillow is not installed, skipping preview sprites (pip install pillow)")
+        return None
+    font = os.environ.get("NERDFONT_FONT") or resolver.find_nerd_font()
+    if not font:
+        print("Warning: no Nerd Font found (set NERDFONT_FONT), skipping preview sprites")
+        return None
+    return Path(font)
 
-    for prefix, cat_info in CATEGORIES.items():
-        if prefix not in categorized or not categorized[prefix]:
-            continue
+def load_descriptions():
+    """codepoint -> description text from the nerdfont-icons/*.sh corpus"""
+    entries, _stats = index.build_index(sorted(NERDFONT_ICONS_DIR.glob("nerd-*.sh")))
+    return {cp: "; ".join(descriptions) for cp, (_names, _sources, descriptions) in entries.items() if descriptions}
+
+def glyph_mapping(names, glyphs, memo=None, changed=None):
+    """name<TAB>glyph pairs for scripts that still look glyphs up by name"""
+    return per_name(memo, GLYPH_MAPPING_FILE, names, changed,
+                    lambda name: f"{name}\t{glyphs[name]}\n" if name in glyphs else "")
+
+LUA_KEYWORDS = {
+    "and", "break", "do", "else", "elseif", "end", "false", "for", "function", "goto", "if", "in", "local", "nil",
+    "not", "or", "repeat", "return", "then", "true", "until", "while",
+}
+
+@functools.lru_cache(maxsize=None)
+def lua_key(name):
+    """Table key for `name`: bare when it is a Lua identifier, ["quoted"] otherwise"""
+    if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name) and name not in LUA_KEYWORDS:
+        return name
+    return f"[{lua_string(name)}]"
+
+@functools.lru_cache(maxsize=None)
+def lua_string(text):
+    """Quoted Lua string literal"""
+    return '"' + "".join(
+        f"\\{ord(char):03d}" if char < " " or char in '"\\' else char for char in text
+    ) + '"'
+
+def render_lua_module(names, glyphs, memo=None, changed=None):
+    """Lua module for the WezTerm config: name -> glyph for every known icon
+
+    One `require` instead of a wezterm.nerdfonts lookup per icon; the
+    config loads it through modules/icons/icon_table.lua.
+    """
+    return "".join([
+        "-- Generated by generate-wezterm-data.py, do not edit\n",
+        '-- Load with require("modules.icons.icon_table")\n',
+        "return {\n",
+        per_name(memo, LUA_MODULE_FILE, names, changed,
+                 lambda name: lua_entry(name, glyph) if (glyph := glyphs.get(name)) else ""),
+        "}\n",
+    ])
+
+@functools.lru_cache(maxsize=None)
+def lua_entry(name, glyph):
+    return f"\t{lua_key(name)} = {lua_string(glyph)},\n"
+
+def render_lua_categories(categories):
+    """Lua module with the icon names of every category, in browser order
+
+    Kept out of the glyph module so a config reload only compiles the half
+    it uses; icon_table.lua requires it on first access.
+    """
+    lines = [
+        "-- Generated by generate-wezterm-data.py, do not edit",
+        '-- Load with require("modules.icons.icon_table").categories',
+        "return {",
+    ]
+    for category, members in categories:
+        lines.append(f"\t[{lua_string(category)}] = {{")
+        lines.extend(f"\t\t{lua_string(name)}," for name in members)
+        lines.append("\t},")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def render_tmux_vars(names, glyphs, memo=None, changed=None):
+    """Hidden tmux variables (`%hidden nf_<name>='<glyph>'`) for every icon
+
+    Files sourced after `source-file .../data/icons.tmux` can use "$nf_md_git"
+    (tmux expands variables when it parses a file).
+    Variables rather than @options: sourcing ten thousand `set -g` lines
+    takes seconds, these take milliseconds and never reach child processes.
+    """
+    return "# Generated by generate-wezterm-data.py, do not edit\n" + per_name(
+        memo, TMUX_VARS_FILE, names, changed,
+        lambda name: tmux_entry(name, glyph) if (glyph := glyphs.get(name)) else ""
+    )
+
+@functools.lru_cache(maxsize=None)
+def tmux_entry(name, glyph):
+    return f"%hidden nf_{re.sub(r'[^A-Za-z0-9_]', '_', name)}='{glyph}'\n"
+
+def memoized(memo, name, source, render_output):
+    """`render_output()`, or the content `name` had last time while its `source` is unchanged
+
+    --watch keeps `memo` between rebuilds, so outputs built from every
+    icon are only rendered again when what they are made of changes.
+    """
+    previous = memo.get(name) if memo is not None else None
+    if previous is not None and previous[0] == source:
+        return previous[1]
+    content = render_output()
+    if memo is not None:
+        memo[name] = (source, content)
+    return content
+
+def per_name(memo, key, names, changed, render_line):
+    """`"".join(render_line(name) for name in names)`, rendering only the lines of `changed` names again
+
+    --watch keeps `memo` between rebuilds: while `names` is the same list
+    as last time, every other line is reused from there, so re-glyphing one
+    icon costs a join rather than ten thousand lines.
+    """
+    previous = memo.get(key) if memo is not None else None
+    if previous is not None and changed is not None and previous[0] == names:
+        _names, lines, positions = previous
+        lines = list(lines)
+        for name in changed:
+            if (position := positions.get(name)) is not None:
+                lines[position] = render_line(name)
+    else:
+        lines = [render_line(name) for name in names]
+        positions = {name: position for position, name in enumerate(names)}
+    if memo is not None:
+        memo[key] = (names, lines, positions)
+    return "".join(lines)
+
+def render_listing(names, glyphs, ids, memo=None, changed=None, key=None):
+    """A listing fzf can stream straight off disk (no header, no lookups)
+
+    One row per icon: glyph<TAB>name<TAB>codepoint<TAB>id, with ? and an
+    empty codepoint when the glyph is unknown. The id (hidden by fzf) keys
+    the pre-rendered preview (see nfbrowser/previewpack.py). `key` names
+    the listing in `memo` (see `per_name`).
+    """
+    get = glyphs.get
+    return per_name(memo if key else None, key, names, changed,
+                    lambda name: listing_row(name, get(name), ids[name]))
+
+@functools.lru_cache(maxsize=None)
+def listing_row(name, glyph, icon_id):
+    # Rendered again on every --watch rebuild, but only a few rows ever change
+    if glyph:
+        return f"{glyph}\t{name}\t{ord(glyph[0]):x}\t{icon_id}\n"
+    return f"?\t{name}\t\t{icon_id}\n"
+
+def render_names(cat_info, icons):
+    """Plain name list per category (read by tabs/tab_rename.lua)"""
+    header = (
+        f"# {cat_info['name']} ({len(icons)} icons)\n"
+        f"# Generated from WezTerm nerdfonts\n"
+        f"# Format: icon_name (glyphs rendered by WezTerm picker)\n\n"
+    )
+    return header + "".join(f"{name}\n" for name in icons)
+
+def categorize(icon_names, rules, groups=None):
+    """{category name: [names]}, most specific category per name
+
+    New names are added to a copy of `groups`, so --watch classifies the
+    WezTerm name list once and only the personal icons on every rebuild.
+    """
+    classified, report = rules.classify_all(icon_names)
+    classifier.print_report(report, file=sys.stdout)
+
+    merged = {name: list(members) for name, members in (groups or {}).items()}
+    for name, members in classified.items():
+        merged.setdefault(name, []).extend(members)
+    return merged
+
+def listings(groups, rules):
+    """Members of every category listing: a parent also lists its sub-categories' icons"""
+    listed = {name: list(members) for name, members in groups.items()}
+    for name, members in groups.items():
+        for parent in rules.ancestors(name):
+            listed.setdefault(parent, []).extend(members)
+    return listed
+
+def catalog_rows(groups, glyphs, descriptions, only=None):
+    """(name, glyph, codepoint, category, description) for every icon, or just `only`"""
+    icons = []
+    for category, names in groups.items():
+        for name in names:
+            if only is not None and name not in only:
+                continue
+            glyph = glyphs.get(name)
+            codepoint = ord(glyph[0]) if glyph else None
+            icons.append((name, glyph or "?", codepoint, category, descriptions.get(codepoint, "")))
+    return icons
+
+def render_catalog(groups, glyphs, descriptions, categories_meta, changed=None, previous=None):
+    """SQLite/FTS5 catalog of every icon (see nfbrowser/catalog.py)
 
-        icons = sorted(categorized[prefix])
-        filename = f"wezterm-{cat_info['name'].lower().replace(' ', '-')}.txt"
-        filepath = OUTPUT_DIR / filename
+    With `changed` names and the `previous` catalog bytes, only those rows
+    are replaced instead of building the whole catalog again.
+    """
+    categories = [
+        (cat["name"], cat["description"], cat["color"], cat["listing"], cat["count"], cat.get("parent"))
+        for cat in categories_meta if not cat.get("dynamic")
+    ]
+    if changed is None:
+        return catalog.build(catalog_rows(groups, glyphs, descriptions), categories)
 
-        with open(filepath, 'w') as f:
-            f.write(f"# {cat_info['name']} ({len(icons)} icons)\n")
-            f.write(f"# Generated from WezTerm nerdfonts\n")
-            f.write(f"# Format: icon_name (glyphs rendered by WezTerm picker)\n\n")
+    icons = catalog_rows(groups, glyphs, descriptions, only=changed)
+    removed = changed - {row[0] for row in icons}
+    return catalog.update(previous, icons, removed, categories)
 
-            for name in icons:
-                # We'll just write the name, the WezTerm picker will render the actual glyph
-                f.write(f"{name}\n")
+def affected_categories(names, rules):
+    """Categories (and their parents) whose listings contain any of `names`"""
+    affected = set()
+    for name in names:
+        category = rules.classify(name)
+        if category is not None:
+            affected.add(category.name)
+            affected.update(rules.ancestors(category.name))
+    return affected
 
-        print(f"✓ Wrote {len(icons):4d} icons to {filename}")
-        total_written += len(icons)
+def render(icon_names, groups, glyphs, descriptions, rules, ids, changed=None, previous_catalog=None, memo=None):
+    """Render output files in memory as {file name: text or bytes}
+
+    `groups` is the `categorize` result for `icon_names` and `ids` the
+    stable id of every icon and category. By default every output is rendered. With a set of `changed` icon names
+    (added, removed or re-glyphed) only the listings of the categories they
+    fall in are rendered, together with the cross-category outputs, and the
+    catalog is patched from `previous_catalog`. Outputs with a line per icon
+    only re-render the lines of `changed` icons (see `per_name`), the Lua
+    categories and the id table come from `memo` (see `memoized`) when what
+    they contain is unchanged.
+    """
+    outputs = {}
+    listed = listings(groups, rules)
+    affected = None if changed is None else affected_categories(changed, rules)
+
+    categories_meta = []
+    for cat_info in rules.categories.values():
+        if not listed.get(cat_info.name):
+            continue
+
+        icons = sorted(set(listed[cat_info.name]))
+        slug = re.sub(r"[^a-z0-9]+", "-", cat_info.name.lower()).strip("-")
+        filename = f"wezterm-{slug}.txt"
+        listing = f"wezterm-{slug}.tsv"
+
+        if affected is None or cat_info.name in affected:
+            outputs[filename] = render_names(cat_info._asdict(), icons)
+            outputs[listing] = render_listing(icons, glyphs, ids)
 
         # Get first icon name as sample
         sample_name = icons[0] if icons else ""
 
-        categories_meta.append({
-            "name": cat_info["name"],
+        meta = {
+            "name": cat_info.name,
             "file": filename,
-            "description": f"{cat_info['description']} ({len(icons)} icons)",
-            "color": cat_info["color"],
+            "listing": listing,
+            "description": f"{cat_info.description} ({len(icons)} icons)",
+            "color": cat_info.color,
             "icon_name": sample_name,  # Store name instead of glyph
-            "count": len(icons)
-        })
+            "icon": glyphs.get(sample_name, "?"),
+            "count": len(icons),
+            "id": ids[previewpack.category_key(cat_info.name)]
+        }
+        if cat_info.parent:
+            meta["parent"] = cat_info.parent
+        categories_meta.append(meta)
+
+    # Sort categories by name, sub-categories right after their parent
+    categories_meta.sort(key=lambda x: (*reversed(rules.ancestors(x["name"])), x["name"]))
+
+    outputs[GLYPH_MAPPING_FILE] = glyph_mapping(sorted(set(icon_names)), glyphs, memo, changed)
+
+    # Single listing across every category, for browsing/searching everything at once
+    all_icons = sorted(name for icons in groups.values() for name in icons)
+    all_listing = "wezterm-all-icons.tsv"
+    outputs[all_listing] = render_listing(all_icons, glyphs, ids, memo, changed, all_listing)
+
+    categories_meta.insert(0, {
+        "name": ALL_ICONS["name"],
+        "file": all_listing,
+        "listing": all_listing,
+        "description": f"{ALL_ICONS['description']} ({len(all_icons)} icons)",
+        "color": ALL_ICONS["color"],
+        "icon_name": all_icons[0] if all_icons else "",
+        "icon": glyphs.get(all_icons[0], "?") if all_icons else "?",
+        "count": len(all_icons),
+        "id": ids[previewpack.category_key(ALL_ICONS["name"])]
+    })
+
+    # Not an output: the listing is rewritten on every copy, outside data/ (an absolute listing path)
+    categories_meta.insert(0, {
+        "name": FREQUENT["name"],
+        "file": frecency.LISTING_FILE.name,
+        "listing": str(frecency.LISTING_FILE),
+        "description": FREQUENT["description"],
+        "color": FREQUENT["color"],
+        "icon_name": FREQUENT["icon_name"],
+        "icon": glyphs.get(FREQUENT["icon_name"], "?"),
+        "count": 0,
+        "dynamic": True
+    })
+
+    outputs["categories.json"] = json.dumps({"categories": categories_meta}, indent=2)
+    outputs[LUA_MODULE_FILE] = render_lua_module(all_icons, glyphs, memo, changed)
+    category_members = [
+        (cat["name"], sorted(set(listed[cat["name"]]))) for cat in categories_meta if cat["name"] in listed
+    ]
+    outputs[LUA_CATEGORIES_FILE] = memoized(memo, LUA_CATEGORIES_FILE, category_members,
+                                            lambda: render_lua_categories(category_members))
+    outputs[TMUX_VARS_FILE] = render_tmux_vars(all_icons, glyphs, memo, changed)
+    outputs[previewpack.IDS_FILE] = memoized(memo, previewpack.IDS_FILE, ids, lambda: previewpack.render_ids(ids))
+    outputs[CATALOG_FILE] = render_catalog(groups, glyphs, descriptions, categories_meta, changed, previous_catalog)
+    return outputs
+
+def load_state(sprite_font=None):
+    """Everything `render` needs; --watch keeps this in memory between rebuilds"""
+    with open(DATA_FILE) as f:
+        names = [line.strip() for line in f if line.strip()]
+
+    try:
+        rules = classifier.load(CATEGORY_RULES_FILE)
+    except ValueError as e:
+        raise ValueError(f"{CATEGORY_RULES_FILE}: {e}") from e
+    glyphs = load_glyph_mapping()
+
+    # Add personal icons from custom_icons.lua, with the glyphs they resolve to
+    personal = load_personal_icons(glyphs)
+    print(f"Loaded {len(names) + len(personal)} icon names ({len(personal)} personal)")
+
+    return {
+        "names": names,
+        "rules": rules,
+        "glyphs": glyphs,
+        "personal": personal,
+        "descriptions": load_descriptions(),
+        "ids": previewpack.read_ids(OUTPUT_DIR / previewpack.IDS_FILE),
+        "sprite_font": sprite_font,
+    }
+
+def render_state(state, changed=None, previous_catalog=None):
+    """`render` the icons in `state`, encode the outputs and pack their previews"""
+    personal, rules = state["personal"], state["rules"]
+    if "groups" not in state:
+        state["groups"] = categorize(state["names"], rules)
+
+    icon_names = state["names"] + list(personal)
+    groups = categorize(list(personal), rules, state["groups"])
+    glyphs = {**state["glyphs"], **{name: glyph for name, glyph in personal.items() if glyph}}
+    keys = [*sorted(icon_names), *map(previewpack.category_key, [ALL_ICONS["name"], *rules.categories])]
+    state["ids"] = previewpack.assign_ids(state["ids"], keys)
+    outputs = {
+        name: content.encode("utf-8") if isinstance(content, str) else content
+        for name, content in render(icon_names, groups, glyphs, state["descriptions"], rules, state["ids"],
+                                    changed, previous_catalog, state.setdefault("rendered", {})).items()
+    }
+    abbreviations = SCRIPT_DIR / ABBREVIATIONS_FILE
+    if abbreviations.exists():
+        outputs[ABBREVIATIONS_FILE] = abbreviations.read_bytes()
+
+    # Listings a partial rebuild left alone are read from the current generation
+    data = preview.PreviewData(OUTPUT_DIR, files=outputs)
+    rows = outputs["wezterm-all-icons.tsv"].decode("utf-8").splitlines()
+    blob, index = previewpack.pack(data, rows, state["ids"], state.setdefault("previews", {}))
+    outputs[previewpack.BLOB_FILE], outputs[previewpack.INDEX_FILE] = blob, index
+
+    # Tells the previewer which sprite directory belongs to this generation
+    if state["sprite_font"]:
+        outputs[sprites.FONT_FILE] = f"{sprites.font_digest(state['sprite_font'])}\n".encode()
+    return outputs
 
-    # Sort categories by name
-    categories_meta.sort(key=lambda x: x["name"])
+def render_sprites(state, names=None):
+    """Rasterise the missing preview sprites (of `names`, default all icons) and trim the cache"""
+    if not state["sprite_font"]:
+        return
+    start = time.perf_counter()
+    glyphs = {**state["glyphs"], **{name: glyph for name, glyph in state["personal"].items() if glyph}}
+    names = [*state["names"], *state["personal"]] if names is None else names
+    codepoints = {ord(glyph[0]) for name in names if (glyph := glyphs.get(name))}
+
+    digest, rendered, cached, skipped = sprites.render(state["sprite_font"], codepoints)
+    removed, _freed = sprites.evict(digest) if rendered else (0, 0)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✓ Sprites from {state['sprite_font'].name}: {rendered} rendered, {cached} cached, "
+          f"{removed} evicted, {skipped} over budget ({elapsed:.0f}ms)")
+
+def rebuild_personal(state):
+    """Re-read custom_icons.lua into `state`; returns the icon names that changed"""
+    old = state["personal"]
+    new = load_personal_icons(state["glyphs"])
+    state["personal"] = new
+    missing = object()
+    return {name for name in old.keys() | new.keys() if old.get(name, missing) != new.get(name, missing)}
+
+def watch(inputs, state=None, sprite_font=None):
+    """Rebuild whenever an input changes (inotify), until interrupted"""
+    paths = [Path(path) for path in inputs if path != "-"]
+    code = {Path(__file__).resolve(), *(SCRIPT_DIR / "nfbrowser").glob("*.py")}
+    state = state or load_state(sprite_font)
+
+    with Watcher(paths) as watcher:
+        for directory in watcher.missing:
+            print(f"Warning: cannot watch {directory}")
+        print(f"👀 Watching {len(paths)} inputs (Ctrl-C to stop)")
+
+        for changed_paths, debounce in watcher.changes():
+            start = time.perf_counter()
+            stamp = time.strftime("%H:%M:%S")
+            if changed_paths & code:
+                print(f"[{stamp}] Generator code changed, restart --watch to pick it up")
+                changed_paths -= code
+                if not changed_paths:
+                    continue
+
+            labels = ", ".join(sorted(path.name for path in changed_paths))
+            digests = datadir.input_digests(p for p in changed_paths if p != Watcher.ALL)
+            if Watcher.ALL not in changed_paths and all(inputs.get(path) == d for path, d in digests.items()):
+                continue  # Touched, not changed (chmod, a save without edits)
+            inputs.update(digests)
+            previous_catalog = OUTPUT_DIR / CATALOG_FILE
+
+            try:
+                if changed_paths == {CUSTOM_ICONS_FILE} and previous_catalog.exists():
+                    kind = "personal"
+                    changed = rebuild_personal(state)
+                    outputs = render_state(state, changed, previous_catalog.read_bytes()) if changed else {}
+                    written, reused = datadir.publish(OUTPUT_DIR, outputs, inputs, replace=False)
+                    render_sprites(state, changed)
+                else:
+                    kind = "full"
+                    if Watcher.ALL in changed_paths:
+                        inputs = datadir.input_digests(input_files(state["sprite_font"]))
+                    state = load_state(state["sprite_font"])
+                    written, reused = datadir.publish(OUTPUT_DIR, render_state(state), inputs)
+                    render_sprites(state)
+            except (OSError, ValueError) as e:
+                print(f"[{stamp}] {labels}: rebuild failed: {e}")
+                continue
+
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"[{stamp}] {labels}: {kind} rebuild, {len(written)} written / {len(reused)} unchanged "
+                  f"in {elapsed:.0f}ms (+{debounce * 1000:.0f}ms debounce)")
+
+def build(inputs, start, sprite_font=None):
+    """Full regeneration into a new data/ generation; returns the state or None"""
+    try:
+        state = load_state(sprite_font)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return None
+
+    outputs = render_state(state)
+    written, reused = datadir.publish(OUTPUT_DIR, outputs, inputs)
+
+    for name in written:
+        print(f"✓ Wrote {name}")
+    if reused:
+        print(f"· Unchanged, kept {len(reused)} files: {', '.join(reused)}")
+
+    elapsed = (time.perf_counter() - start) * 1000
+    icon_count = len(state["names"]) + len(state["personal"])
+    category_count = sum(1 for name in outputs if name.endswith(".txt") and name.startswith("wezterm-"))
+    print(f"\n✓ {icon_count} icons across {category_count} categories, "
+          f"{len(written)} written / {len(reused)} unchanged ({elapsed:.0f}ms)")
+    print(f"ℹ️  Data files published to: {OUTPUT_DIR} -> {OUTPUT_DIR.resolve()}")
+
+    render_sprites(state)
+    return state
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="Rebuild even if inputs are unchanged")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild the affected outputs whenever an input changes")
+    parser.add_argument("--sprites", action="store_true",
+                        help="Rasterise large-glyph preview sprites from a local Nerd Font (needs Pillow)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    # Read icon names
+    if not DATA_FILE.exists():
+        print(f"Error: {DATA_FILE} not found")
+        print("Run: python3 ~/.core/cfg/wezterm/scripts/fetch-nerdfonts.py first")
+        return 1
 
-    # Write categories.json
-    json_file = OUTPUT_DIR / "categories.json"
-    with open(json_file, 'w') as f:
-        json.dump({"categories": categories_meta}, f, indent=2)
+    state = None
+    sprite_font = find_sprite_font() if args.sprites else None
+    inputs = datadir.input_digests(input_files(sprite_font))
+    if not args.force and datadir.is_current(OUTPUT_DIR, inputs):
+        skipped = len(datadir.read_manifest(OUTPUT_DIR).get("outputs", {}))
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✓ Up to date: inputs unchanged, skipped {skipped} files ({elapsed:.1f}ms)")
+    else:
+        state = build(inputs, start, sprite_font)
+        if state is None:
+            return 1
 
-    print(f"\n✓ Total: {total_written} icons across {len(categories_meta)} categories")
-    print(f"✓ Wrote {json_file}")
-    print(f"\nℹ️  Data files created in: {OUTPUT_DIR}")
+    if args.watch:
+        try:
+            watch(inputs, state, sprite_font)
+        except KeyboardInterrupt:
+            print()
+    return 0
 
 if __name__ == "__main__":
     exit(main() or 0)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Report which nerd font icons the dotfiles tree uses, and where
+
+Scans every text file under the tree (in parallel, cached per file mtime)
+for Private Use Area glyphs, escaped PUA codepoints and nerdfonts.<name>
+references, and names them through data/codepoint-index.bin:
+
+    icon-audit.py                    usage report for ~/.core/cfg
+    icon-audit.py --missing          only icons the current name list lacks (tofu)
+    icon-audit.py --json > usage.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from nfbrowser import SCRIPT_DIR, audit
+from nfbrowser.index import CodepointIndex
+
+ROOT = SCRIPT_DIR.parents[3]
+INDEX = SCRIPT_DIR / "data" / "codepoint-index.bin"
+NAMES_FILE = Path.home() / ".core/cfg/wezterm/.data/wezterm_nerdfont_names.txt"
+CACHE = SCRIPT_DIR / ".data" / "audit-cache.json"
+
+
+def load_names(path):
+    """WezTerm's current icon names, or None to fall back to the index"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return None
+
+
+def print_report(report, show_all_uses):
+    for key, icon in sorted(report.items(), key=lambda item: (-len(item[1]["uses"]), item[0])):
+        glyph = chr(icon["codepoint"]) if icon["codepoint"] else "?"
+        codepoint = f"U+{icon['codepoint']:04X}" if icon["codepoint"] else "-"
+        names = ", ".join(icon["names"]) or "(no name)"
+        flag = "  ✗ missing" if icon["missing"] else ""
+        print(f"{glyph}  {codepoint:<8} {names}  ({len(icon['uses'])} uses){flag}")
+
+        uses = icon["uses"] if show_all_uses else icon["uses"][:5]
+        for path, line in uses:
+            print(f"      {path}:{line}")
+        if len(uses) < len(icon["uses"]):
+            print(f"      … {len(icon['uses']) - len(uses)} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", nargs="?", default=str(ROOT), help="Tree to scan")
+    parser.add_argument("--index", default=str(INDEX), help="Codepoint index (from create-name-mapping.py)")
+    parser.add_argument("--names", default=str(NAMES_FILE), help="Current icon name list")
+    parser.add_argument("--cache", default=str(CACHE), help="Per-file result cache ('' to disable)")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--exclude", action="append", default=[], help="Extra glob (relative to root) to skip")
+    parser.add_argument("--missing", action="store_true", help="Only report icons missing from the name list")
+    parser.add_argument("--all", action="store_true", help="List every use instead of the first five")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        index = CodepointIndex(args.index)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot open {args.index}: {e}", file=sys.stderr)
+        print(f"Run: python3 {SCRIPT_DIR}/create-name-mapping.py", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    results, stats = audit.scan_tree(
+        args.root,
+        cache_path=args.cache or None,
+        jobs=args.jobs,
+        excludes=audit.DEFAULT_EXCLUDES + args.exclude,
+    )
+    with index:
+        report = audit.usage(results, index, load_names(args.names))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.missing:
+        report = {key: icon for key, icon in report.items() if icon["missing"]}
+
+    if args.json:
+        for icon in report.values():
+            icon["uses"] = [f"{path}:{line}" for path, line in icon["uses"]]
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_report(report, args.all)
+
+    missing = sum(1 for icon in report.values() if icon["missing"])
+    print(f"\n{len(report)} icons ({missing} missing) in {sum(1 for hits in results.values() if hits)} files; "
+          f"scanned {stats['scanned']}, cached {stats['cached']}, skipped {stats['skipped']} binary "
+          f"of {stats['files']} files ({elapsed:.0f}ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
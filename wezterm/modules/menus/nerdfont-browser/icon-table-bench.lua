@@ -0,0 +1,135 @@
+-- Benchmark the icon work a config reload does: wezterm.nerdfonts vs the generated icon table
+-- Run with: wezterm --config-file icon-table-bench.lua ls-fonts --text x >/dev/null
+--
+-- "nerdfonts" is what tab_rename.lua did on every reload: read the category
+-- name lists from data/wezterm-*.txt, look every name up in wezterm.nerdfonts
+-- and build its picker entry. "icon_table" is a fresh
+-- require("modules.icons.icon_table") plus one lookup (data/icons.lua, see
+-- generate-wezterm-data.py), which is all a reload does now; "icon_table +
+-- picker" also builds the same picker entries from the category index, which
+-- happens once the icon picker is first opened.
+-- Set NERDFONT_BENCH_RUNS to change the number of runs (default 20).
+
+local wezterm = require("wezterm")
+
+local config_root = wezterm.home_dir .. "/.core/cfg/wezterm"
+local data_dir = config_root .. "/modules/menus/nerdfont-browser/data"
+package.path = config_root .. "/?.lua;" .. config_root .. "/?/init.lua;" .. package.path
+
+local runs = tonumber(os.getenv("NERDFONT_BENCH_RUNS")) or 20
+
+-- The categories tab_rename.lua offers, by listing slug and category name
+local categories = {
+	{ "material-design", "Material Design" },
+	{ "codicons", "Codicons" },
+	{ "devicons", "Devicons" },
+	{ "font-awesome", "Font Awesome" },
+	{ "fa-extension", "FA Extension" },
+	{ "octicons", "Octicons" },
+	{ "seti-ui", "Seti UI" },
+	{ "powerline", "Powerline" },
+	{ "powerline-extra", "Powerline Extra" },
+	{ "pomicons", "Pomicons" },
+	{ "weather", "Weather" },
+	{ "linux-logos", "Linux Logos" },
+	{ "custom", "Custom" },
+}
+
+local function nerdfonts_lookup(name)
+	local found, glyph = pcall(function()
+		return wezterm.nerdfonts[name]
+	end)
+	return found and glyph or nil
+end
+
+local function fresh_icon_table()
+	package.loaded["modules.icons.icon_table"] = nil
+	package.loaded["modules.menus.nerdfont-browser.data.icons"] = nil
+	package.loaded["modules.menus.nerdfont-browser.data.icon_categories"] = nil
+	return require("modules.icons.icon_table")
+end
+
+-- A tab_rename.lua picker entry
+local function picker_entry(name, glyph)
+	local desc = name:gsub("^%l+_", ""):gsub("_", " ")
+	desc = desc:gsub("(%a)(%w*)", function(first, rest)
+		return first:upper() .. rest
+	end)
+	return { name = name, icon = glyph, desc = desc }
+end
+
+local methods = {
+	{
+		"nerdfonts",
+		function()
+			local entries = {}
+			for _, category in ipairs(categories) do
+				local file = assert(io.open(data_dir .. "/wezterm-" .. category[1] .. ".txt", "r"))
+				for line in file:lines() do
+					if not line:match("^#") and line:match("%S") then
+						local name = line:match("^%s*(.-)%s*$")
+						local glyph = nerdfonts_lookup(name)
+						if glyph then
+							table.insert(entries, picker_entry(name, glyph))
+						end
+					end
+				end
+				file:close()
+			end
+			return #entries
+		end,
+	},
+	{
+		"icon_table",
+		function()
+			local icons = fresh_icon_table()
+			return icons.glyphs.md_git and 1 or 0
+		end,
+	},
+	{
+		"icon_table + picker",
+		function()
+			local icons = fresh_icon_table()
+			local entries = {}
+			for _, category in ipairs(categories) do
+				for _, name in ipairs(icons.categories[category[2]] or {}) do
+					local glyph = icons.glyphs[name]
+					if glyph then
+						table.insert(entries, picker_entry(name, glyph))
+					end
+				end
+			end
+			return #entries
+		end,
+	},
+}
+
+local function percentile(samples, fraction)
+	local sorted = { table.unpack(samples) }
+	table.sort(sorted)
+	return sorted[math.min(math.floor(#sorted * fraction) + 1, #sorted)]
+end
+
+io.stderr:write(string.format("%-20s %9s %9s %9s %9s\n", "method", "p50", "max", "mean", "icons"))
+for _, method in ipairs(methods) do
+	local name, run = method[1], method[2]
+	local samples, total, resolved = {}, 0, 0
+	for i = 1, runs do
+		local start = os.clock()
+		resolved = run()
+		samples[i] = (os.clock() - start) * 1000
+		total = total + samples[i]
+	end
+	io.stderr:write(
+		string.format(
+			"%-20s %7.2fms %7.2fms %7.2fms %9d\n",
+			name,
+			percentile(samples, 0.5),
+			percentile(samples, 1),
+			total / runs,
+			resolved
+		)
+	)
+end
+
+return {}
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Benchmark the nerdfont browser pipeline and track regressions (see nfbrowser/bench.py)
+
+Times every stage on synthetic name lists and on the real WezTerm data, in
+a scratch directory (data/ is never touched). Runs headless: nothing needs
+WezTerm, and fzf is replaced by a stand-in when it is not installed.
+
+    generate   generate-wezterm-data.py's render() for the whole dataset
+    listing    one category listing fed to fzf --filter (grep -F when fzf
+               is not installed), per listing
+    lookup     catalog lookup of one icon name
+    search     FTS5 query over the catalog
+    preview    preview.render() of one listing row
+    packed     previewpack.read() of the same rows after packing them
+
+    nerdfont-bench.py run                       10k, 100k, 1m and real, saved to history
+    nerdfont-bench.py run --sizes 10k,1m --no-real --compare
+    nerdfont-bench.py compare [--baseline -2] [--threshold 10]
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from nfbrowser import SCRIPT_DIR, bench, catalog, classifier, preview, previewpack
+
+FILTER_QUERY = "arrow"
+
+
+def load_generator():
+    """generate-wezterm-data.py as a module (its file name is not importable)"""
+    spec = importlib.util.spec_from_file_location("generate_wezterm_data", SCRIPT_DIR / "generate-wezterm-data.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def real_dataset(generator):
+    """The WezTerm name list plus personal icons, as the generator loads them; None if missing"""
+    if not generator.DATA_FILE.exists():
+        print(f"Warning: {generator.DATA_FILE} not found, skipping the real dataset", file=sys.stderr)
+        return None
+    with redirect_stdout(io.StringIO()):
+        state = generator.load_state()
+    personal = state["personal"]
+    glyphs = {**state["glyphs"], **{name: glyph for name, glyph in personal.items() if glyph}}
+    return bench.Dataset("real", state["names"] + list(personal), glyphs, state["descriptions"])
+
+
+def filter_command():
+    """fzf's non-interactive filter mode, or the grep stand-in when fzf is not installed"""
+    if shutil.which("fzf"):
+        return ["fzf", "--filter"], "fzf"
+    return ["grep", "-F", "--"], "grep -F (fzf stand-in)"
+
+
+def generate(generator, rules, dataset):
+    """(outputs, ids) of a full generator run over `dataset`"""
+    with redirect_stdout(io.StringIO()):  # Classifier report
+        groups = generator.categorize(dataset.icon_names, rules)
+    keys = [
+        *sorted(dataset.icon_names),
+        *map(previewpack.category_key, [generator.ALL_ICONS["name"], *rules.categories]),
+    ]
+    ids = previewpack.assign_ids({}, keys)
+    outputs = generator.render(dataset.icon_names, groups, dataset.glyphs, dataset.descriptions, rules, ids)
+    return outputs, ids
+
+
+def run_dataset(generator, rules, dataset, work_dir, samples, command, repeat=1):
+    """{stage: stats} for one dataset"""
+    results = {}
+    latencies = []
+    for _ in range(repeat):
+        (outputs, ids), elapsed = bench.timed(generate, generator, rules, dataset)
+        latencies.append(elapsed)
+    results["generate"] = bench.summarise(latencies)
+
+    for name, content in outputs.items():
+        (work_dir / name).write_bytes(content.encode("utf-8") if isinstance(content, str) else content)
+    categories = json.loads(outputs["categories.json"])["categories"]
+
+    latencies = []
+    for cat in categories:
+        if cat.get("dynamic"):
+            continue
+        # Matches are read back like fzf's output (grep stops at the first match into /dev/null)
+        with open(work_dir / cat["listing"], "rb") as listing:
+            _result, elapsed = bench.timed(
+                subprocess.run, [*command, FILTER_QUERY], stdin=listing, stdout=subprocess.PIPE
+            )
+        latencies.append(elapsed)
+    results["listing"] = bench.summarise(latencies)
+
+    conn = catalog.connect(work_dir / generator.CATALOG_FILE)
+    names = bench.sample(dataset.icon_names, samples)
+    results["lookup"] = bench.summarise([bench.timed(catalog.lookup, conn, name)[1] for name in names])
+    queries = [bench.QUERIES[i % len(bench.QUERIES)] for i in range(max(samples // 4, len(bench.QUERIES)))]
+    results["search"] = bench.summarise([bench.timed(catalog.search, conn, query)[1] for query in queries])
+    conn.close()
+
+    data = preview.PreviewData(work_dir)
+    with open(work_dir / "wezterm-all-icons.tsv", encoding="utf-8") as f:
+        rows = bench.sample((line.rstrip("\n") for line in f), samples)
+    results["preview"] = bench.summarise([bench.timed(preview.render, data, "icon", row)[1] for row in rows])
+
+    blob, index = previewpack.pack(data, rows, ids)
+    (work_dir / previewpack.BLOB_FILE).write_bytes(blob)
+    (work_dir / previewpack.INDEX_FILE).write_bytes(index)
+    entry_ids = [int(row.split("\t")[3]) for row in rows]
+    results["packed"] = bench.summarise([bench.timed(previewpack.read, work_dir, i)[1] for i in entry_ids])
+    return results
+
+
+def print_results(results, file=sys.stdout):
+    print(f"{'dataset':<20} {'stage':<10} {'n':>6} {'p50':>10} {'p99':>10} {'max':>10}", file=file)
+    for dataset, stages in results.items():
+        for stage, stats in stages.items():
+            print(f"{dataset:<20} {stage:<10} {stats['count']:>6} {stats['p50_ms']:>8.2f}ms "
+                  f"{stats['p99_ms']:>8.2f}ms {stats['max_ms']:>8.2f}ms", file=file)
+
+
+def pick(runs, position):
+    try:
+        return runs[position]
+    except IndexError:
+        return None
+
+
+def compare_runs(runs, baseline, current, threshold):
+    old, new = pick(runs, baseline), pick(runs, current)
+    if old is None or new is None:
+        print(f"Error: need runs {baseline} and {current} in {bench.HISTORY_FILE} ({len(runs)} recorded)",
+              file=sys.stderr)
+        print(f"Run: python3 {SCRIPT_DIR}/nerdfont-bench.py run", file=sys.stderr)
+        return 1
+    rows = bench.compare(old, new, threshold)
+    bench.print_comparison(old, new, rows)
+    regressions = [row for row in rows if row[-1] == "regression"]
+    print(f"\n{len(regressions)} regression(s) over {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Benchmark every stage and record the results")
+    run.add_argument("--sizes", default=",".join(bench.SIZES),
+                     help=f"Synthetic dataset sizes, comma separated ({', '.join(bench.SIZES)} or a number)")
+    run.add_argument("--no-real", action="store_true", help="Skip the real WezTerm data")
+    run.add_argument("--samples", type=int, default=200, help="Lookups, previews and searches per dataset")
+    run.add_argument("--repeat", type=int, default=1, help="Generator runs per dataset (p50 is compared)")
+    run.add_argument("--no-save", action="store_true", help="Do not append the run to the history")
+    run.add_argument("--compare", action="store_true", help="Compare with the previous run afterwards")
+    run.add_argument("--threshold", type=float, default=10, help="Regression threshold in percent")
+    run.add_argument("--json", action="store_true", help="Print the run as JSON")
+    compare = commands.add_parser("compare", help="Compare two recorded runs")
+    compare.add_argument("--baseline", type=int, default=-2, help="History index of the baseline run")
+    compare.add_argument("--current", type=int, default=-1, help="History index of the run to check")
+    compare.add_argument("--threshold", type=float, default=10, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return compare_runs(bench.read_history(), args.baseline, args.current, args.threshold / 100)
+
+    try:
+        sizes = [bench.SIZES.get(size) or int(size) for size in args.sizes.split(",") if size]
+    except ValueError:
+        print(f"Error: invalid --sizes {args.sizes!r}", file=sys.stderr)
+        return 1
+
+    generator = load_generator()
+    rules = classifier.load(generator.CATEGORY_RULES_FILE)
+    datasets = [lambda size=size: bench.synthetic(rules, size) for size in sizes]
+    if not args.no_real:
+        datasets.append(lambda: real_dataset(generator))
+    command, tool = filter_command()
+
+    results = {}
+    for make in datasets:
+        dataset = make()
+        if dataset is None:
+            continue
+        print(f"… {dataset.name}: {len(dataset.icon_names)} icons", file=sys.stderr)
+        with tempfile.TemporaryDirectory(prefix="nerdfont-bench-") as work_dir:
+            results[dataset.name] = run_dataset(generator, rules, dataset, Path(work_dir), args.samples, command,
+                                               args.repeat)
+
+    run = bench.new_run({"filter": tool}, results)
+    if args.json:
+        print(json.dumps(run, indent=2))
+    else:
+        print_results(results)
+    if args.no_save:
+        return 0
+
+    position = bench.append_history(run)
+    print(f"\nSaved as run {position} in {bench.HISTORY_FILE}", file=sys.stderr)
+    if args.compare and position > 0:
+        print()
+        return compare_runs(bench.read_history(), -2, -1, args.threshold / 100)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
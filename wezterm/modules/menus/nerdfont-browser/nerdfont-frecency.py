@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Record copied icons and show the ones used most (see nfbrowser/frecency.py)
+
+    nerdfont-frecency.py record "<glyph>\t<name>\t<codepoint>"   called by copy-icon.sh
+    nerdfont-frecency.py top [-n 20]                             ranked icons with scores
+    nerdfont-frecency.py compact                                 fold the log into the snapshot
+"""
+
+import argparse
+import sys
+
+from nfbrowser import frecency
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Record one copy of a listing line")
+    record.add_argument("line", help="Listing line (glyph<TAB>icon_name<TAB>codepoint)")
+    top = commands.add_parser("top", help="Print the highest ranked icons")
+    top.add_argument("-n", type=int, default=frecency.LISTING_SIZE, help="Number of icons")
+    commands.add_parser("compact", help="Rewrite the snapshot and truncate the log")
+    args = parser.parse_args(argv)
+
+    store = frecency.Store()
+    if args.command == "record":
+        fields = args.line.rstrip("\n").split("\t")
+        if len(fields) < 2 or not fields[1] or fields[0] in ("", "?"):
+            print(f"Error: not a listing line: {args.line!r}", file=sys.stderr)
+            return 1
+        store.record(fields[0], fields[1], fields[2] if len(fields) > 2 else "")
+    elif args.command == "top":
+        for score, count, glyph, name, _codepoint in store.top(args.n):
+            print(f"{glyph}  {name:<40} {score:7.2f}  ({count} copies)")
+    else:
+        store.compact()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Full-text search over the nerdfont catalog (data/catalog.sqlite)
+
+Prints matches as listing rows (glyph<TAB>name<TAB>codepoint), best first,
+so the output can be fed to fzf exactly like a category listing:
+
+    nerdfont-search.py "git branch"
+    nerdfont-search.py --category "Material Design" battery
+"""
+
+import argparse
+import sys
+import time
+
+from nfbrowser import SCRIPT_DIR, catalog
+
+CATALOG = SCRIPT_DIR / "data" / "catalog.sqlite"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="*", help="Words to search for (prefix match, all must match)")
+    parser.add_argument("--category", help="Only search this category")
+    parser.add_argument("--limit", type=int, default=500, help="Maximum number of results")
+    parser.add_argument("--catalog", default=str(CATALOG), help="Catalog database to query")
+    parser.add_argument("--time", action="store_true", help="Report query time on stderr")
+    args = parser.parse_args(argv)
+
+    text = " ".join(args.query)
+    if not text.strip():
+        return 0
+
+    try:
+        conn = catalog.connect(args.catalog)
+    except Exception as e:
+        print(f"Error: cannot open {args.catalog}: {e}", file=sys.stderr)
+        print(f"Run: python3 {SCRIPT_DIR}/generate-wezterm-data.py", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    rows = catalog.search(conn, text, limit=args.limit, category=args.category)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    sys.stdout.writelines(f"{glyph}\t{name}\t{codepoint}\n" for glyph, name, codepoint in rows)
+    if args.time:
+        print(f"{len(rows)} results in {elapsed:.2f}ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
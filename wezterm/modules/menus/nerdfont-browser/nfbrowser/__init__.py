@@ -0,0 +1,5 @@
+"""Shared helpers for the nerdfont browser generators and previewers"""
+
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
@@ -0,0 +1,208 @@
+"""Nerd font icon usage across a source tree
+
+`scan_file()` streams one file and records every Private Use Area glyph,
+every escaped PUA codepoint (``\\uf013``, ``\\u{F0065}``, ``\\U000F0065``) and
+every ``nerdfonts.<name>`` / ``nerdfonts["<name>"]`` reference with its line
+number. Lines are pre-filtered on bytes, so only candidate lines are decoded.
+
+`scan_tree()` fans files out to a process pool and keeps the per-file hits
+in a JSON cache keyed on the scanner version, mtime and size, so a re-scan
+only reads files that changed. `usage()` folds the hits into icon ->
+[(file, line)] using the codepoint index for names and flags icons the
+current name list no longer has, whether used by name or by glyph.
+"""
+
+import fnmatch
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import datadir
+
+CACHE_VERSION = 2
+# Cached hits are only valid for the scanner that produced them
+SCANNER = f"{CACHE_VERSION}-{datadir.file_digest(__file__)[:12]}"
+SNIFF_BYTES = 8192
+MAX_FILE_SIZE = 8 * 1024 * 1024
+
+# Lead bytes of U+E000-U+F8FF (EE, EF) and U+F0000-U+10FFFF (F3, F4), escapes and references
+CANDIDATE = re.compile(rb"[\xee\xef\xf3\xf4]|\\[uU]|nerdfonts")
+PUA_CHAR = re.compile("[\ue000-\uf8ff\U000f0000-\U0010fffd]")
+PUA_ESCAPE = re.compile(r"\\(?:u\{([0-9A-Fa-f]{4,6})\}|u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8}))")
+NAME_REF = re.compile(r"""nerdfonts(?:\.([A-Za-z0-9_]+)|\[\s*["']([A-Za-z0-9_-]+)["']\s*\])""")
+
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".data", ".cache", ".venv"}
+
+# Icon tables and generated data would report every glyph in the font
+DEFAULT_EXCLUDES = [
+    "wezterm/modules/menus/nerdfont-browser/data/*",
+    "wezterm/modules/menus/nerdfont-browser/nerdfont-icons/*",
+    "wezterm/modules/menus/nerdfont-browser/glyphnames.json",
+    "wezterm/modules/menus/nerdfont-browser/categories.json",
+    "wezterm/modules/menus/nerdfont-browser/nfbrowser/*",
+    "wezterm/modules/icons/nerdfonts.json",
+    "wezterm/modules/icons/mdi_icons.lua",
+    "tmux/modules/fzf/nerdfont-browser/data/*",
+    "tmux/modules/fzf/nerdfont-browser/nerdfont-icons/*",
+]
+
+
+def is_pua(codepoint):
+    return 0xE000 <= codepoint <= 0xF8FF or 0xF0000 <= codepoint <= 0x10FFFD
+
+
+def scan_line(text):
+    """[(kind, value)] in one decoded line; kind is "cp" (int) or "name" (str)"""
+    hits = [("cp", ord(char)) for char in PUA_CHAR.findall(text)]
+    for match in PUA_ESCAPE.finditer(text):
+        codepoint = int(next(group for group in match.groups() if group), 16)
+        if is_pua(codepoint):
+            hits.append(("cp", codepoint))
+    for match in NAME_REF.finditer(text):
+        hits.append(("name", (match.group(1) or match.group(2)).replace("-", "_")))
+    return hits
+
+
+def scan_file(path):
+    """[(line, kind, value)] for one file; None for binary or oversized files"""
+    hits = []
+    try:
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+            if b"\0" in head or os.fstat(f.fileno()).st_size > MAX_FILE_SIZE:
+                return None
+            f.seek(0)
+            for lineno, raw in enumerate(f, 1):
+                if CANDIDATE.search(raw):
+                    hits.extend((lineno, kind, value) for kind, value in scan_line(raw.decode("utf-8", "replace")))
+    except OSError:
+        return None
+    return hits
+
+
+def _scan_batch(paths):
+    return [(path, scan_file(path)) for path in paths]
+
+
+def iter_files(root, excludes=()):
+    """Relative paths of every regular file under `root`, minus `excludes` globs"""
+    root = str(root)
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root)
+            if any(fnmatch.fnmatch(relative, pattern) for pattern in excludes):
+                continue
+            if os.path.isfile(path) and not os.path.islink(path):
+                yield relative
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache["files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def scan_tree(root, cache_path=None, jobs=None, excludes=DEFAULT_EXCLUDES, batch=64):
+    """({relative path: [(line, kind, value)]}, stats) for every text file under `root`
+
+    stats is {"files", "cached", "scanned", "skipped"}.
+    """
+    root = Path(root)
+    cache = _load_cache(cache_path) if cache_path else {}
+    fresh = {}
+    results = {}
+    pending = []
+    stats = {"files": 0, "cached": 0, "scanned": 0, "skipped": 0}
+
+    for relative in iter_files(root, excludes):
+        try:
+            stat = os.stat(root / relative)
+        except OSError:
+            continue
+        key = [SCANNER, stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(relative)
+        if entry and entry[0] == key:
+            fresh[relative] = entry
+            if entry[1] is not None:
+                results[relative] = [tuple(hit) for hit in entry[1]]
+            stats["cached"] += 1
+        else:
+            pending.append((relative, key))
+    stats["files"] = stats["cached"] + len(pending)
+
+    if pending:
+        paths = [str(root / relative) for relative, _key in pending]
+        batches = [paths[i:i + batch] for i in range(0, len(paths), batch)]
+        if jobs == 1 or len(batches) == 1:
+            scanned = [_scan_batch(paths) for paths in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                scanned = list(pool.map(_scan_batch, batches))
+
+        by_path = {path: hits for done in scanned for path, hits in done}
+        for (relative, key), path in zip(pending, paths):
+            hits = by_path[path]
+            fresh[relative] = [key, hits]
+            if hits is not None:
+                results[relative] = hits
+        stats["scanned"] = len(pending)
+
+    if cache_path and (pending or len(fresh) != len(cache)):
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        payload = {"version": CACHE_VERSION, "root": str(root), "files": fresh}
+        datadir.write_atomic(cache_path, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    stats["skipped"] = sum(1 for entry in fresh.values() if entry[1] is None)
+    return results, stats
+
+
+def usage(results, index, known_names=None):
+    """{icon key: {"codepoint", "names", "missing", "uses": [(file, line)]}}
+
+    Codepoint hits are keyed "U+XXXX" and named via `index` (a
+    CodepointIndex); name references are keyed by name. An icon is missing
+    when none of its names is in `known_names` (default: the index), so a
+    glyph the index still names but the current list dropped is flagged too.
+    `nerdfonts.<word>` is only an icon reference when the word is a name, or
+    has the prefix of a known one ("md_", "cod_"...); "nerdfonts.json" is not.
+    """
+    if known_names is None:
+        known_names = set(index.names()) if index else set()
+    prefixes = {name.split("_", 1)[0] for name in known_names if "_" in name}
+
+    report = {}
+    for path in sorted(results):
+        for line, kind, value in results[path]:
+            if kind == "cp":
+                key = f"U+{value:04X}"
+                if key not in report:
+                    entry = index.lookup(value) if index else None
+                    cp_names = entry.names if entry else []
+                    missing = not any(name in known_names for name in cp_names)
+                    report[key] = {"codepoint": value, "names": cp_names, "missing": missing, "uses": []}
+            else:
+                key = value
+                if key not in report:
+                    entry = index.lookup(value) if index else None
+                    known = value in known_names
+                    if entry is None and not known and value.split("_", 1)[0] not in prefixes:
+                        continue
+                    report[key] = {
+                        "codepoint": entry.codepoint if entry else None,
+                        "names": [value],
+                        "missing": not known,
+                        "uses": [],
+                    }
+            uses = report[key]["uses"]
+            if not uses or uses[-1] != (path, line):
+                uses.append((path, line))
+    return report
@@ -0,0 +1,156 @@
+"""Benchmark datasets, statistics and run history for nerdfont-bench.py
+
+A run times every pipeline stage on a set of datasets (synthetic name lists
+of SIZES icons and the real WezTerm data) and appends the results to
+`.state/bench-history.json`:
+
+    {"runs": [{"time": ..., "commit": ..., "host": ..., "tools": {...},
+               "results": {dataset: {stage: {count, p50_ms, p99_ms, mean_ms, max_ms}}}}]}
+
+`compare()` checks one run against an earlier one: a stage regressed when
+its p50 grew by more than a relative threshold and an absolute floor (so
+sub-millisecond jitter never counts). Runs made with different tools
+(fzf vs the grep stand-in) are only compared with a warning.
+"""
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from . import SCRIPT_DIR, classifier, datadir
+
+HISTORY_FILE = SCRIPT_DIR / ".state" / "bench-history.json"
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Words of classifier.synthetic_names plus real-data queries, some of which miss on either
+QUERIES = (
+    "arrow", "file outline", "batt", "cloud down", "account box", "al", "folder left",
+    "git branch", "docker", "weather sun",
+)
+
+
+class Dataset:
+    """Icon names with their glyphs and corpus descriptions, ready for the generator"""
+
+    def __init__(self, name, icon_names, glyphs, descriptions=None):
+        self.name = name
+        self.icon_names = icon_names
+        self.glyphs = glyphs
+        self.descriptions = descriptions or {}
+
+
+def synthetic(rules, count, seed=0):
+    """`count` names from the rules' prefixes, each with a distinct supplementary PUA glyph"""
+    names = classifier.synthetic_names(rules, count, seed)
+    glyphs = {name: chr(0xF0000 + i % 0xFFFE) for i, name in enumerate(names)}
+    # One icon in ten has a corpus description, like the real nerdfont-icons/ data
+    descriptions = {ord(glyphs[name]): name.replace("_", " ") for name in names[::10]}
+    return Dataset(f"synthetic-{count}", names, glyphs, descriptions)
+
+
+def sample(items, count, seed=0):
+    """Up to `count` items, the same ones for the same input"""
+    items = list(items)
+    if len(items) <= count:
+        return items
+    return random.Random(seed).sample(items, count)
+
+
+def timed(function, *args, **kwargs):
+    """(result, elapsed ms)"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarise(samples):
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def git_commit():
+    """Short HEAD of the repository the browser lives in, or None"""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(SCRIPT_DIR), "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def new_run(tools, results):
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "tools": tools,
+        "results": results,
+    }
+
+
+def read_history(path=HISTORY_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("runs", [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def append_history(run, path=HISTORY_FILE):
+    runs = read_history(path)
+    runs.append(run)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    datadir.write_atomic(path, json.dumps({"runs": runs}, indent=1).encode("utf-8"))
+    return len(runs) - 1
+
+
+def compare(baseline, current, threshold=0.10, floor_ms=0.5):
+    """[(dataset, stage, old p50, new p50, change, status)] for the stages both runs have
+
+    status is "regression", "improvement" or "ok".
+    """
+    rows = []
+    for dataset, stages in current["results"].items():
+        for stage, stats in stages.items():
+            old = baseline["results"].get(dataset, {}).get(stage)
+            if not old:
+                continue
+            before, after = old["p50_ms"], stats["p50_ms"]
+            change = (after - before) / before if before else 0.0
+            status = "ok"
+            if abs(after - before) > floor_ms:
+                if change > threshold:
+                    status = "regression"
+                elif change < -threshold:
+                    status = "improvement"
+            rows.append((dataset, stage, before, after, change, status))
+    return rows
+
+
+def print_comparison(baseline, current, rows, file=sys.stdout):
+    print(f"baseline {baseline['time']} ({baseline.get('commit') or '?'}) -> "
+          f"current {current['time']} ({current.get('commit') or '?'})", file=file)
+    if baseline.get("tools") != current.get("tools"):
+        print(f"Warning: runs used different tools: {baseline.get('tools')} vs {current.get('tools')}", file=file)
+    print(f"{'dataset':<20} {'stage':<10} {'before':>10} {'after':>10} {'change':>8}", file=file)
+    for dataset, stage, before, after, change, status in rows:
+        mark = {"regression": "  REGRESSION", "improvement": "  improved"}.get(status, "")
+        print(f"{dataset:<20} {stage:<10} {before:>8.2f}ms {after:>8.2f}ms {change:>+7.0%}{mark}", file=file)
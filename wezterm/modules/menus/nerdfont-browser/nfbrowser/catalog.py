@@ -0,0 +1,180 @@
+"""SQLite/FTS5 icon catalog shared by the wezterm and tmux nerdfont browsers
+
+One row per icon (name, glyph, codepoint, category, description) plus an
+FTS5 index over the name words, corpus descriptions and category, so a
+query like "git branch" is answered across every category without
+reading the per-category listings.
+
+Icons are stored under their most specific category; `category_path`
+adds the parents ("MD Devices & Power / Material Design"), so searching
+"material" and filtering on a parent category find sub-category icons too.
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+
+SCHEMA = """
+CREATE TABLE categories (
+    name TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    color TEXT NOT NULL,
+    listing TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    parent TEXT
+);
+CREATE TABLE icons (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    glyph TEXT NOT NULL,
+    codepoint INTEGER,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    category_path TEXT NOT NULL
+);
+CREATE INDEX icons_category ON icons (category, name);
+CREATE VIRTUAL TABLE icons_fts USING fts5 (
+    words, description, category,
+    content = 'icons_search', content_rowid = 'id',
+    prefix = '2 3 4'
+);
+CREATE VIEW icons_search AS
+    SELECT id, replace(substr(name, instr(name, '_') + 1), '_', ' ') AS words, description,
+           category_path AS category
+    FROM icons;
+"""
+
+# Column weights for bm25(): name words matter most, then descriptions
+RANK = "bm25(icons_fts, 10.0, 3.0, 1.0)"
+HEX = "CASE WHEN {0}codepoint IS NULL THEN '' ELSE printf('%x', {0}codepoint) END"
+TOKEN = re.compile(r"\w+", re.UNICODE)
+INSERT_ICON = (
+    "INSERT INTO icons (name, glyph, codepoint, category, description, category_path) VALUES (?, ?, ?, ?, ?, ?)"
+)
+# A category and every category below it
+SCOPE = (
+    "WITH RECURSIVE scope(name) AS ("
+    " SELECT ? UNION SELECT c.name FROM categories c JOIN scope s ON c.parent = s.name) "
+)
+
+
+def category_paths(categories):
+    """{category: "category / parent / ..."} for `categories` rows (as for `build`)"""
+    parents = {row[0]: row[5] for row in categories}
+    paths = {}
+    for name in parents:
+        chain = [name]
+        while parents.get(chain[-1]) and parents[chain[-1]] not in chain:
+            chain.append(parents[chain[-1]])
+        paths[name] = " / ".join(chain)
+    return paths
+
+
+def with_paths(icons, paths):
+    """`icons` rows with their category path appended, sorted"""
+    return sorted((*row, paths.get(row[3], row[3])) for row in icons)
+
+
+def build(icons, categories):
+    """Build a catalog and return its bytes
+
+    `icons` yields (name, glyph, codepoint, category, description) rows,
+    `categories` yields (name, description, color, listing, count, parent).
+    """
+    categories = list(categories)
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.executemany("INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?)", categories)
+            conn.executemany(INSERT_ICON, with_paths(icons, category_paths(categories)))
+            conn.execute("INSERT INTO icons_fts (icons_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO icons_fts (icons_fts) VALUES ('optimize')")
+        conn.execute("VACUUM")
+        conn.close()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(path)
+
+
+def update(blob, icons, removed, categories):
+    """Apply a partial rebuild to the catalog bytes `blob` and return new bytes
+
+    `icons` rows (as for `build`) replace any row with the same name, names
+    in `removed` are dropped and the categories table is replaced. The FTS
+    index is patched row by row instead of rebuilt and nothing is vacuumed,
+    so the result is not byte-identical to a full `build`.
+    """
+    categories = list(categories)
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    with os.fdopen(fd, "wb") as f:
+        f.write(blob)
+    try:
+        conn = sqlite3.connect(path)
+        with conn:
+            for name in [*removed, *(row[0] for row in icons)]:
+                conn.execute(
+                    "INSERT INTO icons_fts (icons_fts, rowid, words, description, category)"
+                    " SELECT 'delete', id, words, description, category FROM icons_search"
+                    " WHERE id IN (SELECT id FROM icons WHERE name = ?)",
+                    (name,),
+                )
+                conn.execute("DELETE FROM icons WHERE name = ?", (name,))
+
+            for row in with_paths(icons, category_paths(categories)):
+                rowid = conn.execute(INSERT_ICON, row).lastrowid
+                conn.execute(
+                    "INSERT INTO icons_fts (rowid, words, description, category)"
+                    " SELECT id, words, description, category FROM icons_search WHERE id = ?",
+                    (rowid,),
+                )
+
+            conn.execute("DELETE FROM categories")
+            conn.executemany("INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?)", categories)
+        conn.close()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(path)
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    return " ".join(f'"{word}"*' for word in TOKEN.findall(text.replace("_", " ")))
+
+
+def connect(path):
+    """Open a catalog read-only"""
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def search(conn, text, limit=200, category=None):
+    """Ranked (glyph, name, codepoint hex) rows matching `text`, within `category` and its sub-categories"""
+    query = fts_query(text)
+    if not query:
+        return []
+
+    sql = (
+        f"SELECT i.glyph, i.name, {HEX.format('i.')} FROM icons_fts"
+        " JOIN icons i ON i.id = icons_fts.rowid"
+        " WHERE icons_fts MATCH ?"
+    )
+    params = [query]
+    if category:
+        sql = SCOPE + sql + " AND i.category IN scope"
+        params.insert(0, category)
+    sql += f" ORDER BY {RANK}, length(i.name) LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def lookup(conn, name):
+    """(glyph, name, codepoint hex, category, description) for one icon name"""
+    return conn.execute(
+        f"SELECT glyph, name, {HEX.format('')}, category, description FROM icons WHERE name = ?",
+        (name,),
+    ).fetchone()
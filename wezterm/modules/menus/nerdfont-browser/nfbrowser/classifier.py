@@ -0,0 +1,233 @@
+"""Rule-based icon category classifier
+
+Categories come from a rules file (category-rules.json next to the scripts)::
+
+    {"categories": [
+        {"name": "Material Design", "description": "...", "color": "cyan",
+         "prefixes": ["md_"]},
+        {"name": "MD Arrows", "parent": "Material Design", "description": "...",
+         "color": "cyan", "prefixes": ["md_arrow_"], "patterns": ["md_*_arrow*"]}
+    ]}
+
+Every prefix and every pattern's literal head (the text before its first
+wildcard) becomes a node of one character trie. A name is decided by the
+deepest node on its path that has a matching rule, so `fae_` beats `fa_`
+and `md_arrow_` beats `md_` regardless of their order in the file. At a
+node, fnmatch patterns are tried before the plain prefix; two patterns of
+different categories matching the same name make it ambiguous (the first
+one in file order wins and the name is reported).
+
+The trie is compiled to one nested regular expression whose match is the
+deciding node's prefix. `classify_all()` runs it over all names joined by
+newlines with a single `findall`, so the per-name Python work is one dict
+lookup and an append.
+"""
+
+import fnmatch
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+
+from . import SCRIPT_DIR
+
+RULES_FILE = SCRIPT_DIR / "category-rules.json"
+WILDCARDS = re.compile(r"[*?\[]")
+REPORT_LIMIT = 20
+
+Category = namedtuple("Category", "name description color parent")
+Report = namedtuple("Report", "counts unmatched ambiguous")
+
+
+class _Node:
+    __slots__ = ("children", "category", "patterns")
+
+    def __init__(self):
+        self.children = {}
+        self.category = None  # Category of a plain prefix ending here
+        self.patterns = []  # (compiled pattern, category) anchored here
+
+
+class Classifier:
+    """Compiled category rules; build with `load()` or `Classifier(rules)`"""
+
+    def __init__(self, rules):
+        self.categories = {}
+        self._root = _Node()
+
+        for spec in rules["categories"]:
+            category = Category(spec["name"], spec.get("description", ""),
+                                spec.get("color", "white"), spec.get("parent"))
+            if category.name in self.categories:
+                raise ValueError(f"category {category.name!r} is defined twice")
+            self.categories[category.name] = category
+
+            for prefix in spec.get("prefixes", []):
+                node = self._insert(prefix)
+                if node.category is not None:
+                    raise ValueError(f"prefix {prefix!r} is claimed by both "
+                                     f"{node.category.name!r} and {category.name!r}")
+                node.category = category
+
+            for pattern in spec.get("patterns", []):
+                head = WILDCARDS.split(pattern, 1)[0]
+                self._insert(head).patterns.append((re.compile(fnmatch.translate(pattern)), category))
+
+        for category in self.categories.values():
+            if category.parent and category.parent not in self.categories:
+                raise ValueError(f"{category.name!r}: unknown parent {category.parent!r}")
+
+        # Rule node prefix -> (pattern lists to try, deepest first; fallback category)
+        self._decisions = {}
+        trie = self._compile(self._root, "", None, ())
+        self._match = re.compile(trie).match
+        self._findall = re.compile(rf"\n({trie}|)[^\n]*").findall
+
+    def _insert(self, prefix):
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _Node())
+        return node
+
+    def _compile(self, node, prefix, fallback, pending):
+        """Regex for the subtree at `node`; deeper alternatives come first
+
+        `pending` holds the pattern lists of the nodes between the nearest
+        prefix rule (`fallback`) and this one, deepest first; a name that
+        stops here tries them before falling back.
+        """
+        if node.category is not None:
+            fallback, pending = node.category, ()
+        if node.patterns:
+            pending = (node.patterns, *pending)
+
+        alternatives = [
+            re.escape(char) + self._compile(child, prefix + char, fallback, pending)
+            for char, child in sorted(node.children.items())
+        ]
+        if node.category is not None or node.patterns:
+            self._decisions[prefix] = (pending, fallback)
+            alternatives.append("")
+
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    @staticmethod
+    def _decide(name, levels, fallback):
+        """(category or None, ambiguous) for a name that reached a rule node"""
+        for patterns in levels:
+            matched = [category for pattern, category in patterns if pattern.match(name)]
+            if matched:
+                return matched[0], len(set(matched)) > 1
+        return fallback, False
+
+    def classify(self, name):
+        """Category of one name, or None"""
+        match = self._match(name)
+        if match is None:
+            return None
+        return self._decide(name, *self._decisions[match.group()])[0]
+
+    def classify_all(self, names):
+        """({category name: [names]}, Report) for a list of names, order kept"""
+        names = list(names)
+        heads = self._findall("\n" + "\n".join(names)) if names else []
+        if len(heads) != len(names):  # A name contained a newline
+            heads = [match.group() if match else "" for match in map(self._match, names)]
+
+        groups = {category: [] for category in self.categories}
+        unmatched = []
+        ambiguous = []
+
+        def decider(levels, fallback):
+            def add(name):
+                category, clash = self._decide(name, levels, fallback)
+                if clash:
+                    ambiguous.append(name)
+                if category is None:
+                    unmatched.append(name)
+                else:
+                    groups[category.name].append(name)
+            return add
+
+        # One callable per deciding prefix; only pattern nodes look at the name
+        add = {}
+        for head in set(heads):
+            levels, fallback = self._decisions.get(head, ((), None))
+            if levels:
+                add[head] = decider(levels, fallback)
+            elif fallback is None:
+                add[head] = unmatched.append
+            else:
+                add[head] = groups[fallback.name].append
+
+        for name, head in zip(names, heads):
+            add[head](name)
+
+        groups = {category: members for category, members in groups.items() if members}
+        counts = Counter({category: len(members) for category, members in groups.items()})
+        return groups, Report(counts, unmatched, ambiguous)
+
+    def ancestors(self, name):
+        """Parent category names of `name`, nearest first"""
+        chain = []
+        parent = self.categories[name].parent
+        while parent and parent not in chain:
+            chain.append(parent)
+            parent = self.categories[parent].parent
+        return chain
+
+
+def load(path=None):
+    """Compile the rules file at `path` (default: category-rules.json)"""
+    with open(path or RULES_FILE, encoding="utf-8") as f:
+        return Classifier(json.load(f))
+
+
+def print_report(report, file=sys.stderr):
+    """Summarise unmatched and ambiguous names"""
+    for label, names in (("unmatched", report.unmatched), ("ambiguous", report.ambiguous)):
+        if not names:
+            continue
+        shown = ", ".join(names[:REPORT_LIMIT])
+        more = f" (+{len(names) - REPORT_LIMIT} more)" if len(names) > REPORT_LIMIT else ""
+        print(f"Warning: {len(names)} {label} icon names: {shown}{more}", file=file)
+
+
+def synthetic_names(classifier, count, seed=0):
+    """`count` plausible icon names built from the rules' prefixes"""
+    rng = random.Random(seed)
+    heads = sorted(classifier._decisions) + ["zz_"]  # Exercise the unmatched path
+    words = ["arrow", "file", "folder", "battery", "account", "cloud", "down", "left", "outline", "box", "alert"]
+    return [f"{rng.choice(heads)}{rng.choice(words)}_{rng.choice(words)}_{i}" for i in range(count)]
+
+
+def main(argv):
+    """python3 -m nfbrowser.classifier [--bench N] [NAMES_FILE] -- classify and report"""
+    rules = load()
+    if argv[:1] == ["--bench"]:
+        count = int(argv[1]) if len(argv) > 1 else 1_000_000
+        names = synthetic_names(rules, count)
+        start = time.perf_counter()
+        _groups, report = rules.classify_all(names)
+        elapsed = time.perf_counter() - start
+        print(f"Classified {count} names into {len(report.counts)} categories in {elapsed * 1000:.0f}ms "
+              f"({elapsed / count * 1e9:.0f}ns/name), {len(report.unmatched)} unmatched, "
+              f"{len(report.ambiguous)} ambiguous")
+        return 0
+
+    source = open(argv[0], encoding="utf-8") if argv else sys.stdin
+    with source:
+        names = [line.strip() for line in source if line.strip() and not line.startswith("#")]
+    _groups, report = rules.classify_all(names)
+    for category, count in sorted(report.counts.items()):
+        print(f"{count:7d}  {category}")
+    print_report(report, file=sys.stdout)
+    return 1 if report.unmatched or report.ambiguous else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
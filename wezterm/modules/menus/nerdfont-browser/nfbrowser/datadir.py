@@ -0,0 +1,155 @@
+"""Incremental, atomic publishing of the generated data/ directory
+
+`data` is a symlink to one immutable generation under `.data/gen-<ns>/`.
+Neither is tracked (see .gitignore): a checkout gets its first generation
+from generate-wezterm-data.py. A run renders every output in memory and then:
+
+* files whose content hash matches the manifest are hard-linked from the
+  current generation instead of being rewritten
+* changed files are written to a temp file and renamed into place
+* the new generation becomes visible in one step by renaming a fresh
+  symlink over `data`, so an fzf session never sees a half-written tree
+
+The previous generation is kept until the next run for readers that
+resolved `data` just before the swap. `manifest.json` records the input
+and output hashes of every generation. Generations are never written in
+place, other writers (create-name-mapping.py) publish on top of the
+current one as well.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+MANIFEST = "manifest.json"
+KEEP_GENERATIONS = 2
+
+
+def digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_digest(path):
+    """sha256 of a file's content, or None if it does not exist"""
+    try:
+        with open(path, "rb") as f:
+            return digest(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def input_digests(paths):
+    """{path: digest} for every input that feeds the generator"""
+    return {str(path): file_digest(path) for path in paths}
+
+
+def read_manifest(data_dir):
+    try:
+        with open(Path(data_dir) / MANIFEST) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def is_current(data_dir, inputs):
+    """True if `inputs` match the manifest and every recorded output still exists"""
+    manifest = read_manifest(data_dir)
+    if not manifest or manifest.get("inputs") != inputs:
+        return False
+    return all((Path(data_dir) / name).exists() for name in manifest.get("outputs", {}))
+
+
+def write_atomic(path, content):
+    """Write bytes to `path` via a temp file in the same directory + rename"""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _swap(data_dir, generation):
+    """Point `data_dir` at `generation` with a single rename"""
+    tmp = data_dir.with_name(f".{data_dir.name}.swap-{os.getpid()}")
+    if tmp.is_symlink():
+        tmp.unlink()
+    os.symlink(os.path.relpath(generation, data_dir.parent), tmp)
+
+    if data_dir.exists() and not data_dir.is_symlink():
+        # First run against a plain directory: park it just before the new generation
+        stamp = int(generation.name.split("-")[1])
+        data_dir.rename(generation.parent / f"gen-{stamp - 1}-legacy")
+    os.replace(tmp, data_dir)
+
+
+def _prune(store, keep):
+    generations = sorted(p for p in store.iterdir() if p.is_dir() and p.name.startswith("gen-"))
+    for old in generations[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def publish(data_dir, outputs, inputs=None, replace=True, managed=True):
+    """Publish a new generation of `data_dir`
+
+    `outputs` maps file names to bytes. With `replace=False` the outputs are
+    applied on top of the current generation (files not mentioned are kept),
+    which is how partial rebuilds publish. Files in the current generation
+    that the generator never managed (e.g. codepoint-index.bin) are always
+    carried over. `inputs=None` keeps the manifest's inputs, and with
+    `managed=False` new files are not recorded as generator outputs, so
+    other writers do not make the generator's next run stale or drop their
+    files. Returns (written, reused) lists of file names.
+    """
+    data_dir = Path(data_dir)
+    current = data_dir.resolve() if data_dir.exists() else None
+    manifest = read_manifest(data_dir)
+    old_outputs = manifest.get("outputs", {})
+    if inputs is None:
+        inputs = manifest.get("inputs", {})
+
+    store = data_dir.parent / ".data"
+    generation = store / f"gen-{time.time_ns()}"
+    generation.mkdir(parents=True)
+
+    new_outputs = {} if replace else dict(old_outputs)
+    written, reused = [], []
+    for name, content in outputs.items():
+        content_digest = digest(content)
+        if managed or name in new_outputs:
+            new_outputs[name] = content_digest
+        if current and old_outputs.get(name) == content_digest and (current / name).exists():
+            _link_or_copy(current / name, generation / name)
+            reused.append(name)
+        else:
+            write_atomic(generation / name, content)
+            written.append(name)
+
+    if current:
+        for path in current.iterdir():
+            name = path.name
+            if name == MANIFEST or name.startswith(".") or name in outputs or not path.is_file():
+                continue
+            if name in old_outputs and name not in new_outputs:
+                continue  # Output the generator no longer produces
+            _link_or_copy(path, generation / name)
+
+    manifest = {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "inputs": inputs,
+        "outputs": new_outputs,
+    }
+    write_atomic(generation / MANIFEST, json.dumps(manifest, indent=2).encode())
+
+    _swap(data_dir, generation)
+    _prune(store, KEEP_GENERATIONS)
+    return written, reused
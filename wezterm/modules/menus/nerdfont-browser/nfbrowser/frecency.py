@@ -0,0 +1,137 @@
+"""Frecency of copied icons, behind the browser's "Frequent" category
+
+Every copy appends one line to `.state/frecency.log`::
+
+    <unix time>\\t<glyph>\\t<name>\\t<codepoint>
+
+Scores decay exponentially (HALF_LIFE), so an icon's score is the sum of
+2^(-age / half life) over its copies. `.state/frecency.json` is a snapshot
+of all scores at a reference time plus the log offset it covers; reading
+replays only the log lines after that offset. Once the tail grows past
+COMPACT_AFTER lines the snapshot is rewritten at the current time, icons
+that decayed below MIN_SCORE are dropped and the log is truncated.
+
+Because every score decays by the same factor, the ranking only changes
+when an icon is copied, so the ranked listing (`.state/frequent.tsv`) is
+rewritten on `record()`. It lives next to the log rather than in data/,
+whose generations are never written in place; categories.json points the
+"Frequent" category at it by absolute path.
+"""
+
+import fcntl
+import json
+import math
+import os
+import time
+
+from . import SCRIPT_DIR, datadir
+
+STATE_DIR = SCRIPT_DIR / ".state"
+LOG_FILE = STATE_DIR / "frecency.log"
+SNAPSHOT_FILE = STATE_DIR / "frecency.json"
+LISTING_FILE = STATE_DIR / "frequent.tsv"
+
+HALF_LIFE = 14 * 24 * 3600
+COMPACT_AFTER = 256
+MIN_SCORE = 0.05
+LISTING_SIZE = 50
+
+DECAY = math.log(2) / HALF_LIFE
+
+
+def _read_snapshot(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return snapshot["ref"], snapshot["offset"], snapshot["items"]
+    except (OSError, ValueError, KeyError):
+        return 0, 0, {}
+
+
+def _parse(line):
+    fields = line.rstrip("\n").split("\t")
+    if len(fields) != 4 or not fields[0].isdigit() or not fields[2]:
+        return None
+    return int(fields[0]), fields[1], fields[2], fields[3]
+
+
+class Store:
+    """Append-only copy log plus a score snapshot"""
+
+    def __init__(self, log=LOG_FILE, snapshot=SNAPSHOT_FILE, listing=LISTING_FILE):
+        self.log = log
+        self.snapshot = snapshot
+        self.listing = listing
+
+    def _scores(self, log_file, now):
+        """({name: [score at `now`, count, last, glyph, codepoint]}, tail lines) from `log_file` (locked)"""
+        ref, offset, items = _read_snapshot(self.snapshot)
+        decay = math.exp(-DECAY * max(now - ref, 0))
+        scores = {name: [score * decay, count, last, glyph, cp]
+                  for name, (score, count, last, glyph, cp) in items.items()}
+
+        log_file.seek(offset)
+        tail = 0
+        for raw in log_file:
+            parsed = _parse(raw.decode("utf-8", "replace"))
+            if parsed is None:
+                continue
+            stamp, glyph, name, cp = parsed
+            item = scores.setdefault(name, [0.0, 0, 0, glyph, cp])
+            item[0] += math.exp(-DECAY * max(now - stamp, 0))
+            item[1] += 1
+            item[2] = max(item[2], stamp)
+            item[3], item[4] = glyph, cp
+            tail += 1
+        return scores, tail
+
+    def _open_log(self):
+        os.makedirs(os.path.dirname(self.log), exist_ok=True)
+        log_file = open(self.log, "a+b")
+        fcntl.flock(log_file, fcntl.LOCK_EX)
+        return log_file
+
+    def record(self, glyph, name, codepoint="", now=None):
+        """Append one copy, then refresh the ranked listing (and compact when due)"""
+        now = int(now or time.time())
+        line = f"{now}\t{glyph}\t{name}\t{codepoint}\n".encode("utf-8")
+        with self._open_log() as log_file:
+            log_file.write(line)  # O_APPEND: one write per copy
+            log_file.flush()
+
+            scores, tail = self._scores(log_file, now)
+            if tail >= COMPACT_AFTER:
+                self._compact(log_file, scores, now)
+        self._write_listing(scores)
+
+    def _compact(self, log_file, scores, now):
+        items = {name: item for name, item in scores.items() if item[0] >= MIN_SCORE}
+        snapshot = {"ref": now, "offset": 0, "items": items}
+        datadir.write_atomic(self.snapshot, json.dumps(snapshot, ensure_ascii=False).encode("utf-8"))
+        log_file.truncate(0)
+
+    def compact(self, now=None):
+        now = int(now or time.time())
+        with self._open_log() as log_file:
+            scores, _tail = self._scores(log_file, now)
+            self._compact(log_file, scores, now)
+        self._write_listing(scores)
+
+    def top(self, limit=LISTING_SIZE, now=None):
+        """[(score, count, glyph, name, codepoint)], best first"""
+        now = int(now or time.time())
+        try:
+            with open(self.log, "rb") as log_file:
+                fcntl.flock(log_file, fcntl.LOCK_SH)
+                scores, _tail = self._scores(log_file, now)
+        except FileNotFoundError:
+            return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(score, count, glyph, name, cp) for name, (score, count, _last, glyph, cp) in ranked[:limit]]
+
+    def _write_listing(self, scores):
+        """Ranked rows in listing format (glyph<TAB>name<TAB>codepoint)"""
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], item[0]))[:LISTING_SIZE]
+        rows = "".join(f"{glyph}\t{name}\t{cp}\n" for name, (_score, _count, _last, glyph, cp) in ranked)
+        os.makedirs(os.path.dirname(self.listing), exist_ok=True)
+        datadir.write_atomic(self.listing, rows.encode("utf-8"))
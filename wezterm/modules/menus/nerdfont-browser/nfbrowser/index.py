@@ -0,0 +1,275 @@
+"""Codepoint index over the nerdfont-icons/*.sh corpus and the glyph name table
+
+The icon lists come in several hand-made formats::
+
+    Decimal Unicode Glyph              (header)
+    59136 \\ue700 <glyph>               decimal, escaped codepoint, glyph
+    <glyph> U+25B6 Black right triangle glyph, codepoint, description
+     U+F013 Gear (FA)                  codepoint, description (glyph missing)
+    custom_c | <glyph>                 name, glyph
+
+`iter_records()` streams any of them into `Record`s, `build_index()` merges
+records (plus the resolver's name table) into one entry per codepoint, and
+`write_index()` stores the result as a flat, sorted binary file that
+`CodepointIndex` binary-searches straight out of an mmap.
+
+File layout (little endian)::
+
+    header   magic "NFIX", u16 version, u16 reserved, u32 n_codepoints, u32 n_names
+    cp table n_codepoints x (u32 codepoint, u32 string offset, u32 string length)
+    names    n_names x (u32 name offset, u32 name length, u32 codepoint), sorted by name
+    strings  utf-8 blob; a codepoint record is names<RS>sources<RS>descriptions,
+             each list joined with <US>
+"""
+
+import mmap
+import re
+import struct
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+MAGIC = b"NFIX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+CP_RECORD = struct.Struct("<III")
+NAME_RECORD = struct.Struct("<III")
+RS, US = "\x1e", "\x1f"
+
+Record = namedtuple("Record", "codepoint name description source")
+IndexEntry = namedtuple("IndexEntry", "codepoint glyph names sources descriptions")
+
+DECIMAL_LINE = re.compile(r"^(\d+)\s+\\u\{?([0-9A-Fa-f]+)\}?(?:\s+(\S+))?\s*$")
+UPLUS_LINE = re.compile(r"^\s*(?:(\S+)\s+)??U\+([0-9A-Fa-f]{4,6})\b\s*(.*?)\s*$")
+NAMED_LINE = re.compile(r"^([A-Za-z0-9_]+)\s*\|\s*(\S+)\s*$")
+DECIMAL_HEADER = re.compile(r"^Decimal\s+Unicode\s+Glyph\s*$")
+
+
+def parse_line(line):
+    """Parse one corpus line into (codepoint, name, description) or None"""
+    match = DECIMAL_LINE.match(line)
+    if match:
+        return int(match.group(2), 16), "", ""
+
+    match = NAMED_LINE.match(line)
+    if match:
+        return ord(match.group(2)[0]), match.group(1), ""
+
+    match = UPLUS_LINE.match(line)
+    if match:
+        return int(match.group(2), 16), "", match.group(3)
+
+    return None
+
+
+def iter_records(path):
+    """Stream `Record`s from one nerdfont-icons file, skipping comments and headers
+
+    Returns the number of lines that were neither blank, comments nor a known
+    format through `StopIteration.value`, which `build_index` reports.
+    """
+    source = Path(path).name
+    unknown = 0
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.rstrip("\n")
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#") or DECIMAL_HEADER.match(stripped):
+                continue
+
+            parsed = parse_line(line)
+            if parsed is None:
+                unknown += 1
+                continue
+
+            codepoint, name, description = parsed
+            yield Record(codepoint, name, description, source)
+    return unknown
+
+
+def build_index(icon_files, name_table=None, table_source="glyphnames.json"):
+    """Merge every record into {codepoint: (names, sources, descriptions)}
+
+    `name_table` is the resolver's {name: codepoint} table; its names are
+    attached to the codepoints the corpus files describe and add the ones
+    they don't. Returns (entries, {file name: (records, unknown lines)}).
+    """
+    entries = {}
+    stats = {}
+
+    def add(codepoint, name, description, source):
+        names, sources, descriptions = entries.setdefault(codepoint, ([], [], []))
+        if name and name not in names:
+            names.append(name)
+        if source not in sources:
+            sources.append(source)
+        if description and description not in descriptions:
+            descriptions.append(description)
+
+    for path in icon_files:
+        records = iter_records(path)
+        count = 0
+        while True:
+            try:
+                record = next(records)
+            except StopIteration as done:
+                stats[Path(path).name] = (count, done.value or 0)
+                break
+            add(*record)
+            count += 1
+
+    for name, codepoint in (name_table or {}).items():
+        add(codepoint, name, "", table_source)
+
+    return entries, stats
+
+
+def render_index(entries):
+    """Index file content for entries from `build_index`, as bytes"""
+    blob = bytearray()
+    cp_records = []
+    name_records = []
+
+    for codepoint in sorted(entries):
+        names, sources, descriptions = entries[codepoint]
+        text = RS.join((US.join(names), US.join(sources), US.join(descriptions))).encode("utf-8")
+        offset = len(blob)
+        cp_records.append(CP_RECORD.pack(codepoint, offset, len(text)))
+        blob += text
+
+        # Name records point back into the codepoint record's names field
+        for name in names:
+            encoded = name.encode("utf-8")
+            name_records.append((encoded, offset, codepoint))
+            offset += len(encoded) + 1
+
+    name_records.sort(key=lambda record: record[0])
+
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, 0, len(cp_records), len(name_records)),
+        *cp_records,
+        *(NAME_RECORD.pack(offset, len(encoded), cp) for encoded, offset, cp in name_records),
+        blob,
+    ])
+
+
+def write_index(entries, path):
+    """Write entries from `build_index` to `path` (via a temp file + rename)"""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(render_index(entries))
+    tmp.replace(path)
+
+
+class CodepointIndex:
+    """Read-only view of an index file; opening it costs one mmap"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _reserved, self._n_cp, self._n_names = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} codepoint index")
+
+        self._cp_at = HEADER.size
+        self._names_at = self._cp_at + self._n_cp * CP_RECORD.size
+        self._strings_at = self._names_at + self._n_names * NAME_RECORD.size
+
+    def __len__(self):
+        return self._n_cp
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+
+    def names(self):
+        """Every icon name in the index, in sorted order"""
+        for i in range(self._n_names):
+            offset, length, _cp = NAME_RECORD.unpack_from(self._mm, self._names_at + i * NAME_RECORD.size)
+            yield self._string(offset, length)
+
+    def _string(self, offset, length):
+        start = self._strings_at + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _find_codepoint(self, codepoint):
+        lo, hi = 0, self._n_cp
+        while lo < hi:
+            mid = (lo + hi) // 2
+            cp, offset, length = CP_RECORD.unpack_from(self._mm, self._cp_at + mid * CP_RECORD.size)
+            if cp == codepoint:
+                return offset, length
+            if cp < codepoint:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _find_name(self, name):
+        target = name.encode("utf-8")
+        lo, hi = 0, self._n_names
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, cp = NAME_RECORD.unpack_from(self._mm, self._names_at + mid * NAME_RECORD.size)
+            start = self._strings_at + offset
+            candidate = self._mm[start:start + length]
+            if candidate == target:
+                return cp
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def lookup(self, key):
+        """Look up an `IndexEntry` by codepoint (int or "U+F013") or icon name"""
+        if isinstance(key, str):
+            if key[:2] in ("U+", "u+"):
+                key = int(key[2:], 16)
+            else:
+                key = self._find_name(key)
+                if key is None:
+                    return None
+
+        found = self._find_codepoint(key)
+        if found is None:
+            return None
+
+        names, sources, descriptions = self._string(*found).split(RS)
+        return IndexEntry(
+            key,
+            chr(key),
+            names.split(US) if names else [],
+            sources.split(US) if sources else [],
+            descriptions.split(US) if descriptions else [],
+        )
+
+
+def main(argv):
+    """python3 -m nfbrowser.index INDEX_FILE KEY... -- print matching entries"""
+    if len(argv) < 2:
+        print(main.__doc__, file=sys.stderr)
+        return 1
+
+    status = 0
+    with CodepointIndex(argv[0]) as index:
+        for key in argv[1:]:
+            entry = index.lookup(int(key) if key.isdigit() else key)
+            if entry is None:
+                print(f"{key}: not found", file=sys.stderr)
+                status = 1
+                continue
+            print(f"U+{entry.codepoint:04X}\t{entry.glyph}\t{','.join(entry.names)}"
+                  f"\t{','.join(entry.sources)}\t{'; '.join(entry.descriptions)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
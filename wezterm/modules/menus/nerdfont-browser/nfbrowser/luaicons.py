@@ -0,0 +1,226 @@
+"""Icon definitions from Lua tables such as modules/icons/custom_icons.lua
+
+`scan()` tokenizes the whole file (comments and long strings included, so
+entries may span lines) and records every `key = value` field of a
+top-level table constructor whose value is an icon:
+
+    yazi = "󰇥",                                     literal glyph
+    ["dev-box"] = "\\u{F01A7}",                     escapes are decoded
+    md_flattr = wezterm.nerdfonts.md_cloud_download,
+    alias = custom_icons.yazi,                       field of a scanned table
+
+References stay unresolved in the scan result; `resolve()` turns them into
+glyphs through a name -> glyph lookup (the generator's table or a
+codepoint index), so the cached scan is only invalidated by the Lua file
+itself. `scan_cached()` keys that cache on the file's mtime and size.
+"""
+
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from . import datadir
+
+# kind is "glyph" (value is the text), "nerdfonts" (value is an icon name)
+# or "field" (value is another entry of a scanned table)
+Entry = namedtuple("Entry", "name kind value line")
+
+TOKEN = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<comment>--(?:\[(?P<clevel>=*)\[.*?\](?P=clevel)\]|[^\n]*))
+    | (?P<long>\[(?P<level>=*)\[.*?\](?P=level)\])
+    | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+    | (?P<name>[A-Za-z_]\w*(?:\s*\.\s*[A-Za-z_]\w*)*)
+    | (?P<number>0[xX][0-9A-Fa-f.]+(?:[pP][+-]?\d+)?|\d+\.?\d*(?:[eE][+-]?\d+)?)
+    | (?P<op>\.\.\.?|==|~=|<=|>=|<<|>>|//|::|\S)
+""", re.S | re.X)
+
+ESCAPE = re.compile(rb"""\\(?:
+      (?P<simple>[abfnrtv\\"'\n])
+    | x(?P<hex>[0-9A-Fa-f]{2})
+    | u\{(?P<unicode>[0-9A-Fa-f]+)\}
+    | (?P<decimal>\d{1,3})
+    | z\s*
+)""", re.X)
+SIMPLE = {b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"v": b"\v"}
+
+
+def _unescape(match):
+    if match.group("simple") is not None:
+        char = match.group("simple")
+        return SIMPLE.get(char, char)
+    if match.group("hex"):
+        return bytes([int(match.group("hex"), 16)])
+    if match.group("unicode"):
+        return chr(int(match.group("unicode"), 16)).encode("utf-8", "surrogatepass")
+    if match.group("decimal"):
+        return bytes([int(match.group("decimal")) & 0xFF])
+    return b""  # \z skips the following whitespace
+
+
+def decode_string(token):
+    """Value of a Lua string literal token (quoted or long bracket)"""
+    if token[0] in "\"'":
+        raw = token[1:-1].encode("utf-8", "surrogatepass")
+        return ESCAPE.sub(_unescape, raw).decode("utf-8", "replace")
+    level = token.index("[", 1) + 1
+    body = token[level:-level]
+    return body[1:] if body.startswith("\n") else body
+
+
+def tokens(text):
+    """(kind, text, line) for every significant token"""
+    line = 1
+    for match in TOKEN.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind not in ("space", "comment"):
+            if kind == "long":
+                kind = "string"
+            yield kind, value, line
+        line += value.count("\n")
+
+
+def _value(toks, at, tables):
+    """(kind, value, next index) for the field value starting at `at`"""
+    kind, text, _line = toks[at]
+    after = toks[at + 1][1] if at + 1 < len(toks) else ""
+    if after not in (",", ";", "}"):
+        return None, None, at  # Expressions, calls, concatenations and nested tables aren't icons
+    if kind == "string":
+        return "glyph", decode_string(text), at + 1
+    if kind == "name":
+        parts = [part.strip() for part in text.split(".")]
+        if len(parts) >= 2 and parts[-2] == "nerdfonts":
+            return "nerdfonts", parts[-1], at + 1
+        if len(parts) == 2 and parts[0] in tables:
+            return "field", parts[1], at + 1
+    return None, None, at
+
+
+def scan(text):
+    """Every icon field of the top-level tables in a Lua source"""
+    toks = list(tokens(text))
+    entries = []
+    tables = set()
+    depth = 0
+    at = 0
+    while at < len(toks):
+        kind, value, line = toks[at]
+        if value == "{":
+            if depth == 0:
+                # `local custom_icons = {` makes `custom_icons.x` resolvable
+                if at >= 2 and toks[at - 1][1] == "=" and toks[at - 2][0] == "name":
+                    tables.add(toks[at - 2][1])
+            depth += 1
+        elif value == "}":
+            depth = max(depth - 1, 0)
+        elif value == "=" and depth == 1 and at + 1 < len(toks):
+            key = None
+            if toks[at - 1][0] == "name" and "." not in toks[at - 1][1]:
+                key, line = toks[at - 1][1], toks[at - 1][2]
+            elif at >= 3 and toks[at - 1][1] == "]" and toks[at - 2][0] == "string" and toks[at - 3][1] == "[":
+                key, line = decode_string(toks[at - 2][1]), toks[at - 2][2]
+
+            if key is not None:
+                value_kind, field_value, next_at = _value(toks, at + 1, tables)
+                if value_kind:
+                    entries.append(Entry(key, value_kind, field_value, line))
+                at = next_at
+                continue
+        at += 1
+
+    # A later table re-exporting `name = tbl.name` must not shadow the definition
+    seen = set()
+    unique = []
+    for entry in entries:
+        if entry.name not in seen:
+            seen.add(entry.name)
+            unique.append(entry)
+    return unique
+
+
+def scan_cached(path, cache_path):
+    """`scan()` a file, reusing `cache_path` while its mtime and size are unchanged"""
+    stat = os.stat(path)
+    key = [str(path), stat.st_mtime_ns, stat.st_size]
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            return [Entry(*entry) for entry in cached["entries"]]
+    except (OSError, ValueError, TypeError):
+        pass
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        entries = scan(f.read())
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    datadir.write_atomic(cache_path, json.dumps({"key": key, "entries": entries}, ensure_ascii=False).encode("utf-8"))
+    return entries
+
+
+def resolve(entries, lookup):
+    """({name: glyph}, [unresolved entries]); `lookup(icon name)` returns a glyph or None
+
+    Empty glyph strings count as unresolved.
+    """
+    resolved = {}
+    pending = []
+    for entry in entries:
+        if entry.kind == "glyph":
+            # An empty string (x = "") has no glyph to show
+            if entry.value:
+                resolved[entry.name] = entry.value
+            else:
+                pending.append(entry)
+        elif entry.kind == "nerdfonts":
+            glyph = lookup(entry.value)
+            if glyph:
+                resolved[entry.name] = glyph
+            else:
+                pending.append(entry)
+        else:
+            pending.append(entry)
+
+    # Field references may point forwards or at other references
+    progress = True
+    while pending and progress:
+        progress = False
+        for entry in list(pending):
+            if entry.kind == "field" and entry.value in resolved:
+                resolved[entry.name] = resolved[entry.value]
+                pending.remove(entry)
+                progress = True
+
+    order = {entry.name: i for i, entry in enumerate(entries)}
+    return dict(sorted(resolved.items(), key=lambda item: order[item[0]])), pending
+
+
+def main(argv):
+    """python3 -m nfbrowser.luaicons LUA_FILE [CODEPOINT_INDEX] -- list resolved icons"""
+    if not argv:
+        print(main.__doc__, file=sys.stderr)
+        return 1
+
+    with open(argv[0], encoding="utf-8", errors="replace") as f:
+        entries = scan(f.read())
+
+    lookup = lambda name: None  # noqa: E731
+    if len(argv) > 1:
+        from .index import CodepointIndex
+        index = CodepointIndex(argv[1])
+        lookup = lambda name: getattr(index.lookup(name), "glyph", None)  # noqa: E731
+
+    resolved, unresolved = resolve(entries, lookup)
+    for name, glyph in resolved.items():
+        print(f"{glyph}\t{name}\tU+{ord(glyph[0]):04X}")
+    for entry in unresolved:
+        print(f"{argv[0]}:{entry.line}: {entry.name}: unresolved {entry.kind} {entry.value}", file=sys.stderr)
+    return 1 if unresolved else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
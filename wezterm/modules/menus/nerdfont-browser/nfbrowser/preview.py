@@ -0,0 +1,181 @@
+"""In-memory preview rendering for the nerdfont browser
+
+Produces the same text as wezterm-preview.sh, but from data loaded once:
+categories.json, the first rows of every listing and the prefix ->
+category table. Renders the packed previews (nfbrowser/previewpack.py).
+"""
+
+import io
+import json
+from pathlib import Path
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[0;33m"
+CYAN = "\033[0;36m"
+BRIGHT_CYAN = "\033[0;96m"
+BRIGHT_WHITE = "\033[0;97m"
+BOLD = "\033[1m"
+DIM = "\033[2m"
+ITALIC = "\033[3m"
+RESET = "\033[0m"
+
+BAR = "═" * 62
+SAMPLE_COUNT = 20
+
+
+def _lines(path, files=None):
+    """Lines of `path`, taken from `files` ({file name: bytes}) when it has them"""
+    path = Path(path)
+    if files is not None and path.name in files:
+        return io.StringIO(files[path.name].decode("utf-8"))
+    return open(path, encoding="utf-8")
+
+
+def _read_abbreviations(path, files=None):
+    """prefix -> description from abbreviation-to-category.txt (prefix="desc")"""
+    table = {}
+    try:
+        with _lines(path, files) as f:
+            for line in f:
+                prefix, sep, description = line.strip().partition("=")
+                if sep:
+                    table[prefix] = description.replace('"', "")
+    except FileNotFoundError:
+        pass
+    return table
+
+
+def _head(path, count, files=None):
+    """First `count` rows of a listing, split on tabs (all rows for None)"""
+    rows = []
+    try:
+        with _lines(path, files) as f:
+            for line in f:
+                rows.append(line.rstrip("\n").split("\t"))
+                if len(rows) == count:
+                    break
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+class PreviewData:
+    """Category metadata and sample rows for one data/ generation
+
+    `files` ({file name: bytes}) takes precedence over the files in
+    `data_dir`, so the generator can render previews of a generation before
+    publishing it.
+    """
+
+    def __init__(self, data_dir, files=None):
+        self.data_dir = Path(data_dir)
+        self.generation = self.data_dir.resolve()
+
+        with _lines(self.data_dir / "categories.json", files) as f:
+            categories = json.load(f)["categories"]
+
+        self.categories = {cat["name"]: cat for cat in categories}
+        self.samples = {
+            cat["name"]: _head(self.data_dir / cat["listing"], SAMPLE_COUNT, files)
+            for cat in categories if cat.get("listing") and not cat.get("dynamic")
+        }
+
+        self.prefixes = _read_abbreviations(self.data_dir / "abbreviation-to-category.txt", files)
+        for cat in categories:
+            prefix = cat.get("icon_name", "").partition("_")[0]
+            if prefix and cat.get("listing") != "wezterm-all-icons.tsv" and not cat.get("dynamic"):
+                self.prefixes.setdefault(prefix, cat["description"])
+
+    def is_stale(self):
+        """True once data/ has been swapped to a newer generation"""
+        return self.data_dir.resolve() != self.generation
+
+
+def render_category(data, full_line):
+    """Preview for a line of the category list ("Name | description (count)")"""
+    category_name = full_line.split(" | ", 1)[0]
+    cat = data.categories.get(category_name)
+    if cat is None:
+        return f"{RED}Category not found: {category_name}{RESET}\n"
+
+    samples = data.samples.get(category_name, [])
+    count = cat["count"]
+    if cat.get("dynamic"):
+        # Rewritten on every copy (Frequent), so read it now rather than at load
+        rows = _head(data.data_dir / cat["listing"], None)
+        samples, count = rows[:SAMPLE_COUNT], len(rows)
+
+    out = [
+        f"{BOLD}{CYAN}╔{BAR}╗{RESET}",
+        f"{BOLD}{CYAN}║{RESET} {BOLD}{BRIGHT_WHITE}{cat.get('icon', '?')}  {category_name}{RESET}",
+        f"{BOLD}{CYAN}╚{BAR}╝{RESET}",
+        "",
+        f"{BOLD}{CYAN}📋 Description:{RESET} {cat['description']}",
+        f"{BOLD}{CYAN}📊 Total Icons:{RESET} {YELLOW}{count}{RESET}",
+        f"{BOLD}{CYAN}📁 Source File:{RESET} {DIM}{cat['file']}{RESET}",
+        "",
+        f"{BOLD}{CYAN}━━━ Sample Icons ━━━{RESET}",
+        "",
+    ]
+    for row in samples:
+        glyph, icon_name = row[0], row[1] if len(row) > 1 else ""
+        out.append(f"{CYAN}{glyph}{RESET}  {DIM}{icon_name.partition('_')[2] or icon_name}{RESET}")
+    out += [
+        "",
+        f"{DIM}{ITALIC}Press ENTER to browse icons • ESC to go back{RESET}",
+    ]
+    return "\n".join(out) + "\n"
+
+
+def render_icon(data, full_line):
+    """Preview for a listing line (glyph<TAB>icon_name<TAB>codepoint)"""
+    fields = full_line.split("\t")
+    glyph = fields[0]
+    icon_name = fields[1] if len(fields) > 1 else ""
+    codepoint = fields[2] if len(fields) > 2 else ""
+    category_name = data.prefixes.get(icon_name.partition("_")[0], "Unknown Category")
+
+    blank = f"{BOLD}{BRIGHT_CYAN}║{RESET}{' ' * 62}{BOLD}{BRIGHT_CYAN}║{RESET}"
+    out = [
+        "",
+        f"{BOLD}{BRIGHT_CYAN}╔{BAR}╗{RESET}",
+        blank,
+        f"{BOLD}{BRIGHT_CYAN}║{RESET}  {category_name:<60}{BOLD}{BRIGHT_CYAN}║{RESET}",
+        blank,
+        f"{BOLD}{BRIGHT_CYAN}╚{BAR}╝{RESET}",
+        "",
+        f"{BOLD}{YELLOW}━━━ Icon Information ━━━{RESET}",
+        "",
+        f"{CYAN}Name:{RESET}       {BRIGHT_WHITE}{icon_name}{RESET}",
+        f"{CYAN}Glyph:{RESET}      {BRIGHT_WHITE}{glyph}{RESET}",
+    ]
+    if codepoint:
+        out.append(f"{CYAN}Codepoint:{RESET}  {BRIGHT_WHITE}U+{codepoint.upper()}{RESET}")
+    out += [
+        "",
+        f"{BOLD}{YELLOW}━━━ Usage ━━━{RESET}",
+        "",
+        f"{DIM}WezTerm Lua:{RESET}",
+        f"  {GREEN}local icon = wt.nerdfonts.{icon_name}{RESET}",
+        "",
+        f"{DIM}Picker (F9):{RESET}",
+        f"  {GREEN}Search for: {icon_name}{RESET}",
+        "",
+        f"{BOLD}{GREEN}━━━ Actions ━━━{RESET}",
+        f"{DIM}{ITALIC}Press ENTER to copy glyph • ESC to go back{RESET}",
+    ]
+    return "\n".join(out) + "\n"
+
+
+RENDERERS = {
+    "category": render_category,
+    "icon": render_icon,
+}
+
+
+def render(data, mode, item):
+    renderer = RENDERERS.get(mode)
+    if renderer is None:
+        return f"Invalid mode: {mode}\n"
+    return renderer(data, item)
@@ -0,0 +1,165 @@
+"""Pre-rendered previews: one packed blob plus a fixed-width offset index
+
+The generator renders every icon and category preview (nfbrowser/preview.py)
+into data/previews.bin and writes data/previews.idx, fixed-width text so
+that preview-packed.sh can use it without parsing:
+
+    header   "NFPV <version> <entry count>", space padded     16 bytes
+    entry    "<offset> <length>\n", zero padded to 11 digits  24 bytes
+
+Entry `n` belongs to stable id `n`, so a lookup is one seek into the index
+and one into the blob; a length of 0 means the id has no preview (a retired
+icon, or the dynamic Frequent category). Ids come from data/icon-ids.tsv
+(`key<TAB>id`, icons keyed by name and categories by "category:<name>"):
+keys keep their id across generations and new keys get the next free one,
+so an fzf line carrying an id from an older listing still finds its icon.
+Listings carry the id as a hidden fourth column and category list lines
+after a tab.
+"""
+
+from . import preview
+
+BLOB_FILE = "previews.bin"
+INDEX_FILE = "previews.idx"
+IDS_FILE = "icon-ids.tsv"
+
+MAGIC = "NFPV"
+VERSION = 1
+HEADER_SIZE = 16
+ENTRY_SIZE = 24
+
+
+def category_key(name):
+    return f"category:{name}"
+
+
+def read_ids(path):
+    """{key: id} from an icon-ids.tsv, empty if there is none yet"""
+    ids = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                key, sep, value = line.rstrip("\n").rpartition("\t")
+                if sep and value.isdigit():
+                    ids[key] = int(value)
+    except FileNotFoundError:
+        pass
+    return ids
+
+
+def assign_ids(previous, keys):
+    """`previous` plus the next free id for every key it lacks (in `keys` order)
+
+    Retired keys keep their id, so an icon that comes back gets its old one.
+    """
+    ids = dict(previous)
+    next_id = max(ids.values(), default=-1) + 1
+    for key in keys:
+        if key not in ids:
+            ids[key] = next_id
+            next_id += 1
+    return ids
+
+
+def render_ids(ids):
+    return "".join(f"{key}\t{value}\n" for key, value in sorted(ids.items(), key=lambda item: item[1]))
+
+
+def pack(data, rows, ids, cache=None):
+    """(blob, index) bytes for every category of `data` and every listing row in `rows`
+
+    `rows` are listing lines (glyph<TAB>name<TAB>codepoint<TAB>id). `cache`
+    keeps this run's previews for the next one, so --watch only renders the
+    icons and categories that changed, and returns the previous pack as is
+    when nothing it is made from changed. Changed previews are appended to
+    the previous blob and their index entries patched; the pack is laid out
+    afresh once the blob is more than twice the size of what it holds.
+    """
+    cache = {} if cache is None else cache
+    key = (rows, data.categories, data.samples, data.prefixes, ids)
+    packed = cache.get("packed")
+    if packed is not None and packed[0] == key:
+        return packed[1]
+
+    previews, changed = {}, {}
+    previous_categories, categories = cache.get("categories", {}), {}
+    for name, cat in data.categories.items():
+        if not cat.get("dynamic"):
+            category_source = (cat, data.samples.get(name))
+            text = previous_categories.get(name, (None, None))
+            if text[0] != category_source:
+                text = (category_source, preview.render_category(data, f"{name} | ").encode("utf-8"))
+                changed[ids[category_key(name)]] = text[1]
+            categories[name] = text
+            previews[ids[category_key(name)]] = text[1]
+    for name in previous_categories.keys() - categories.keys():
+        changed[ids[category_key(name)]] = b""
+
+    # Icon previews only depend on their row and the prefix table: render the rows that are new
+    new_rows = set(rows)
+    previous = cache.get("icons")
+    incremental = previous is not None and previous[0] == data.prefixes
+    if incremental:
+        _prefixes, old_rows, icons = previous
+        icons = dict(icons)
+        for row in old_rows - new_rows:
+            entry_id = ids.get(row.split("\t", 2)[1])
+            if icons.pop(entry_id, None) is not None:
+                changed[entry_id] = b""
+        pending = new_rows - old_rows
+    else:
+        icons, pending = {}, rows
+    for row in pending:
+        entry_id = ids[row.split("\t", 2)[1]]
+        icons[entry_id] = changed[entry_id] = preview.render_icon(data, row).encode("utf-8")
+    previews.update(icons)
+
+    count = max(ids.values(), default=-1) + 1
+    layout = cache.get("layout")
+    if incremental and layout is not None and layout[2] == count:
+        blob, index, _count, live = layout
+        index = bytearray(index)
+        chunks = [blob]
+        offset = len(blob)
+        for entry_id, text in changed.items():
+            position = HEADER_SIZE + entry_id * ENTRY_SIZE
+            live += len(text) - int(index[position + 12:position + 23])
+            entry = f"{offset if text else 0:011d} {len(text):011d}\n"
+            index[position:position + ENTRY_SIZE] = entry.encode("ascii")
+            chunks.append(text)
+            offset += len(text)
+        blob = b"".join(chunks)
+        if len(blob) <= 2 * live:
+            result = blob, bytes(index)
+            cache.update(packed=(key, result), categories=categories, icons=(data.prefixes, new_rows, icons),
+                         layout=(blob, result[1], count, live))
+            return result
+
+    entries = ["00000000000 00000000000\n"] * count
+    chunks = []
+    offset = 0
+    for entry_id in sorted(previews):
+        text = previews[entry_id]
+        entries[entry_id] = f"{offset:011d} {len(text):011d}\n"
+        chunks.append(text)
+        offset += len(text)
+    header = f"{MAGIC} {VERSION} {count}".ljust(HEADER_SIZE - 1) + "\n"
+    result = b"".join(chunks), (header + "".join(entries)).encode("ascii")
+    cache.update(packed=(key, result), categories=categories, icons=(data.prefixes, new_rows, icons),
+                 layout=(result[0], result[1], count, offset))
+    return result
+
+
+def read(data_dir, entry_id):
+    """Pre-rendered preview bytes for `entry_id`, or None"""
+    with open(data_dir / INDEX_FILE, "rb") as f:
+        magic, version, count = f.read(HEADER_SIZE).split()
+        if magic.decode() != MAGIC or int(version) != VERSION or not 0 <= entry_id < int(count):
+            return None
+        f.seek(HEADER_SIZE + entry_id * ENTRY_SIZE)
+        offset, length = map(int, f.read(ENTRY_SIZE).split())
+    if not length:
+        return None
+    with open(data_dir / BLOB_FILE, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
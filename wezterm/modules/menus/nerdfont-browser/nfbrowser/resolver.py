@@ -0,0 +1,220 @@
+"""Offline nerd font name -> codepoint resolver
+
+Builds the same table WezTerm exposes as ``wezterm.nerdfonts`` without
+starting WezTerm. Two local sources are supported:
+
+* a nerd-fonts ``glyphnames.json`` (a copy is vendored next to the scripts)
+* the cmap/post tables of an installed, patched Nerd Font file
+
+Names are returned in WezTerm's spelling (``md_cloud_download``), values are
+integer codepoints.
+"""
+
+import json
+import os
+import re
+import struct
+from pathlib import Path
+
+from . import SCRIPT_DIR
+
+HOME = Path.home()
+VENDORED_GLYPHNAMES = SCRIPT_DIR / "glyphnames.json"
+
+FONT_DIRS = [
+    HOME / ".local/share/fonts",
+    HOME / ".fonts",
+    Path("/usr/local/share/fonts"),
+    Path("/usr/share/fonts"),
+]
+
+# Glyph names inside patched fonts look like "nf-md-cloud_download"
+FONT_GLYPH_NAME = re.compile(r"^nf-([a-z]+)-(.+)$")
+
+
+def wezterm_name(key):
+    """Convert a nerd-fonts key ("md-cloud_download") to WezTerm's "md_cloud_download" """
+    return key.replace("-", "_")
+
+
+def load_glyphnames(path):
+    """Read a nerd-fonts glyphnames.json into {name: codepoint}"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    table = {}
+    for key, entry in data.items():
+        if key == "METADATA":
+            continue
+        table[wezterm_name(key)] = int(entry["code"], 16)
+    return table
+
+
+def _sfnt_tables(blob):
+    """Return {tag: (offset, length)} for a TrueType/OpenType font"""
+    (num_tables,) = struct.unpack_from(">H", blob, 4)
+    tables = {}
+    for i in range(num_tables):
+        tag, _checksum, offset, length = struct.unpack_from(">4sIII", blob, 12 + 16 * i)
+        tables[tag.decode("latin-1")] = (offset, length)
+    return tables
+
+
+def _cmap_format4(blob, offset):
+    seg_count = struct.unpack_from(">H", blob, offset + 6)[0] // 2
+    ends_at = offset + 14
+    starts_at = ends_at + 2 * seg_count + 2
+    deltas_at = starts_at + 2 * seg_count
+    ranges_at = deltas_at + 2 * seg_count
+
+    ends = struct.unpack_from(f">{seg_count}H", blob, ends_at)
+    starts = struct.unpack_from(f">{seg_count}H", blob, starts_at)
+    deltas = struct.unpack_from(f">{seg_count}h", blob, deltas_at)
+    ranges = struct.unpack_from(f">{seg_count}H", blob, ranges_at)
+
+    mapping = {}
+    for seg in range(seg_count):
+        if starts[seg] == 0xFFFF:
+            continue
+        for cp in range(starts[seg], ends[seg] + 1):
+            if ranges[seg] == 0:
+                gid = (cp + deltas[seg]) & 0xFFFF
+            else:
+                at = ranges_at + 2 * seg + ranges[seg] + 2 * (cp - starts[seg])
+                gid = struct.unpack_from(">H", blob, at)[0]
+                if gid:
+                    gid = (gid + deltas[seg]) & 0xFFFF
+            if gid:
+                mapping[cp] = gid
+    return mapping
+
+
+def _cmap_format12(blob, offset):
+    (num_groups,) = struct.unpack_from(">I", blob, offset + 12)
+    mapping = {}
+    for i in range(num_groups):
+        start, end, gid = struct.unpack_from(">III", blob, offset + 16 + 12 * i)
+        for cp in range(start, end + 1):
+            mapping[cp] = gid + cp - start
+    return mapping
+
+
+def _read_cmap(blob, table_offset):
+    """Return {codepoint: glyph_id} from the best unicode subtable"""
+    (num_subtables,) = struct.unpack_from(">H", blob, table_offset + 2)
+    subtables = {}
+    for i in range(num_subtables):
+        platform, encoding, offset = struct.unpack_from(">HHI", blob, table_offset + 4 + 8 * i)
+        subtables[(platform, encoding)] = table_offset + offset
+
+    # Prefer full-repertoire (format 12) subtables, nerd font glyphs live above U+FFFF
+    for key in ((3, 10), (0, 4), (0, 6), (3, 1), (0, 3)):
+        if key not in subtables:
+            continue
+        offset = subtables[key]
+        (fmt,) = struct.unpack_from(">H", blob, offset)
+        if fmt == 12:
+            return _cmap_format12(blob, offset)
+        if fmt == 4:
+            return _cmap_format4(blob, offset)
+    return {}
+
+
+def _read_post_names(blob, table_offset, table_length):
+    """Return {glyph_id: name} for custom names in a format 2.0 post table"""
+    (version,) = struct.unpack_from(">I", blob, table_offset)
+    if version != 0x00020000:
+        return {}
+
+    (num_glyphs,) = struct.unpack_from(">H", blob, table_offset + 32)
+    indices = struct.unpack_from(f">{num_glyphs}H", blob, table_offset + 34)
+
+    # Pascal strings follow the index array; indices >= 258 point into them
+    strings = []
+    at = table_offset + 34 + 2 * num_glyphs
+    end = table_offset + table_length
+    while at < end:
+        length = blob[at]
+        strings.append(blob[at + 1:at + 1 + length].decode("latin-1"))
+        at += 1 + length
+
+    names = {}
+    for gid, index in enumerate(indices):
+        if index >= 258 and index - 258 < len(strings):
+            names[gid] = strings[index - 258]
+    return names
+
+
+def read_cmap(path):
+    """{codepoint: glyph id} of a font file"""
+    blob = Path(path).read_bytes()
+    tables = _sfnt_tables(blob)
+    return _read_cmap(blob, tables["cmap"][0]) if "cmap" in tables else {}
+
+
+def load_font(path):
+    """Read {name: codepoint} from the cmap/post tables of a patched Nerd Font"""
+    blob = Path(path).read_bytes()
+    tables = _sfnt_tables(blob)
+    if "cmap" not in tables or "post" not in tables:
+        return {}
+
+    cmap = _read_cmap(blob, tables["cmap"][0])
+    glyph_names = _read_post_names(blob, *tables["post"])
+
+    table = {}
+    for cp, gid in cmap.items():
+        match = FONT_GLYPH_NAME.match(glyph_names.get(gid, ""))
+        if match:
+            table.setdefault(wezterm_name(f"{match.group(1)}-{match.group(2)}"), cp)
+    return table
+
+
+def find_nerd_font():
+    """Locate an installed Nerd Font, preferring the symbols-only build"""
+    candidates = []
+    for font_dir in FONT_DIRS:
+        if not font_dir.is_dir():
+            continue
+        for root, _dirs, files in os.walk(font_dir):
+            for name in files:
+                if name.lower().endswith((".ttf", ".otf")) and "nerdfont" in name.lower().replace(" ", ""):
+                    candidates.append(Path(root) / name)
+
+    candidates.sort(key=lambda p: ("symbols" not in p.name.lower(), "mono" not in p.name.lower(), p.name))
+    return candidates[0] if candidates else None
+
+
+def find_source(glyphnames=None, font=None):
+    """Pick the first usable local source as ("glyphnames"|"font", path) or (None, None)
+
+    Order: explicit/`NERDFONT_GLYPHNAMES` glyphnames.json, explicit/`NERDFONT_FONT`
+    font file, vendored glyphnames.json, then any installed Nerd Font.
+    """
+    glyphnames = glyphnames or os.environ.get("NERDFONT_GLYPHNAMES")
+    font = font or os.environ.get("NERDFONT_FONT")
+
+    if glyphnames:
+        return "glyphnames", Path(glyphnames)
+    if font:
+        return "font", Path(font)
+    if VENDORED_GLYPHNAMES.exists():
+        return "glyphnames", VENDORED_GLYPHNAMES
+
+    installed = find_nerd_font()
+    if installed:
+        return "font", installed
+    return None, None
+
+
+def load_table(glyphnames=None, font=None):
+    """Build the name -> codepoint table from the first usable local source
+
+    Returns (table, source description), see `find_source` for the order.
+    """
+    kind, path = find_source(glyphnames, font)
+    if kind == "glyphnames":
+        return load_glyphnames(path), str(path)
+    if kind == "font":
+        return load_font(path), str(path)
+    return {}, "none"
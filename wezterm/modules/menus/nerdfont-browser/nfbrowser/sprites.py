@@ -0,0 +1,174 @@
+"""Large-glyph PNG sprites for the preview pane (optional, needs Pillow)
+
+Glyphs are rasterised from a local Nerd Font at every size in SIZES, so
+similar icons can be told apart in the preview. Sprites are
+content-addressed: they live under
+
+    .data/sprites/<font digest>/<codepoint hex>-<size>.png
+
+so a different font (or font version) never reuses stale images and icons
+sharing a codepoint share a sprite. The generator writes the digest of the
+font in use to data/sprites.font; preview-packed.sh builds the path from it
+and the listing row and shows the sprite through the kitty graphics
+protocol (kitty, WezTerm).
+
+MAX_CACHE_BYTES bounds all sprites on disk, the current font's included.
+`render()` only rasterises missing sprites, in a process pool, and no more
+than the current font's share of the budget holds, so sprites evicted
+from a full cache are not rendered again on every run. `evict()` then
+deletes other fonts' sprites first and the current font's least recently
+used ones (by access or render time) after them until everything fits.
+preview-packed.sh shows no sprite where none is cached.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from . import SCRIPT_DIR, datadir
+from .resolver import read_cmap
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Sprites are optional
+    Image = None
+
+CACHE_DIR = SCRIPT_DIR / ".data" / "sprites"
+FONT_FILE = "sprites.font"
+SIZES = (32, 64, 128)
+# Disk space for all sprites. One font's full set is ~31k sprites (10.4k codepoints x 3 sizes): ~26 MiB of PNG,
+# ~122 MiB on disk in 4 KiB blocks, so the default holds one full set and little else.
+MAX_CACHE_BYTES = 128 * 1024 * 1024
+COLOR = (205, 214, 244, 255)  # fzf fg (#cdd6f4)
+GLYPH_SCALE = 0.85  # Glyph box relative to the sprite, leaves a margin
+
+_fonts = {}
+
+
+def available():
+    return Image is not None
+
+
+def font_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def sprite_path(cache_dir, digest, codepoint, size):
+    return cache_dir / digest / f"{codepoint:x}-{size}.png"
+
+
+def _load_fonts(font_path):
+    _fonts.clear()
+    for size in SIZES:
+        _fonts[size] = ImageFont.truetype(str(font_path), int(size * GLYPH_SCALE))
+
+
+def rasterise(codepoint, size):
+    """PNG bytes of one glyph centred in a size x size transparent square"""
+    font = _fonts[size]
+    char = chr(codepoint)
+    left, top, right, bottom = font.getbbox(char)
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    x = (size - (right - left)) / 2 - left
+    y = (size - (bottom - top)) / 2 - top
+    ImageDraw.Draw(image).text((x, y), char, font=font, fill=COLOR)
+    out = BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+
+def _render_batch(work):
+    """Worker: write the sprites for [(codepoint, size, path)]"""
+    for codepoint, size, path in work:
+        datadir.write_atomic(path, rasterise(codepoint, size))
+
+
+def disk_usage(directory):
+    """(files, bytes on disk) under `directory`"""
+    files = used = 0
+    for entry in os.scandir(directory):
+        try:
+            # Sprites are a few KiB each, so the blocks they occupy are what fills the disk
+            used += entry.stat().st_blocks * 512
+        except FileNotFoundError:
+            continue
+        files += 1
+    return files, used
+
+
+def render(font_path, codepoints, cache_dir=CACHE_DIR, jobs=None, batch=256, max_bytes=MAX_CACHE_BYTES):
+    """Rasterise missing sprites for `codepoints`; returns (font digest, rendered, cached, over budget)
+
+    Codepoints the font has no glyph for are skipped, and so are sprites
+    beyond what `max_bytes` leaves room for (estimated from the sprites
+    already on disk, or one filesystem block each).
+    """
+    digest = font_digest(font_path)
+    directory = cache_dir / digest
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = set(os.listdir(directory))
+    covered = read_cmap(font_path)
+
+    pending, cached = [], []
+    for codepoint in sorted(set(codepoints)):
+        if codepoint not in covered:
+            continue
+        for size in SIZES:
+            path = sprite_path(cache_dir, digest, codepoint, size)
+            (cached if path.name in existing else pending).append((codepoint, size, path))
+
+    files, used = disk_usage(directory)
+    per_sprite = used // files if files else os.statvfs(directory).f_bsize
+    room = max(0, (max_bytes - used) // max(per_sprite, 1))
+    pending, skipped = pending[:room], len(pending) - min(room, len(pending))
+
+    if pending:
+        batches = [pending[i:i + batch] for i in range(0, len(pending), batch)]
+        if jobs == 1 or len(batches) == 1:
+            _load_fonts(font_path)
+            for work in batches:
+                _render_batch(work)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_load_fonts, initargs=(font_path,)) as pool:
+                list(pool.map(_render_batch, batches))
+    return digest, len(pending), len(cached), skipped
+
+
+def evict(keep, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Delete sprites until all of them fit in `max_bytes`; returns (files, bytes) removed
+
+    Sprites of fonts other than `keep` (the digest of the font in use) go
+    first, then the font in use's least recently used ones.
+    """
+    entries = []
+    total = 0
+    kept = os.path.join(cache_dir, keep)
+    for directory, _dirs, files in os.walk(cache_dir):
+        current = directory == kept
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            size = stat.st_blocks * 512
+            entries.append((current, max(stat.st_atime, stat.st_mtime), size, path))
+            total += size
+
+    removed = freed = 0
+    for _current, _used, size, path in sorted(entries):
+        if total - freed <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        removed += 1
+        freed += size
+
+    for entry in os.scandir(cache_dir) if cache_dir.exists() else ():
+        if entry.is_dir() and not os.listdir(entry.path):
+            os.rmdir(entry.path)
+    return removed, freed
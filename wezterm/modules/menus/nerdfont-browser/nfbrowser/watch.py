@@ -0,0 +1,131 @@
+"""Minimal inotify file watcher (ctypes, no dependencies)
+
+Files are watched through their parent directories so that editors which
+save by writing a temp file and renaming it over the original are seen
+too. `Watcher.changes()` yields one set of changed paths per burst of
+events: as soon as every changed file has been closed after writing or
+renamed into place (plus a few ms for events of the same save), or once
+no further event arrived for the debounce interval.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+# IN_MODIFY is left out on purpose: a write is reported once it is closed
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB | IN_ONLYDIR
+# Events after which a file is complete, as opposed to created or re-chmodded
+COMPLETE_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+EVENT = struct.Struct("iIII")
+DEBOUNCE = 0.025
+SETTLE = 0.002
+
+
+def _libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class Watcher:
+    """Watch a set of files; `ALL` in a change set means events were lost"""
+
+    ALL = Path("*")
+
+    def __init__(self, paths):
+        self._libc = _libc()
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+
+        self._dirs = {}  # watch descriptor -> directory
+        self._files = {}  # directory -> {file name: path as given}
+        for path in map(Path, paths):
+            self._files.setdefault(path.parent, {})[path.name] = path
+
+        self.missing = []
+        for directory in self._files:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                self.missing.append(directory)
+                continue
+            self._dirs[wd] = directory
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _read(self):
+        """(changed, complete) paths from the events queued right now"""
+        changed, complete = set(), set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed, complete
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+
+            at = 0
+            while at + EVENT.size <= len(buf):
+                wd, mask, _cookie, length = EVENT.unpack_from(buf, at)
+                name = buf[at + EVENT.size:at + EVENT.size + length].rstrip(b"\0")
+                at += EVENT.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(self.ALL)
+                    complete.add(self.ALL)
+                    continue
+                if mask & IN_IGNORED:
+                    continue
+                directory = self._dirs.get(wd)
+                path = self._files.get(directory, {}).get(os.fsdecode(name))
+                if path is not None:
+                    changed.add(path)
+                    if mask & COMPLETE_MASK:
+                        complete.add(path)
+
+    def changes(self, debounce=DEBOUNCE, settle=SETTLE):
+        """Yield (set of changed paths, seconds spent debouncing) forever"""
+        while True:
+            select.select([self._fd], [], [])
+            first = time.perf_counter()
+            changed, complete = self._read()
+            while True:
+                # Saves are bursts of microseconds; only wait out the window while a file is still open
+                wait = settle if changed <= complete else debounce
+                ready, _, _ = select.select([self._fd], [], [], wait)
+                if not ready:
+                    break
+                more, done = self._read()
+                changed |= more
+                complete |= done
+            if changed:
+                yield changed, time.perf_counter() - first
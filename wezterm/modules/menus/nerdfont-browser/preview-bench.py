@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark preview latency: packed previews vs the original wezterm-preview.sh
+
+Runs every preview the way fzf does (one process per cursor move) and
+reports p50/p99 per method, icon and category previews separately. The
+reference is wezterm-preview.sh as of the baseline commit (BASELINE, read
+with `git show`), not the current one, which has since been sped up itself.
+Checks that the packed output is byte-identical to nfbrowser/preview.py:
+
+    preview-bench.py                           every icon in All Icons and every category
+    preview-bench.py --sample 500              evenly spaced subset of the icons
+    preview-bench.py --baseline HEAD~5         another reference revision
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from nfbrowser import SCRIPT_DIR, preview, previewpack
+
+DATA_DIR = SCRIPT_DIR / "data"
+
+# Last commit before the preview work
+BASELINE = "a0206ca"
+
+METHODS = {
+    "preview-packed.sh": [str(SCRIPT_DIR / "preview-packed.sh")],
+    "wezterm-preview.sh": [str(SCRIPT_DIR / "wezterm-preview.sh")],
+}
+
+
+def category_lines(data_dir):
+    """Category list lines as wezterm-browser.sh prints them (dynamic categories have no id)"""
+    with open(data_dir / "categories.json", encoding="utf-8") as f:
+        categories = json.load(f)["categories"]
+    return [
+        f"{cat['name']} | {cat['description']} ({cat['count']})\t{cat.get('id', '')}"
+        for cat in categories if not cat.get("dynamic")
+    ]
+
+
+def baseline_script(revision):
+    """wezterm-preview.sh at `revision`, written next to the current one (it reads SCRIPT_DIR/data)"""
+    source = subprocess.run(
+        ["git", "-C", str(SCRIPT_DIR), "show", f"{revision}:./wezterm-preview.sh"],
+        stdout=subprocess.PIPE, check=True,
+    ).stdout
+    fd, path = tempfile.mkstemp(prefix=".preview-baseline-", suffix=".sh", dir=SCRIPT_DIR)
+    with os.fdopen(fd, "wb") as f:
+        f.write(source)
+    os.chmod(path, 0o755)
+    return path
+
+
+def baseline_line(mode, line):
+    """`line` as the baseline browser printed it: "glyph  icon_name" and categories without the id"""
+    if mode == "icon":
+        glyph, name = line.split("\t")[:2]
+        return f"{glyph}  {name}"
+    return line.partition("\t")[0]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run(command, mode, lines):
+    """([latency ms], [output bytes]) for one process per line"""
+    latencies, outputs = [], []
+    env = {**os.environ, "NERDFONT_SPRITES": "0"}  # Text only, comparable with the renderer
+    # Untimed first run: page cache, and nothing else pays for it in fzf either
+    subprocess.run([*command, mode, lines[0]], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    for line in lines:
+        start = time.perf_counter()
+        result = subprocess.run([*command, mode, line], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+        latencies.append((time.perf_counter() - start) * 1000)
+        outputs.append(result.stdout)
+    return latencies, outputs
+
+
+def in_process(data_dir, mode, lines):
+    """Latencies of the pack lookup alone, without process start-up"""
+    latencies = []
+    data_dir = data_dir.resolve()
+    for line in lines:
+        fields = line.split("\t")
+        entry_id = int(fields[3] if mode == "icon" else fields[-1])
+        start = time.perf_counter()
+        previewpack.read(data_dir, entry_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarise(latencies):
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "max_ms": round(max(latencies), 3),
+    }
+
+
+def bench_mode(methods, reference, data, mode, lines):
+    """(report, mismatching lines) for one preview mode; `reference` gets the lines in the baseline format"""
+    results, outputs = {}, {}
+    for name, command in methods.items():
+        print(f"… {name}: {len(lines)} {mode} previews", file=sys.stderr)
+        method_lines = [baseline_line(mode, line) for line in lines] if name == reference else lines
+        results[name], outputs[name] = run(command, mode, method_lines)
+    results["previewpack.read (in-process)"] = in_process(data.data_dir, mode, lines)
+
+    mismatches = [
+        line for line, packed in zip(lines, outputs["preview-packed.sh"])
+        if packed != preview.render(data, mode, line).encode("utf-8")
+    ]
+    return {name: summarise(latencies) for name, latencies in results.items()}, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listing", default="wezterm-all-icons.tsv", help="Listing whose icons to preview")
+    parser.add_argument("--sample", type=int, help="Only preview this many evenly spaced icons")
+    parser.add_argument("--baseline", default=BASELINE, help=f"Revision of the reference script (default {BASELINE})")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    # All scripts read SCRIPT_DIR/data, so that is what gets benchmarked
+    data_dir = DATA_DIR
+    if not (data_dir / previewpack.INDEX_FILE).exists():
+        print(f"Error: no packed previews in {data_dir}", file=sys.stderr)
+        print(f"Run: python3 {SCRIPT_DIR}/generate-wezterm-data.py", file=sys.stderr)
+        return 1
+
+    with open(data_dir / args.listing, encoding="utf-8") as f:
+        icons = [line.rstrip("\n") for line in f if line.strip()]
+    if args.sample and args.sample < len(icons):
+        step = len(icons) / args.sample
+        icons = [icons[int(i * step)] for i in range(args.sample)]
+
+    reference = f"wezterm-preview.sh@{args.baseline}"
+    try:
+        baseline = baseline_script(args.baseline)
+    except subprocess.CalledProcessError:
+        print(f"Error: cannot read wezterm-preview.sh at {args.baseline}", file=sys.stderr)
+        return 1
+    try:
+        methods = {reference: [baseline], **METHODS}
+        data = preview.PreviewData(data_dir)
+        modes = {mode: bench_mode(methods, reference, data, mode, lines)
+                 for mode, lines in (("icon", icons), ("category", category_lines(data_dir)))}
+    finally:
+        os.unlink(baseline)
+
+    if args.json:
+        print(json.dumps({
+            "baseline": args.baseline,
+            "modes": {mode: {"results": report, "mismatches": len(mismatches)}
+                      for mode, (report, mismatches) in modes.items()},
+        }, indent=2))
+    for mode, (report, mismatches) in modes.items():
+        if not args.json:
+            print(f"\n{mode} previews\n{'method':<32} {'p50':>9} {'p99':>9} {'mean':>9} {'max':>9}")
+            for name, stats in report.items():
+                print(f"{name:<32} {stats['p50_ms']:>7.2f}ms {stats['p99_ms']:>7.2f}ms "
+                      f"{stats['mean_ms']:>7.2f}ms {stats['max_ms']:>7.2f}ms")
+            shell, packed = report[reference], report["preview-packed.sh"]
+            count = packed["count"]
+            print(f"preview-packed.sh: p50 {shell['p50_ms'] / packed['p50_ms']:.1f}x, "
+                  f"p99 {shell['p99_ms'] / packed['p99_ms']:.1f}x faster than {reference}; "
+                  f"{len(mismatches)} of {count} outputs differ")
+        for line in mismatches[:5]:
+            print(f"  differs: {line!r}", file=sys.stderr)
+    return 1 if any(mismatches for _report, mismatches in modes.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
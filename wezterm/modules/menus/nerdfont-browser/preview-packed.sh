@@ -0,0 +1,67 @@
+#!/usr/bin/env bash
+# fzf --preview for lines that carry a preview id (listings, category list)
+# Prints the pre-rendered preview from data/previews.{idx,bin} with one seek
+# into each (see nfbrowser/previewpack.py); anything else goes through
+# wezterm-preview.sh. No jq, no grep, no formatting.
+
+MODE="${1:-category}"
+ITEM="${2:-}"
+# Resolved without forking; must stay valid after the cd below
+SCRIPT_DIR="${BASH_SOURCE[0]%/*}"
+[[ "$SCRIPT_DIR" == "${BASH_SOURCE[0]}" ]] && SCRIPT_DIR="."
+[[ "$SCRIPT_DIR" == /* ]] || SCRIPT_DIR="$PWD/$SCRIPT_DIR"
+
+fallback() {
+    exec "$SCRIPT_DIR/wezterm-preview.sh" "$MODE" "$ITEM"
+}
+
+# Large glyph sprite (nfbrowser/sprites.py) through the kitty graphics protocol,
+# which kitty and WezTerm understand; NERDFONT_SPRITES=0/1 overrides detection
+show_sprite() {
+    case "${NERDFONT_SPRITES:-auto}" in
+        0) return 0 ;;
+        1) ;;
+        *) [[ -n "${KITTY_WINDOW_ID:-}" || "${TERM_PROGRAM:-}" == "WezTerm" ]] || return 0 ;;
+    esac
+
+    local digest codepoint size=128 rows=8
+    read -r digest <sprites.font 2>/dev/null || return 0
+    IFS=$'\t' read -r _ _ codepoint _ <<<"$ITEM"
+    ((${FZF_PREVIEW_LINES:-40} >= 30)) || size=64 rows=4
+    ((${FZF_PREVIEW_LINES:-40} >= 16)) || size=32 rows=2
+
+    local sprite="$SCRIPT_DIR/.data/sprites/$digest/$codepoint-$size.png"
+    [[ -n "$codepoint" && -f "$sprite" ]] || return 0
+
+    # PNG payload in 4096 byte base64 chunks; only rows are given, width keeps the aspect ratio
+    local data chunk keys="f=100,a=T,r=$rows,"
+    data=$(base64 -w0 "$sprite")
+    echo
+    while [[ -n "$data" ]]; do
+        chunk="${data:0:4096}" data="${data:4096}"
+        printf '\e_G%sm=%d;%s\e\\' "$keys" "$((${#data} > 0))" "$chunk"
+        keys=""
+    done
+    echo
+}
+
+# Listing: glyph<TAB>icon_name<TAB>codepoint<TAB>id, category: "Name | desc (count)<TAB>id"
+id=""
+case "$MODE" in
+    icon) IFS=$'\t' read -r _ _ _ id _ <<<"$ITEM" ;;
+    category) [[ "$ITEM" == *$'\t'* ]] && id="${ITEM##*$'\t'}" ;;
+esac
+[[ "$id" =~ ^[0-9]+$ ]] || fallback
+
+# Pin one generation: data/ may be swapped while we read
+cd -P -- "$SCRIPT_DIR/data" 2>/dev/null || fallback
+read -r magic version count _ <previews.idx 2>/dev/null || fallback
+[[ "$magic" == "NFPV" && "$version" == "1" ]] && ((id < count)) || fallback
+
+entry=$(dd if=previews.idx iflag=skip_bytes,count_bytes skip=$((16 + id * 24)) count=24 status=none)
+read -r offset length <<<"$entry"
+[[ "$offset" =~ ^[0-9]+$ && "$length" =~ ^[0-9]+$ ]] && ((10#$length > 0)) || fallback
+
+dd if=previews.bin iflag=skip_bytes,count_bytes skip=$((10#$offset)) count=$((10#$length)) bs=64K status=none
+[[ "$MODE" == "icon" ]] && show_sprite
+exit 0
@@ -23,27 +23,18 @@ if [[ ! -f "$CATEGORIES_FILE" ]]; then
     exit 1
 fi
 
-# Get WezTerm nerdfonts icon by name
-get_icon() {
-    local name="$1"
-    # Use WezTerm to render the icon
-    wezterm -n --config "$(cat <<EOF
-local wezterm = require('wezterm')
-local nf = wezterm.nerdfonts
-local icon = nf.$name or "?"
-wezterm.log_info(icon)
-print(icon)
-return {}
-EOF
-)" 2>&1 | grep -v '^[0-9]' | tail -1 || echo "?"
-}
-
 # Browse categories
 browse_categories() {
-    jq -r '.categories[] | "\(.name)|\(.icon_name)|\(.description)|\(.count)"' "$CATEGORIES_FILE" |
-        while IFS='|' read -r name icon_name desc count; do
-            # Use | as delimiter so we can extract exact name
-            printf "%s | %s (%d)\n" "$name" "$desc" "$count"
+    jq -r '.categories[] | "\(.name)|\(.icon_name)|\(.description)|\(.count)|\(.listing)|\(.dynamic // false)|\(.id // "")"' "$CATEGORIES_FILE" |
+        while IFS='|' read -r name icon_name desc count listing dynamic id; do
+            # Dynamic listings (Frequent) are rewritten between generations: count live, hide when empty
+            if [[ "$dynamic" == "true" ]]; then
+                [[ "$listing" == /* ]] || listing="$DATA_DIR/$listing"
+                count=$(wc -l 2>/dev/null <"$listing" || echo 0)
+                [[ "$count" -gt 0 ]] || continue
+            fi
+            # Use | as delimiter so we can extract exact name; the hidden id keys the packed preview
+            printf "%s | %s (%d)\t%s\n" "$name" "$desc" "$count" "$id"
         done |
         fzf \
             --ansi \
@@ -54,10 +45,11 @@ browse_categories() {
             --prompt="Category ❯ " \
             --pointer="▶" \
             --marker="✓" \
-            --delimiter=' | ' \
+            --delimiter=' \| |\t' \
             --with-nth=1,2 \
-            --header=$'Navigate: ↑↓ PageUp/PageDown | Select: Enter | Quit: Esc\n─────────────────────────────────────────' \
-            --preview="$SCRIPT_DIR/wezterm-preview.sh category {}" \
+            --expect=ctrl-s \
+            --header=$'Navigate: ↑↓ PageUp/PageDown | Select: Enter | Search all: Ctrl-S | Quit: Esc\n─────────────────────────────────────────' \
+            --preview="$SCRIPT_DIR/preview-packed.sh category {}" \
             --preview-window=right:60%:wrap:rounded \
             --color="bg+:#313244,bg:#1e1e2e,spinner:#f5e0dc,hl:#f38ba8" \
             --color="fg:#cdd6f4,header:#f38ba8,info:#cba6f7,pointer:#f5e0dc" \
@@ -69,53 +61,92 @@ browse_categories() {
 # Browse icons within a category
 browse_icons() {
     local category_name="$1"
-    local file_name="$2"
-    local file_path="$DATA_DIR/$file_name"
-    local mapping_file="$DATA_DIR/icon-name-to-glyph.txt"
+    local listing_name="$2"
+    local listing_path="$DATA_DIR/$listing_name"
+    # Frequent lives outside data/ (nfbrowser/frecency.py)
+    [[ "$listing_name" == /* ]] && listing_path="$listing_name"
+
+    if [[ ! -f "$listing_path" ]]; then
+        echo "Error: File not found: $listing_path" >&2
+        echo "Run: python3 $SCRIPT_DIR/generate-wezterm-data.py" >&2
+        return 1
+    fi
+
+    # Listing is pre-joined by the generator: glyph<TAB>icon_name<TAB>codepoint<TAB>preview id
+    fzf <"$listing_path" \
+        --ansi \
+        --height=100% \
+        --layout=reverse \
+        --border=rounded \
+        --delimiter=$'\t' \
+        --with-nth=1,2 \
+        --tabstop=3 \
+        --border-label="╣ $category_name ╠" \
+        --prompt="Icon ❯ " \
+        --pointer="▶" \
+        --marker="✓" \
+        --header=$'Select: Enter (copy) | Back: Esc/Alt+← | Preview: Ctrl-/ | PageUp/PageDown\n─────────────────────────────────────────' \
+        --preview="$SCRIPT_DIR/preview-packed.sh icon {}" \
+        --preview-window=right:60%:wrap:rounded \
+        --color="bg+:#313244,bg:#1e1e2e,spinner:#f5e0dc,hl:#f38ba8" \
+        --color="fg:#cdd6f4,header:#f38ba8,info:#cba6f7,pointer:#f5e0dc" \
+        --color="marker:#f5e0dc,fg+:#cdd6f4,prompt:#cba6f7,hl+:#f38ba8" \
+        --color="border:#89b4fa,label:#89b4fa,query:#cdd6f4" \
+        --bind="ctrl-/:toggle-preview" \
+        --bind="alt-left:abort" \
+        --bind="enter:execute-silent($SCRIPT_DIR/copy-icon.sh {})+accept"
+}
 
-    if [[ ! -f "$file_path" ]]; then
-        echo "Error: File not found: $file_path" >&2
+# Full-text search across every category via the SQLite catalog
+search_icons() {
+    local search="$SCRIPT_DIR/nerdfont-search.py"
+
+    if [[ ! -f "$DATA_DIR/catalog.sqlite" ]]; then
+        echo "Error: Catalog not found: $DATA_DIR/catalog.sqlite" >&2
+        echo "Run: python3 $SCRIPT_DIR/generate-wezterm-data.py" >&2
         return 1
     fi
 
-    # Read icon names and show glyph + name
-    grep -v '^#' "$file_path" | grep -v '^$' |
-        while read -r icon_name; do
-            # Look up the glyph from mapping file
-            local glyph="?"
-            if [[ -f "$mapping_file" ]]; then
-                glyph=$(grep "^${icon_name}[[:space:]]" "$mapping_file" | cut -f2)
-                [[ -z "$glyph" ]] && glyph="?"
-            fi
-            # Show: glyph  icon_name
-            printf "%s  %s\n" "$glyph" "$icon_name"
-        done |
-        fzf \
-            --ansi \
-            --height=100% \
-            --layout=reverse \
-            --border=rounded \
-            --border-label="╣ $category_name ╠" \
-            --prompt="Icon ❯ " \
-            --pointer="▶" \
-            --marker="✓" \
-            --header=$'Select: Enter (copy) | Back: Esc/Alt+← | Preview: Ctrl-/ | PageUp/PageDown\n─────────────────────────────────────────' \
-            --preview="$SCRIPT_DIR/wezterm-preview.sh icon {}" \
-            --preview-window=right:60%:wrap:rounded \
-            --color="bg+:#313244,bg:#1e1e2e,spinner:#f5e0dc,hl:#f38ba8" \
-            --color="fg:#cdd6f4,header:#f38ba8,info:#cba6f7,pointer:#f5e0dc" \
-            --color="marker:#f5e0dc,fg+:#cdd6f4,prompt:#cba6f7,hl+:#f38ba8" \
-            --color="border:#89b4fa,label:#89b4fa,query:#cdd6f4" \
-            --bind="ctrl-/:toggle-preview" \
-            --bind="alt-left:abort" \
-            --bind="enter:execute-silent($SCRIPT_DIR/copy-icon.sh {})+accept"
+    : | fzf \
+        --disabled \
+        --ansi \
+        --height=100% \
+        --layout=reverse \
+        --border=rounded \
+        --delimiter=$'\t' \
+        --with-nth=1,2 \
+        --tabstop=3 \
+        --border-label="╣ Search All Icons ╠" \
+        --prompt="Search ❯ " \
+        --pointer="▶" \
+        --marker="✓" \
+        --header=$'Type to search names, descriptions and categories | Select: Enter (copy) | Back: Esc\n─────────────────────────────────────────' \
+        --bind="change:reload:$search {q} || true" \
+        --preview="$SCRIPT_DIR/preview-packed.sh icon {}" \
+        --preview-window=right:60%:wrap:rounded \
+        --color="bg+:#313244,bg:#1e1e2e,spinner:#f5e0dc,hl:#f38ba8" \
+        --color="fg:#cdd6f4,header:#f38ba8,info:#cba6f7,pointer:#f5e0dc" \
+        --color="marker:#f5e0dc,fg+:#cdd6f4,prompt:#cba6f7,hl+:#f38ba8" \
+        --color="border:#89b4fa,label:#89b4fa,query:#cdd6f4" \
+        --bind="ctrl-/:toggle-preview" \
+        --bind="alt-left:abort" \
+        --bind="enter:execute-silent($SCRIPT_DIR/copy-icon.sh {})+accept"
 }
 
 # Main loop
 main() {
     while true; do
-        # Browse categories
-        selected=$(browse_categories)
+        # Browse categories (first line is the --expect key, second the selection)
+        result=$(browse_categories)
+        key=$(head -n1 <<<"$result")
+        selected=$(sed -n '2p' <<<"$result")
+
+        if [[ "$key" == "ctrl-s" ]]; then
+            if [[ -n "$(search_icons || true)" ]]; then
+                break
+            fi
+            continue
+        fi
 
         if [[ -z "$selected" ]]; then
             break
@@ -124,9 +155,9 @@ main() {
         # Extract category name (field 1 with delimiter ' | ')
         category_name=$(echo "$selected" | cut -d'|' -f1 | xargs)
 
-        # Get file name from JSON
+        # Get listing file name from JSON
         file_name=$(jq -r --arg name "$category_name" \
-            '.categories[] | select(.name == $name) | .file' "$CATEGORIES_FILE")
+            '.categories[] | select(.name == $name) | .listing // empty' "$CATEGORIES_FILE")
 
         if [[ -z "$file_name" ]]; then
             echo "Error: Could not find file for category: '$category_name'" >&2
@@ -1,5 +1,7 @@
 #!/usr/bin/env bash
 # Preview generator for WezTerm nerd font browser
+# Fallback for preview-packed.sh on lines without a preview id (Frequent,
+# search results); keep the output in sync with nfbrowser/preview.py
 
 set -euo pipefail
 
@@ -66,10 +68,21 @@ show_category_preview() {
     local file=$(echo "$category_info" | jq -r '.file')
     local description=$(echo "$category_info" | jq -r '.description')
     local count=$(echo "$category_info" | jq -r '.count')
-    local icon_name=$(echo "$category_info" | jq -r '.icon_name')
+    local listing=$(echo "$category_info" | jq -r '.listing // empty')
+    # Frequent lives outside data/ (nfbrowser/frecency.py)
+    local listing_path="$DATA_DIR/$listing"
+    [[ "$listing" == /* ]] && listing_path="$listing"
+    local icon=$(echo "$category_info" | jq -r '.icon // empty')
+
+    # Dynamic listings (Frequent) change between generations, count them live
+    if [[ "$(echo "$category_info" | jq -r '.dynamic // false')" == "true" ]]; then
+        count=$(wc -l 2>/dev/null <"$listing_path" || echo 0)
+    fi
 
-    # Get sample icon
-    local icon=$(get_icon "$icon_name")
+    # Older data files only carry the sample name, not its glyph
+    if [[ -z "$icon" ]]; then
+        icon=$(get_icon "$(echo "$category_info" | jq -r '.icon_name')")
+    fi
 
     # Header
     echo -e "${BOLD}${CYAN}╔══════════════════════════════════════════════════════════════╗${RESET}"
@@ -83,21 +96,14 @@ show_category_preview() {
     echo -e "${BOLD}${CYAN}━━━ Sample Icons ━━━${RESET}"
     echo
 
-    # Show first 20 icons from this category using the data file
-    local file_path="$DATA_DIR/$file"
-    local mapping_file="$DATA_DIR/icon-name-to-glyph.txt"
-
-    if [[ -f "$file_path" ]]; then
-        # Get icon names, skip comments and empty lines, take first 30 to ensure we get 20 valid ones
-        grep -v '^#' "$file_path" | grep -v '^$' | head -30 | while read -r icon_name; do
-            # Look up glyph from mapping file
-            local glyph=$(grep "^${icon_name}	" "$mapping_file" 2>/dev/null | cut -f2 || echo "?")
-            [[ -z "$glyph" ]] && glyph="?"
+    # Show first 20 icons straight from the pre-joined listing (glyph<TAB>name<TAB>codepoint)
 
+    if [[ -n "$listing" && -f "$listing_path" ]]; then
+        head -20 "$listing_path" | while IFS=$'\t' read -r glyph icon_name _; do
             # Extract name after underscore
             local short_name="${icon_name#*_}"
             echo -e "${CYAN}$glyph${RESET}  ${DIM}$short_name${RESET}"
-        done | head -20
+        done
     fi
 
     echo
@@ -108,12 +114,9 @@ show_category_preview() {
 show_icon_preview() {
     local full_line="$1"
 
-    # Parse the line: format is "glyph  icon_name"
-    # Extract icon_name (everything after the first two spaces)
-    local icon_name=$(echo "$full_line" | sed 's/^[^ ]*  //')
-
-    # Extract glyph (first field before double space)
-    local glyph=$(echo "$full_line" | awk '{print $1}')
+    # Parse the line: format is "glyph<TAB>icon_name<TAB>codepoint[<TAB>preview id]"
+    local glyph icon_name codepoint
+    IFS=$'\t' read -r glyph icon_name codepoint _ <<<"$full_line"
 
     # Extract prefix from icon name (everything before first underscore)
     local prefix="${icon_name%%_*}"
@@ -140,6 +143,7 @@ show_icon_preview() {
     echo
     echo -e "${CYAN}Name:${RESET}       ${BRIGHT_WHITE}$icon_name${RESET}"
     echo -e "${CYAN}Glyph:${RESET}      ${BRIGHT_WHITE}$glyph${RESET}"
+    [[ -n "$codepoint" ]] && echo -e "${CYAN}Codepoint:${RESET}  ${BRIGHT_WHITE}U+${codepoint^^}${RESET}"
     echo
     echo -e "${BOLD}${YELLOW}━━━ Usage ━━━${RESET}"
     echo
@@ -1,5 +1,6 @@
 local wezterm = require("wezterm")
-local nf = wezterm.nerdfonts
+local icon_table = require("modules.icons.icon_table")
+local nf = icon_table.glyphs
 local M = {}
 
 -- Helper function to set custom tab data and emit change event
@@ -33,12 +34,12 @@ local function safe_icon(icon_ref, fallback)
 	return fallback or "?"
 end
 
--- Load icons from a nerdfont data file
-local function load_icons_from_file(filepath, prefix)
+-- Load the icons of a nerdfont browser category from the generated icon table
+local function load_icons(category, prefix)
 	local icons = {}
-	local file = io.open(filepath, "r")
-	if not file then
-		wezterm.log_error("Could not open icon file: " .. filepath)
+	local names = icon_table.categories[category]
+	if not names then
+		wezterm.log_error("Icon category not in the generated icon table: " .. category)
 		return icons
 	end
 
@@ -47,147 +48,57 @@ local function load_icons_from_file(filepath, prefix)
 		custom_yazi = "📁",  -- Use folder emoji for yazi file manager
 	}
 
-	for line in file:lines() do
-		-- Skip comments and empty lines
-		if not line:match("^#") and line:match("%S") then
-			local icon_name = line:match("^%s*(.-)%s*$") -- trim whitespace
-			local icon_glyph = nil
-
-			-- Check for special mappings first
-			if special_mappings[icon_name] then
-				icon_glyph = special_mappings[icon_name]
-			elseif nf[icon_name] then
-				icon_glyph = nf[icon_name]
-			end
+	for _, icon_name in ipairs(names) do
+		local icon_glyph = special_mappings[icon_name] or nf[icon_name]
 
-			if icon_glyph then
-				-- Create a friendly description from the icon name
-				local desc = icon_name:gsub("^" .. prefix .. "_", ""):gsub("_", " ")
-				desc = desc:gsub("(%a)(%w*)", function(first, rest)
-					return first:upper() .. rest
-				end)
-				table.insert(icons, {
-					name = icon_name,
-					icon = icon_glyph,
-					desc = desc
-				})
-			end
+		if icon_glyph then
+			-- Create a friendly description from the icon name
+			local desc = icon_name:gsub("^" .. prefix .. "_", ""):gsub("_", " ")
+			desc = desc:gsub("(%a)(%w*)", function(first, rest)
+				return first:upper() .. rest
+			end)
+			table.insert(icons, {
+				name = icon_name,
+				icon = icon_glyph,
+				desc = desc
+			})
 		end
 	end
 
-	file:close()
-	wezterm.log_info("Loaded " .. #icons .. " icons from " .. filepath)
+	wezterm.log_info("Loaded " .. #icons .. " icons from " .. category)
 	return icons
 end
 
+-- An icon set whose icons are built the first time the picker needs them,
+-- so a config reload does no per-icon work
+local function icon_set(name, prefix, category)
+	return setmetatable({ name = name, prefix = prefix }, {
+		__index = function(set, key)
+			if key == "icons" then
+				set.icons = load_icons(category, prefix:sub(1, -2))
+				return set.icons
+			end
+		end,
+	})
+end
+
 -- Icon sets with popular icons from each category
--- NOTE: Font Awesome and Linux Logos use hardcoded lists for curated selections
--- All other categories load from auto-generated data files for full coverage
+-- All categories come from the icon table generated by the nerdfont browser
+-- (modules/icons/icon_table.lua), so they have full coverage
 M.icon_sets = {
-	material_design = {
-		name = "Material Design Icons (md_)",
-		prefix = "md_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-material-design.txt",
-			"md"
-		)
-	},
-	codicons = {
-		name = "Codicons (cod_)",
-		prefix = "cod_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-codicons.txt",
-			"cod"
-		)
-	},
-	devicons = {
-		name = "Devicons (dev_)",
-		prefix = "dev_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-devicons.txt",
-			"dev"
-		)
-	},
-	font_awesome = {
-		name = "Font Awesome (fa_)",
-		prefix = "fa_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-font-awesome.txt",
-			"fa"
-		)
-	},
-	fa_extension = {
-		name = "Font Awesome Extension (fae_)",
-		prefix = "fae_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-fa-extension.txt",
-			"fae"
-		)
-	},
-	octicons = {
-		name = "Octicons (oct_)",
-		prefix = "oct_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-octicons.txt",
-			"oct"
-		)
-	},
-	seti_ui = {
-		name = "Seti UI (seti_)",
-		prefix = "seti_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-seti-ui.txt",
-			"seti"
-		)
-	},
-	powerline = {
-		name = "Powerline (pl_)",
-		prefix = "pl_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-powerline.txt",
-			"pl"
-		)
-	},
-	powerline_extra = {
-		name = "Powerline Extra (ple_)",
-		prefix = "ple_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-powerline-extra.txt",
-			"ple"
-		)
-	},
-	pomicons = {
-		name = "Pomicons (pom_)",
-		prefix = "pom_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-pomicons.txt",
-			"pom"
-		)
-	},
-	weather = {
-		name = "Weather Icons (weather_)",
-		prefix = "weather_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-weather.txt",
-			"weather"
-		)
-	},
-	linux_logos = {
-		name = "Linux Logos (linux_)",
-		prefix = "linux_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-linux-logos.txt",
-			"linux"
-		)
-	},
-	custom = {
-		name = "Custom Icons (custom_)",
-		prefix = "custom_",
-		icons = load_icons_from_file(
-			wezterm.config_dir .. "/modules/menus/nerdfont-browser/data/wezterm-custom.txt",
-			"custom"
-		)
-	},
+	material_design = icon_set("Material Design Icons (md_)", "md_", "Material Design"),
+	codicons = icon_set("Codicons (cod_)", "cod_", "Codicons"),
+	devicons = icon_set("Devicons (dev_)", "dev_", "Devicons"),
+	font_awesome = icon_set("Font Awesome (fa_)", "fa_", "Font Awesome"),
+	fa_extension = icon_set("Font Awesome Extension (fae_)", "fae_", "FA Extension"),
+	octicons = icon_set("Octicons (oct_)", "oct_", "Octicons"),
+	seti_ui = icon_set("Seti UI (seti_)", "seti_", "Seti UI"),
+	powerline = icon_set("Powerline (pl_)", "pl_", "Powerline"),
+	powerline_extra = icon_set("Powerline Extra (ple_)", "ple_", "Powerline Extra"),
+	pomicons = icon_set("Pomicons (pom_)", "pom_", "Pomicons"),
+	weather = icon_set("Weather Icons (weather_)", "weather_", "Weather"),
+	linux_logos = icon_set("Linux Logos (linux_)", "linux_", "Linux Logos"),
+	custom = icon_set("Custom Icons (custom_)", "custom_", "Custom"),
 }
 
 -- Show icon set selection menu
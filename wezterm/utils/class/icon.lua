@@ -2,8 +2,7 @@
 ---@author sravioli
 ---@license GNU-GPLv3
 
----@diagnostic disable-next-line: undefined-field
-local nf = require("wezterm").nerdfonts
+local nf = require("modules.icons.icon_table").glyphs
 
 -- {{{1 META
 